@@ -270,9 +270,12 @@ def get_network_config(network: Optional[Network] = None) -> NetworkConfig:
 
 GLOBAL_CONFIG_DEFAULTS = {
     'performance_monitor': False,
-    'transaction_cache_format': 'csv', # or pickle
+    'transaction_cache_format': 'csv', # or pickle, or parquet (segmented append-only store)
+    'use_transaction_index': False,  # persist processed memos/tasks in a SQLite index
     'last_logged_in_user': '',
     'require_password_for_payment': True,
+    'use_memo_codec': False,  # send memos in the versioned PFZ1 format, which nodes and older clients cannot decode yet
+    'refresh_min_interval_sec': 2,  # minimum time between UI refreshes triggered by streamed transactions, under one ledger
     'use_testnet': False,
     'mainnet_rpc_endpoints': Network.XRPL_MAINNET.value.public_rpc_urls,
     'testnet_rpc_endpoints': Network.XRPL_TESTNET.value.public_rpc_urls,
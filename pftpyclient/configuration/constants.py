@@ -4,12 +4,29 @@ from decimal import Decimal
 # Pftpyclient runtime constants
 UPDATE_TIMER_INTERVAL_SEC = 60  # 60 Seconds
 REFRESH_GRIDS_AFTER_TASK_DELAY_SEC = 5  # 5 seconds
+BACKFILL_WINDOW_SIZE_LEDGERS = 1_000_000  # ledgers per historical backfill window
+BACKFILL_MAX_WORKERS = 4  # backfill windows fetched concurrently
+FIRST_PAINT_TRANSACTION_LIMIT = 200  # most recent transactions shown before the history backfill completes
+RPC_LATENCY_SMOOTHING = 0.2  # weight of the latest request in an endpoint's moving average latency
+RPC_FAILURE_COOLDOWN_SEC = 5  # initial time a failed RPC endpoint is skipped, doubled per consecutive failure
+RPC_MAX_FAILURE_COOLDOWN_SEC = 300  # 5 minutes
+PIPELINE_POLL_INTERVAL_SEC = 1  # time between checks for validation of a pipelined transaction batch
+PIPELINE_MAX_SUBMIT_ATTEMPTS = 3  # rounds a transaction that did not validate is submitted in
+PIPELINE_MAX_POLL_FAILURES = 5  # consecutive failed validation checks before a batch's status is given up on
+VALIDATION_STREAM_TIMEOUT_SEC = 30  # websocket silence after which validation falls back to polling the node
+VALIDATION_FALLBACK_POLL_SEC = 4  # time between validation checks when falling back to polling, matches XRPL block time
+VALIDATION_HISTORY_SIZE = 500  # recently validated account transactions kept for late validation lookups
+TRANSACTION_JOURNAL_RETENTION_DAYS = 30  # resolved outbound transactions are kept this long for lookup by hash
+MEMO_CRYPTO_MAX_WORKERS = 4  # threads decompressing and decrypting a batch of memos
+MEMO_BATCH_MIN_PARALLEL = 8  # smaller memo batches are processed inline
+GRID_REFRESH_MAX_WORKERS = 4  # threads computing grid data concurrently
+REFRESH_MAX_DELAY_SEC = 15  # longest a streamed update waits for a ledger close before the UI is refreshed anyway
 
 # XRPL constants
 DEFAULT_PFT_LIMIT = 100_000_000
 MIN_XRP_PER_TRANSACTION = Decimal('0.000001')
-MAX_CHUNK_SIZE = 1024
-XRP_MEMO_STRUCTURAL_OVERHEAD = 100  # JSON structure, quotes, etc.
+MAX_CHUNK_SIZE = 1024  # serialized size limit of a transaction's memos, enforced by rippled
+RIPPLE_EPOCH_OFFSET = 946684800  # January 1, 2000 (00:00 UTC)
 
 class SystemMemoType(Enum):
     HANDSHAKE = 'HANDSHAKE'
@@ -94,4 +94,8 @@ def derive_shared_secret(public_key_hex: str, seed_bytes: bytes) -> bytes:
     # Use raw X25519 function
     shared_secret = nacl.bindings.crypto_scalarmult(private_curve, public_curve)
 
-    return shared_secret
\ No newline at end of file
+    return shared_secret
+
+def derive_channel_fernet(shared_secret: bytes) -> Fernet:
+    """Derive the Fernet cipher for an encrypted memo channel from its ECDH shared secret"""
+    return Fernet(b64e(sha256(shared_secret).digest()))
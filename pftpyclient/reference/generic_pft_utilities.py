@@ -1,6 +1,5 @@
 from decimal import Decimal
 from typing import Optional, Union
-import binascii
 import datetime 
 import random
 import time
@@ -32,6 +31,10 @@ import nodetools.utilities.constants as constants
 import nodetools.utilities.configuration as config
 from nodetools.utilities.base import BaseUtilities
 from nodetools.utilities.exceptions import *
+from pftpyclient.postfiatsecurity.hash_tools import derive_channel_fernet
+from pftpyclient.utilities.memo_batch import process_memo_batch
+from pftpyclient.utilities.chunk_planner import plan_memo_chunks, utf8_boundary
+from pftpyclient.utilities.memo_codec import decode_memo_payload, hex_to_text, is_encoded_payload, text_to_hex
 from loguru import logger
 import traceback
 
@@ -95,16 +98,14 @@ class GenericPFTUtilities(BaseUtilities):
     
     @staticmethod
     def to_hex(string):
-        return binascii.hexlify(string.encode()).decode()
+        return text_to_hex(string)
 
     @staticmethod
     def hex_to_text(hex_string):
-        bytes_object = bytes.fromhex(hex_string)
         try:
-            ascii_string = bytes_object.decode("utf-8")
-            return ascii_string
+            return hex_to_text(hex_string)
         except UnicodeDecodeError:
-            return bytes_object  # Return the raw bytes if it cannot decode as utf-8
+            return bytes.fromhex(hex_string)  # Return the raw bytes if it cannot decode as utf-8
 
     def output_post_fiat_holder_df(self) -> pd.DataFrame:
         """ This function outputs a detail of all accounts holding PFT tokens
@@ -144,15 +145,18 @@ class GenericPFTUtilities(BaseUtilities):
         
     @staticmethod
     def split_text_into_chunks(text, max_chunk_size=constants.MAX_MEMO_CHUNK_SIZE):
+        """Splits text into labeled chunks of up to max_chunk_size bytes, on UTF-8 code point boundaries"""
         chunks = []
         text_bytes = text.encode('utf-8')
-        for i in range(0, len(text_bytes), max_chunk_size):
-            chunk = text_bytes[i:i+max_chunk_size]
-            chunk_number = i // max_chunk_size + 1
-            chunk_label = f"chunk_{chunk_number}__".encode('utf-8')
-            chunk_with_label = chunk_label + chunk
-            chunks.append(chunk_with_label)
-        return [chunk.decode('utf-8', errors='ignore') for chunk in chunks]
+        start = 0
+        while start < len(text_bytes):
+            end = utf8_boundary(text_bytes, min(start + max_chunk_size, len(text_bytes)))
+            if end <= start:
+                raise ValueError(f"max_chunk_size {max_chunk_size} is smaller than a single character")
+            chunk_label = f"chunk_{len(chunks) + 1}__".encode('utf-8')
+            chunks.append((chunk_label + text_bytes[start:end]).decode('utf-8'))
+            start = end
+        return chunks
 
     @staticmethod
     def compress_string(input_string):
@@ -856,7 +860,12 @@ class GenericPFTUtilities(BaseUtilities):
         # For non-system memos, proceed with normal chunking
         # TODO: Reinstate size check once we have a way to identify memos aside from the chunk prefix
         if chunk: # and len(memo_data.encode('utf-8')) > constants.MAX_MEMO_CHUNK_SIZE:
-            memo_chunks = self.split_text_into_chunks(memo_data)
+            # Each chunk is filled up to the serialized memo limit, split on UTF-8 code point boundaries
+            memo_chunks = [
+                chunk.decode('utf-8') for chunk in plan_memo_chunks(
+                    memo_format.encode('utf-8'), memo_type.encode('utf-8'), memo_data.encode('utf-8')
+                )
+            ]
             responses = []
 
             # Send each chunk
@@ -1086,6 +1095,8 @@ class GenericPFTUtilities(BaseUtilities):
                 processed_data = processed_data.replace('COMPRESSED__', '', 1)
                 # logger.debug(f"GenericPFTUtilities.process_memo_data: Decompressing data: {processed_data}")
                 processed_data = self.decompress_string(processed_data)
+            elif decompress and is_encoded_payload(processed_data):
+                processed_data = decode_memo_payload(processed_data)
 
             # Handle encryption
             if decrypt and processed_data.startswith('WHISPER__'):
@@ -1133,6 +1144,10 @@ class GenericPFTUtilities(BaseUtilities):
                 processed_data = processed_data.replace('WHISPER__', '', 1)
                 processed_data = self.message_encryption.decrypt_message(processed_data, shared_secret)
 
+                # Newer clients compress the plaintext before encrypting it
+                if decompress and is_encoded_payload(processed_data):
+                    processed_data = decode_memo_payload(processed_data)
+
             # logger.debug(f"GenericPFTUtilities.process_memo_data: Decrypted data: {processed_data}")
                 
             return processed_data
@@ -1198,7 +1213,9 @@ class GenericPFTUtilities(BaseUtilities):
             else:
                 channel_address = xrpl.wallet.Wallet.from_seed(channel_private_key).classic_address
 
-            processed_messages = []
+            # Reassemble each message first, then decompress and decrypt them as one batch
+            first_txns = []
+            payloads = []
             for msg_id in memo_history['memo_type'].unique():
 
                 msg_txns = memo_history[memo_history['memo_type'] == msg_id]
@@ -1214,19 +1231,51 @@ class GenericPFTUtilities(BaseUtilities):
                 )
 
                 try:
-                    # Process the message (handles chunking, decompression, and decryption)
-                    processed_message = self.process_memo_data(
+                    # Reassemble the message only; decompression and decryption happen in the batch
+                    payload = self.process_memo_data(
                         memo_type=msg_id,
                         memo_data=first_txn['memo_data'],
                         full_unchunk=True,
-                        memo_history=memo_history,
-                        channel_address=channel_address,
-                        channel_counterparty=channel_counterparty,
-                        channel_private_key=channel_private_key
+                        decompress=False,
+                        decrypt=False,
+                        memo_history=memo_history
                     )
                 except Exception as e:
-                    processed_message = None
+                    payload = None
+
+                first_txns.append((msg_id, first_txn, msg_txns['directional_pft'].sum()))
+                payloads.append((payload, channel_counterparty))
 
+            def get_cipher(channel_counterparty):
+                # Each channel's shared secret is derived once per batch
+                channel_key, counterparty_key = self.message_encryption.get_handshake_for_address(
+                    channel_address=channel_address,
+                    channel_counterparty=channel_counterparty
+                )
+                if not (channel_key and counterparty_key):
+                    logger.warning(f"GenericPFTUtilities.get_all_account_compressed_messages: No handshake found with {channel_counterparty}")
+                    return None
+                shared_secret = self.message_encryption.get_shared_secret(
+                    received_public_key=counterparty_key, 
+                    channel_private_key=channel_private_key.seed if isinstance(channel_private_key, xrpl.wallet.Wallet) else channel_private_key
+                )
+                if isinstance(shared_secret, str):
+                    shared_secret = shared_secret.encode()
+                return derive_channel_fernet(shared_secret)
+
+            def decompress(payload):
+                if payload.startswith('COMPRESSED__'):
+                    return self.decompress_string(payload.replace('COMPRESSED__', '', 1))
+                return decode_memo_payload(payload)
+
+            processed_batch = process_memo_batch(
+                payloads,
+                decompress=decompress,
+                get_cipher=get_cipher if channel_private_key else None
+            )
+
+            processed_messages = []
+            for (msg_id, first_txn, pft_amount), processed_message in zip(first_txns, processed_batch):
                 processed_messages.append({
                     'memo_type': msg_id,
                     'processed_message': processed_message if processed_message else "[PROCESSING FAILED]",
@@ -1235,7 +1284,7 @@ class GenericPFTUtilities(BaseUtilities):
                     'hash': first_txn['hash'],
                     'account': first_txn['account'],
                     'destination': first_txn['destination'],
-                    'pft_amount': msg_txns['directional_pft'].sum()
+                    'pft_amount': pft_amount
                 })
 
             result_df = pd.DataFrame(processed_messages)
@@ -0,0 +1,55 @@
+import pytest
+from pftpyclient.utilities.backfill import TransactionBackfill, BackfillIncompleteException
+
+class FakeBackfill(TransactionBackfill):
+    """Serves one transaction per ledger divisible by 10 instead of querying an RPC endpoint"""
+
+    def __init__(self, *args, failing_endpoints=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing_endpoints = set(failing_endpoints)
+        self.fetched = []
+
+    def _fetch_window(self, window, endpoint):
+        if endpoint in self.failing_endpoints:
+            raise ConnectionError(f"{endpoint} unavailable")
+        self.fetched.append((window, endpoint))
+        return [
+            {'hash': f"HASH{ledger}", 'ledger_index': ledger, 'tx_json': {'ledger_index': ledger}}
+            for ledger in range(window[0], window[1] + 1) if ledger % 10 == 0
+        ]
+
+def test_split_windows(tmp_path):
+    backfill = TransactionBackfill('rAccount', ['http://a'], str(tmp_path), window_size=100)
+    assert backfill.split_windows(1, 250) == [(1, 100), (101, 200), (201, 250)]
+
+def test_concurrent_backfill_merges_in_ledger_order(tmp_path):
+    backfill = FakeBackfill('rAccount', ['http://a', 'http://b'], str(tmp_path / "backfill"), window_size=100, max_workers=3)
+    progress = []
+    transactions = backfill.run(1, 1000, progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert [tx['ledger_index'] for tx in transactions] == list(range(10, 1001, 10))
+    assert {endpoint for _, endpoint in backfill.fetched} == {'http://a', 'http://b'}
+    assert progress[-1] == (10, 10)
+
+def test_failed_windows_fail_over_and_resume(tmp_path):
+    state_directory = str(tmp_path / "backfill")
+
+    # Every window fails over to the healthy endpoint
+    backfill = FakeBackfill('rAccount', ['http://down', 'http://up'], state_directory, window_size=100,
+                            failing_endpoints={'http://down'})
+    assert len(backfill.run(1, 300)) == 30
+    backfill.clear()
+
+    # With no healthy endpoint the run fails, but nothing is persisted for the failed windows
+    backfill = FakeBackfill('rAccount', ['http://down'], state_directory, window_size=100,
+                            failing_endpoints={'http://down'})
+    with pytest.raises(BackfillIncompleteException):
+        backfill.run(1, 300)
+
+    # An interrupted run resumes from the completed windows, even if the chain has advanced
+    backfill = FakeBackfill('rAccount', ['http://up'], state_directory, window_size=100)
+    backfill.run(1, 200)
+    backfill = FakeBackfill('rAccount', ['http://up'], state_directory, window_size=100)
+    transactions = backfill.run(1, 400)
+    assert [window for window, _ in backfill.fetched] == [(201, 300), (301, 400)]
+    assert len(transactions) == 40
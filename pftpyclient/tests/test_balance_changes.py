@@ -0,0 +1,33 @@
+from pftpyclient.utilities.task_manager import get_balance_changes
+
+WALLET = 'rMyWallet'
+ISSUER = 'rPFTIssuer'
+
+def ripple_state(low, high, value, node_type='ModifiedNode'):
+    return {node_type: {
+        'LedgerEntryType': 'RippleState',
+        'FinalFields': {
+            'Balance': {'currency': 'PFT', 'issuer': 'rrrrrrrrrrrrrrrrrrrrBZbvji', 'value': value},
+            'LowLimit': {'currency': 'PFT', 'issuer': low, 'value': '0'},
+            'HighLimit': {'currency': 'PFT', 'issuer': high, 'value': '100000000'}
+        }
+    }}
+
+def test_balances_from_metadata():
+    meta = {'AffectedNodes': [
+        {'ModifiedNode': {'LedgerEntryType': 'AccountRoot', 'FinalFields': {'Account': 'rNode', 'Balance': '5000000'}}},
+        {'ModifiedNode': {'LedgerEntryType': 'AccountRoot', 'FinalFields': {'Account': WALLET, 'Balance': '19999988'}}},
+        ripple_state(ISSUER, WALLET, '-150.5'),
+        ripple_state('rOtherIssuer', WALLET, '-7'),
+    ]}
+    assert get_balance_changes(meta, WALLET, ISSUER) == {'xrp': '19999988', 'pft': 150.5}
+
+def test_balances_from_low_side_and_created_nodes():
+    created = {'CreatedNode': {
+        'LedgerEntryType': 'RippleState',
+        'NewFields': ripple_state(WALLET, ISSUER, '25')['ModifiedNode']['FinalFields']
+    }}
+    assert get_balance_changes({'AffectedNodes': [created]}, WALLET, ISSUER) == {'pft': 25.0}
+
+def test_untouched_balances_are_omitted():
+    assert get_balance_changes({}, WALLET, ISSUER) == {}
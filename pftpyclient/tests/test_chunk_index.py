@@ -0,0 +1,45 @@
+import datetime
+from pftpyclient.utilities.chunk_index import ChunkReassemblyIndex
+
+MSG = '2024-01-01_12:00__AB12'
+
+def at(minute):
+    return datetime.datetime(2024, 1, 1, 12, minute)
+
+def test_reassembles_out_of_order_chunks_once():
+    decoded = []
+    index = ChunkReassemblyIndex(decode=lambda payload: decoded.append(payload) or payload.upper())
+
+    index.add_rows([(MSG, 'chunk_2__world', at(1), 'H2'), ('other', 'not a chunk', at(1), 'H9')])
+    assert MSG in index and 'other' not in index
+    assert index.get_payload(MSG) is None  # chunk_1 missing
+
+    assert index.add_rows([(MSG, 'chunk_1__hello ', at(0), 'H1'), (MSG, 'chunk_1__hello ', at(0), 'H1')]) == {MSG}
+    assert index.get_payload(MSG) == 'HELLO WORLD'
+    assert index.get_payload(MSG) == 'HELLO WORLD'
+    assert decoded == ['hello world']
+
+def test_sequence_restarts():
+    index = ChunkReassemblyIndex()
+    # An incomplete sequence is replaced by a later resend
+    index.add_rows([
+        (MSG, 'chunk_1__a', at(0), 'H1'),
+        (MSG, 'chunk_3__c', at(1), 'H2'),
+        (MSG, 'chunk_1__x', at(2), 'H3'),
+        (MSG, 'chunk_2__y', at(3), 'H4'),
+    ])
+    assert index.get_payload(MSG) == 'xy'
+
+    # Once a sequence is complete, a later resend is ignored
+    index.add(MSG, 'chunk_1__z', at(4), 'H5')
+    assert index.get_payload(MSG) == 'xy'
+
+def test_copy_is_unaffected_by_later_chunks():
+    index = ChunkReassemblyIndex()
+    index.add_rows([(MSG, 'chunk_1__hello ', at(0), 'H1')])
+    snapshot = index.copy()
+
+    index.add_rows([(MSG, 'chunk_2__world', at(1), 'H2')])
+
+    assert snapshot.get_payload(MSG) == 'hello '
+    assert index.get_payload(MSG) == 'hello world'
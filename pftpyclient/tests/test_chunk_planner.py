@@ -0,0 +1,43 @@
+import pytest
+from xrpl.core.binarycodec import encode
+
+from pftpyclient.utilities.chunk_planner import MemoChunkPlan, plan_memo_chunks, serialized_memo_size
+from pftpyclient.utilities.task_manager import PostFiatTaskManager, construct_memo
+
+FORMAT = b'alice'
+TYPE = b'2024-01-01_12:00__AB12'
+
+def memos_field_size(memo) -> int:
+    """Size of the Memos field as rippled measures it: the serialized array without its own field ID and end marker"""
+    memo_json = {'Memo': {'MemoFormat': memo.memo_format, 'MemoType': memo.memo_type, 'MemoData': memo.memo_data}}
+    return len(encode({'Memos': [memo_json]})) // 2 - 2
+
+def test_serialized_size_matches_binary_codec():
+    for data_size in [0, 100, 192, 193, 900]:
+        memo = construct_memo('alice', '2024-01-01_12:00__AB12', 'x' * data_size)
+        assert serialized_memo_size(len(FORMAT), len(TYPE), data_size) == memos_field_size(memo)
+
+def test_chunks_fill_the_memo_limit():
+    data = ('PFZ1D__' + 'x' * 20_000).encode('utf-8')
+    chunks = plan_memo_chunks(FORMAT, TYPE, data)
+
+    plan = MemoChunkPlan('alice', '2024-01-01_12:00__AB12', chunks)
+    sizes = [memos_field_size(memo) for memo in plan.to_memos()]
+    assert max(sizes) <= 1024
+    assert all(size == 1024 for size in sizes[:-1])
+    assert [chunk.split(b'__', 1)[0] for chunk in chunks[8:10]] == [b'chunk_9', b'chunk_10']
+    assert b''.join(chunk.split(b'__', 1)[1] for chunk in chunks) == data
+    assert PostFiatTaskManager.calculate_required_chunks(construct_memo('alice', '2024-01-01_12:00__AB12', data.decode())) == len(chunks)
+
+def test_chunks_split_on_code_point_boundaries():
+    text = 'Ünïcødé ✓ 🙂 ' * 300
+    chunks = plan_memo_chunks(FORMAT, TYPE, text.encode('utf-8'))
+    assert len(chunks) > 1
+    assert ''.join(chunk.decode('utf-8').split('__', 1)[1] for chunk in chunks) == text
+
+def test_plan_and_overflow():
+    plan = MemoChunkPlan('alice', 'type', plan_memo_chunks(FORMAT, b'type', b'short'), pft_per_chunk=1)
+    assert (plan.num_chunks, plan.total_bytes, plan.total_pft) == (1, len(b'chunk_1__short'), 1)
+
+    with pytest.raises(ValueError):
+        plan_memo_chunks(b'x' * 1010, TYPE, b'data')
@@ -47,5 +47,63 @@ def test_ecdh_key_derivation():
 
     print("All tests passed")
 
+def create_test_user(username, password='default_password'):
+    wallet = Wallet.create()
+    CredentialManager.cache_credentials({
+        "Username_Input": username,
+        "Password_Input": password,
+        "XRP Address_Input": wallet.classic_address,
+        "XRP Secret_Input": wallet.seed
+    })
+    return CredentialManager(username, password)
+
+def test_channel_cipher_cache():
+    alice = create_test_user('channel_test_alice')
+    bob = create_test_user('channel_test_bob')
+    try:
+        alice_cipher = alice.get_channel_cipher(bob.get_ecdh_public_key())
+        bob_cipher = bob.get_channel_cipher(alice.get_ecdh_public_key())
+
+        # Both ends derive the same channel key, and each derives it only once per session
+        assert bob_cipher.decrypt(alice_cipher.encrypt(b"hello")) == b"hello"
+        assert alice.get_channel_cipher(bob.get_ecdh_public_key()) is alice_cipher
+
+        alice.invalidate_channel_cipher(bob.get_ecdh_public_key())
+        assert alice.get_channel_cipher(bob.get_ecdh_public_key()) is not alice_cipher
+
+        alice.clear_credentials()
+        assert not alice._channel_ciphers
+    finally:
+        alice.delete_credentials()
+        bob.delete_credentials()
+
+def test_unlock_session(monkeypatch):
+    manager = create_test_user('unlock_session_test')
+    try:
+        derivations = []
+        original_derive = CredentialManager._derive_encryption_key
+        monkeypatch.setattr(CredentialManager, '_derive_encryption_key',
+                            staticmethod(lambda password: derivations.append(password) or original_derive(password)))
+        manager = CredentialManager('unlock_session_test', 'default_password')
+        assert len(derivations) == 1
+
+        manager.save_contact('rContactAddress', 'Bob')
+        assert manager.get_contacts() == {'rContactAddress': 'Bob'}
+
+        # Reads are served from memory until the next write
+        decrypts = []
+        original_decrypt = manager.session.decrypt
+        monkeypatch.setattr(manager.session, 'decrypt', lambda value: decrypts.append(value) or original_decrypt(value))
+        manager.get_contacts()
+        manager.get_credential('v1xrpaddress')
+        manager.get_credential('v1xrpaddress')
+        assert len(decrypts) == 2  # contacts were already loaded; credentials load once
+
+        manager.delete_contact('rContactAddress')
+        assert manager.get_contacts() == {}
+    finally:
+        manager.delete_credentials()
+
 if __name__ == "__main__":
     test_ecdh_key_derivation()
+    test_channel_cipher_cache()
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from pftpyclient.utilities.grid_diff import diff_grid_rows
+
+COLUMNS = ['tx_hash', 'amount']
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+def test_inserted_updated_and_removed_rows():
+    displayed = frame([('B', 2), ('C', 3), ('D', 4)])
+    data = frame([('A', 1), ('B', 2), ('D', 5)])
+
+    diff = diff_grid_rows(displayed, data, 'tx_hash', COLUMNS)
+
+    assert diff.removed == [1]
+    assert diff.inserted == [0]
+    assert diff.updated == [2]
+    assert diff.kept == {0: 1, 2: 2}
+
+def test_unchanged_rows_produce_an_empty_diff():
+    displayed = frame([('A', 1), ('B', 2)])
+    assert diff_grid_rows(displayed, displayed.copy(), 'tx_hash', COLUMNS).is_empty
+
+def test_unmatchable_rows_need_a_full_replace():
+    displayed = frame([('A', 1), ('B', 2)])
+    assert diff_grid_rows(displayed, frame([('B', 2), ('A', 1)]), 'tx_hash', COLUMNS) is None
+    assert diff_grid_rows(displayed, frame([('A', 1), ('A', 2)]), 'tx_hash', COLUMNS) is None
+    assert diff_grid_rows(displayed, displayed[['tx_hash']], 'tx_hash', COLUMNS) is None
+    assert diff_grid_rows(pd.DataFrame(), displayed, 'tx_hash', COLUMNS) is None
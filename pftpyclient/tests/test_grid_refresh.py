@@ -0,0 +1,68 @@
+import threading
+
+from pftpyclient.utilities.grid_refresh import GridRefreshWorker, GridVersionTracker
+
+def test_requests_during_a_refresh_are_coalesced():
+    release = threading.Event()
+    started = threading.Event()
+    computed = []
+    rounds = []
+    done = threading.Event()
+
+    def compute(state, target):
+        started.set()
+        release.wait(timeout=5)
+        computed.append((state, target))
+        return f"{target} at {state}"
+
+    def on_result(results):
+        rounds.append(results)
+        if len(rounds) == 2:
+            done.set()
+
+    worker = GridRefreshWorker(compute, on_result)
+    worker.request(1, ['memos'])
+    assert started.wait(timeout=5)
+    worker.request(2, ['payments'])
+    worker.request(3, ['memos', 'summary'])
+    release.set()
+
+    assert done.wait(timeout=5)
+    assert rounds == [
+        {'memos': 'memos at 1'},
+        {'memos': 'memos at 3', 'payments': 'payments at 3', 'summary': 'summary at 3'},
+    ]
+    assert sorted(computed) == [(1, 'memos'), (3, 'memos'), (3, 'payments'), (3, 'summary')]
+    worker.stop()
+
+def test_failed_grids_are_left_out_of_the_round():
+    results = []
+    done = threading.Event()
+
+    def compute(state, target):
+        if target == 'summary':
+            raise ValueError("no account info")
+        return target
+
+    worker = GridRefreshWorker(compute, lambda round_results: (results.append(round_results), done.set()))
+    worker.request(None, ['summary', 'payments'])
+    assert done.wait(timeout=5)
+    assert results == [{'payments': 'payments'}]
+    worker.stop()
+
+def test_version_tracker_only_recomputes_changed_grids():
+    tracker = GridVersionTracker()
+    tracker.invalidate(['memos', 'rewards'])
+    assert tracker.stale(['memos', 'rewards', 'summary']) == {'memos', 'rewards', 'summary'}
+    tracker.mark_rendered('summary', tracker.mark_requested(['summary'])['summary'])
+    assert tracker.stale(['memos', 'rewards', 'summary']) == {'memos', 'rewards'}
+
+    versions = tracker.mark_requested(['memos'])
+    assert tracker.stale(['memos', 'rewards']) == {'rewards'}  # in flight
+    tracker.mark_rendered('memos', versions['memos'])
+
+    # A change while the rewards tab is hidden keeps it stale; memos are current until they change again
+    tracker.invalidate(['rewards'])
+    assert tracker.stale(['memos', 'rewards']) == {'rewards'}
+    tracker.invalidate(['memos'])
+    assert tracker.stale(['memos']) == {'memos'}
@@ -0,0 +1,57 @@
+from cryptography.fernet import Fernet
+
+from pftpyclient.utilities.memo_batch import encrypt_memo_batch, process_memo_batch
+from pftpyclient.utilities.memo_codec import encode_memo_payload
+from pftpyclient.utilities.task_manager import compress_string, decompress_memo_payload
+
+CIPHERS = {'rAlice': Fernet(Fernet.generate_key()), 'rBob': Fernet(Fernet.generate_key())}
+
+class CountingResolver:
+    """Returns the test ciphers, counting how often each counterparty is resolved"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, counterparty):
+        self.calls.append(counterparty)
+        return CIPHERS.get(counterparty)
+
+def test_batch_round_trip_preserves_order():
+    plaintexts = [(f"message {i}", 'rAlice' if i % 2 else 'rBob') for i in range(40)]
+    resolver = CountingResolver()
+    encrypted = encrypt_memo_batch(plaintexts, resolver, max_workers=4)
+    assert all(payload.startswith('WHISPER__') for payload in encrypted)
+
+    # A quarter of the payloads use the legacy format, compressed after encryption
+    items = [
+        ('COMPRESSED__' + compress_string(payload) if i % 4 == 0 else payload, counterparty)
+        for i, (payload, (_, counterparty)) in enumerate(zip(encrypted, plaintexts))
+    ]
+    resolver = CountingResolver()
+    processed = process_memo_batch(items, decompress=decompress_memo_payload, get_cipher=resolver, max_workers=4)
+
+    assert processed == [f"[DECRYPTED] message {i}" for i in range(40)]
+    assert sorted(resolver.calls) == ['rAlice', 'rBob']
+
+def test_batch_without_cipher_or_with_bad_payloads():
+    token = CIPHERS['rAlice'].encrypt(b'secret').decode()
+    items = [
+        ('plain text', 'rAlice'),
+        ('WHISPER__' + token, 'rCarol'),  # no handshake with rCarol yet
+        ('WHISPER__not-a-token', 'rAlice'),
+        ('COMPRESSED__!!!', 'rAlice'),
+        ('WHISPER__' + token, None),
+    ]
+    resolver = CountingResolver()
+    processed = process_memo_batch(items, decompress=decompress_memo_payload, get_cipher=resolver)
+
+    assert processed == ['plain text', 'WHISPER__' + token, None, None, 'WHISPER__' + token]
+    assert sorted(resolver.calls) == ['rAlice', 'rCarol']
+    assert process_memo_batch([('WHISPER__' + token, 'rAlice')]) == ['WHISPER__' + token]
+
+def test_plaintext_compressed_before_encryption():
+    text = "Weekly report on the node deployment. " * 20
+    [payload] = encrypt_memo_batch([(encode_memo_payload(text), 'rAlice')], CountingResolver())
+    assert process_memo_batch([(payload, 'rAlice')], decompress=decompress_memo_payload, get_cipher=CountingResolver()) == [
+        '[DECRYPTED] ' + text
+    ]
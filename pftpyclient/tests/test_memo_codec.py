@@ -0,0 +1,104 @@
+import pytest
+from cryptography.fernet import Fernet
+
+from pftpyclient.utilities.memo_codec import (
+    BROTLI_HEADER,
+    DEFLATE_DICTIONARY_HEADER,
+    decode_memo_fields,
+    decode_memo_payload,
+    encode_memo_payload,
+    hex_size,
+    is_encoded_payload,
+    text_to_hex,
+)
+from pftpyclient.utilities.task_manager import PostFiatTaskManager, compress_string, decompress_memo_payload
+
+SHORT_MEMO = (
+    "I have completed the task. Here is the link to the output: "
+    "https://github.com/postfiatorg/pftpyclient/pull/42 and the tests are passing."
+)
+LONG_MEMO = "Weekly report on the node deployment and the wallet integration. " * 60
+
+@pytest.mark.parametrize('text', [SHORT_MEMO, LONG_MEMO, "Ünïcødé memo ✓ " * 20])
+def test_round_trip_is_smaller_than_legacy_format(text):
+    payload = encode_memo_payload(text)
+    assert is_encoded_payload(payload)
+    assert decode_memo_payload(payload) == text
+    assert decompress_memo_payload(payload) == text
+    assert len(payload) < len('COMPRESSED__' + compress_string(text))
+
+def test_method_is_chosen_per_memo():
+    assert encode_memo_payload(SHORT_MEMO).startswith(DEFLATE_DICTIONARY_HEADER)
+    assert encode_memo_payload(LONG_MEMO).startswith((BROTLI_HEADER, DEFLATE_DICTIONARY_HEADER))
+
+def test_incompressible_and_legacy_payloads():
+    assert encode_memo_payload("hi") == "hi"
+    assert decode_memo_payload("hi") == "hi"
+
+    legacy = 'COMPRESSED__' + compress_string(SHORT_MEMO)
+    assert decompress_memo_payload(legacy) == SHORT_MEMO
+
+    with pytest.raises(ValueError):
+        decode_memo_payload('PFZ9X__abc')
+    with pytest.raises(ValueError):
+        decode_memo_payload(DEFLATE_DICTIONARY_HEADER + 'not base85 "')
+
+def test_hex_sizes_and_field_decoding():
+    for text in ["", "ascii memo", "Ünïcødé ✓"]:
+        assert text_to_hex(text) == text.encode('utf-8').hex()
+        assert hex_size(text) == len(text_to_hex(text))
+    assert text_to_hex(memoryview(b"\x00\xff")) == "00ff"
+
+    memos = [
+        {'MemoFormat': text_to_hex('alice'), 'MemoType': text_to_hex('2024-01-01_12:00__AB12'), 'MemoData': text_to_hex('chunk_1__Ünïcødé')},
+        {'MemoData': text_to_hex('no format or type')},
+    ]
+    assert decode_memo_fields(memos) == [
+        {'user': 'alice', 'task_id': '2024-01-01_12:00__AB12', 'full_output': 'chunk_1__Ünïcødé'},
+        {'user': '', 'task_id': '', 'full_output': 'no format or type'},
+    ]
+
+    for bad_field in ['abc', 'ab cd', 'zz']:
+        with pytest.raises(ValueError):
+            decode_memo_fields([{'MemoData': bad_field}])
+
+class FakeConfig:
+    def __init__(self, use_memo_codec):
+        self.use_memo_codec = use_memo_codec
+
+    def get_global_config(self, key):
+        return self.use_memo_codec if key == 'use_memo_codec' else None
+
+class FakeCredentialManager:
+    def __init__(self, cipher):
+        self.cipher = cipher
+
+    def get_channel_cipher(self, received_key):
+        return self.cipher
+
+class FakeTaskManager(PostFiatTaskManager):
+    def __init__(self, use_memo_codec, cipher):
+        self.config = FakeConfig(use_memo_codec)
+        self.credential_manager = FakeCredentialManager(cipher)
+
+    def get_handshake_for_address(self, address):
+        return True, 'received key'
+
+@pytest.mark.parametrize('encrypt', [False, True])
+def test_memos_use_the_legacy_encoding_unless_the_codec_is_enabled(encrypt):
+    cipher = Fernet(Fernet.generate_key())
+
+    legacy = FakeTaskManager(use_memo_codec=False, cipher=cipher).encode_memo_data(SHORT_MEMO, 'rDestination', encrypt=encrypt)
+    assert legacy.startswith('COMPRESSED__')
+    plaintext = decompress_memo_payload(legacy)
+    if encrypt:
+        assert plaintext.startswith('WHISPER__')
+        plaintext = cipher.decrypt(plaintext.removeprefix('WHISPER__').encode()).decode()
+    assert plaintext == SHORT_MEMO
+
+    codec = FakeTaskManager(use_memo_codec=True, cipher=cipher).encode_memo_data(SHORT_MEMO, 'rDestination', encrypt=encrypt)
+    if encrypt:
+        assert codec.startswith('WHISPER__')
+        codec = cipher.decrypt(codec.removeprefix('WHISPER__').encode()).decode()
+    assert is_encoded_payload(codec)
+    assert decode_memo_payload(codec) == SHORT_MEMO
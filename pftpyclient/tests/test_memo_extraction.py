@@ -0,0 +1,94 @@
+import time
+import datetime
+import numpy as np
+import pandas as pd
+from xrpl.utils import str_to_hex
+from pftpyclient.utilities.task_manager import (
+    PostFiatTaskManager,
+    extract_memo_transaction_columns,
+    is_pft_transaction
+)
+
+WALLET = 'rMyWallet'
+NODE = 'rNodeAddress'
+
+def make_transactions(count):
+    """Builds synthetic raw transactions alternating incoming/outgoing, PFT/XRP, and root/tx_json ledger indexes"""
+    transactions = []
+    for i in range(count):
+        incoming = i % 2 == 0
+        tx_json = {
+            'Account': NODE if incoming else WALLET,
+            'Destination': WALLET if incoming else NODE,
+            'date': 768602652 + i * 60,
+            'DeliverMax': {'currency': 'PFT', 'value': '1'} if i % 3 == 0 else '10',
+            'Memos': [{'Memo': {
+                'MemoFormat': str_to_hex('alice'),
+                'MemoType': str_to_hex(f"2024-01-01_12:00__AB{i % 100:02d}"),
+                'MemoData': str_to_hex(f"PROPOSED PF ___ task number {i}")
+            }}]
+        }
+        if i % 4 == 0:
+            tx_json['ledger_index'] = 1000 + i
+        transactions.append({'hash': f"HASH{i}", 'ledger_index': 1000 + i, 'tx_json': tx_json})
+    return pd.DataFrame(transactions)
+
+def legacy_extract(memo_tx_df):
+    """The per-row .apply() path that extract_memo_transaction_columns replaced"""
+    memo_tx_df = memo_tx_df.copy()
+    memo_tx_df['memo_data'] = memo_tx_df['tx_json'].apply(
+        lambda x: PostFiatTaskManager.decode_memo_fields_to_dict(x['Memos'][0]['Memo'])
+    )
+    memo_tx_df['account'] = memo_tx_df['tx_json'].apply(lambda x: x['Account'])
+    memo_tx_df['destination'] = memo_tx_df['tx_json'].apply(lambda x: x['Destination'])
+    memo_tx_df['direction'] = np.where(memo_tx_df['destination'] == WALLET, 'INCOMING', 'OUTGOING')
+    memo_tx_df['counterparty_address'] = memo_tx_df[['destination', 'account']].sum(axis=1).apply(
+        lambda x: str(x).replace(WALLET, '')
+    )
+    memo_tx_df['datetime'] = memo_tx_df['tx_json'].apply(
+        lambda x: datetime.datetime.fromtimestamp(x['date'] + 946684800)
+    )
+    memo_tx_df['ledger_index'] = memo_tx_df.apply(
+        lambda row: int(row['tx_json'].get('ledger_index', row.get('ledger_index', 0))),
+        axis=1
+    )
+    memo_tx_df['is_pft'] = memo_tx_df['tx_json'].apply(is_pft_transaction)
+    return memo_tx_df
+
+def batched_extract(memo_tx_df):
+    columns = extract_memo_transaction_columns(
+        tx_jsons=memo_tx_df['tx_json'].tolist(),
+        fallback_ledger_indexes=memo_tx_df['ledger_index'].tolist(),
+        wallet_address=WALLET
+    )
+    return memo_tx_df.assign(**columns)
+
+def test_batched_extraction_matches_legacy():
+    tx_df = make_transactions(200)
+    legacy = legacy_extract(tx_df)
+    batched = batched_extract(tx_df)
+
+    for col in ['memo_data', 'account', 'destination', 'direction', 'counterparty_address', 'ledger_index', 'is_pft']:
+        assert legacy[col].tolist() == batched[col].tolist(), col
+    assert (pd.to_datetime(legacy['datetime']) == batched['datetime']).all()
+
+def benchmark_memo_extraction(sizes=(10_000, 100_000)):
+    results = {}
+    for size in sizes:
+        tx_df = make_transactions(size)
+
+        start = time.perf_counter()
+        legacy_extract(tx_df)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched_extract(tx_df)
+        batched_time = time.perf_counter() - start
+
+        results[size] = (legacy_time, batched_time)
+        print(f"{size} transactions: legacy {legacy_time:.3f}s, batched {batched_time:.3f}s "
+              f"({legacy_time / batched_time:.1f}x)")
+    return results
+
+if __name__ == "__main__":
+    benchmark_memo_extraction()
@@ -0,0 +1,33 @@
+import sqlite3
+from cryptography.fernet import Fernet
+from pftpyclient.utilities.message_cache import ProcessedMessageCache
+
+def test_messages_are_encrypted_at_rest_and_warm_on_reopen(tmp_path):
+    db_path = tmp_path / "messages.sqlite"
+    key = Fernet.generate_key()
+
+    cache = ProcessedMessageCache(db_path, key)
+    assert cache.get('HASH1') is None
+    cache.put('HASH1', '[DECRYPTED] meet at noon')
+    assert cache.get('HASH1') == '[DECRYPTED] meet at noon'
+    cache.close()
+
+    with sqlite3.connect(db_path) as conn:
+        stored = conn.execute("SELECT encrypted_message FROM processed_messages").fetchone()[0]
+    assert 'noon' not in stored
+
+    cache = ProcessedMessageCache(db_path, key)
+    assert 'HASH1' in cache and len(cache) == 1
+    assert cache.get('HASH1') == '[DECRYPTED] meet at noon'
+    cache.close()
+
+def test_entries_from_another_key_are_dropped(tmp_path):
+    db_path = tmp_path / "messages.sqlite"
+    cache = ProcessedMessageCache(db_path, Fernet.generate_key())
+    cache.put('HASH1', 'hello')
+    cache.close()
+
+    cache = ProcessedMessageCache(db_path, Fernet.generate_key())
+    assert cache.get('HASH1') is None
+    assert 'HASH1' not in cache
+    cache.close()
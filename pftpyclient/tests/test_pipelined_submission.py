@@ -0,0 +1,138 @@
+import dataclasses
+
+from xrpl.models.amounts import IssuedCurrencyAmount
+from xrpl.models.transactions import Memo, Payment
+from xrpl.wallet import Wallet
+
+from pftpyclient.utilities.pipelined_submission import PipelinedSubmitter
+from pftpyclient.utilities.transaction_journal import JournalStatus, TransactionJournal
+
+WALLET = Wallet.create()
+DESTINATION = Wallet.create().address
+
+class FakeSubmitter(PipelinedSubmitter):
+    """Simulates a ledger: submissions are validated on the next poll unless told otherwise"""
+
+    def __init__(self, wallet, engine_results=None, validated_results=None, **kwargs):
+        super().__init__(client=None, wallet=wallet, poll_interval=0, **kwargs)
+        self.sequence = 10
+        self.ledger = 100
+        self.engine_results = list(engine_results or [])  # preliminary result of each submit, tesSUCCESS once exhausted
+        self.validated_results = dict(validated_results or {})  # submit index -> final result, None to drop
+        self.submitted = []
+        self.validated = []
+
+    def _get_validated_ledger(self):
+        return self.ledger
+
+    def _autofill(self, transaction):
+        return dataclasses.replace(transaction, sequence=self.sequence, fee='12', last_ledger_sequence=self.ledger + 2)
+
+    def _submit(self, signed_transaction):
+        index = len(self.submitted)
+        self.submitted.append(signed_transaction)
+        engine_result = self.engine_results.pop(0) if self.engine_results else 'tesSUCCESS'
+        if engine_result.startswith(('tes', 'tec', 'ter')):  # ter results are held and may apply later
+            result = self.validated_results.get(index, 'tesSUCCESS' if engine_result.startswith('ter') else engine_result)
+            if result is not None:
+                self.validated.append({
+                    'hash': signed_transaction.get_hash(),
+                    'validated': True,
+                    'meta': {'TransactionResult': result},
+                    'tx_json': signed_transaction.to_xrpl(),
+                })
+                self.sequence = signed_transaction.sequence + 1
+        return engine_result
+
+    def _fetch_validated_transactions(self, start_ledger):
+        self.ledger += 1
+        return self.validated, self.ledger
+
+def make_payments(count):
+    return [
+        Payment(
+            account=WALLET.address,
+            destination=DESTINATION,
+            amount=IssuedCurrencyAmount(currency='PFT', issuer=DESTINATION, value='1'),
+            memos=[Memo(memo_data=f'chunk_{i + 1}__'.encode().hex())]
+        )
+        for i in range(count)
+    ]
+
+def test_batch_uses_consecutive_sequences_and_keeps_order():
+    submitter = FakeSubmitter(WALLET)
+    results = submitter.submit(make_payments(4))
+
+    assert [tx.sequence for tx in submitter.submitted] == [10, 11, 12, 13]
+    assert {tx.last_ledger_sequence for tx in submitter.submitted} == {102}
+    assert [r.result['tx_json']['Memos'][0]['Memo']['MemoData'] for r in results] == \
+        [f'chunk_{i}__'.encode().hex() for i in range(1, 5)]
+    assert all(r.is_successful() for r in results)
+
+def test_only_rejected_and_expired_transactions_are_resubmitted():
+    # The third submit is rejected, so the fourth is never sent; the second is dropped and expires
+    submitter = FakeSubmitter(WALLET, engine_results=['tesSUCCESS', 'tesSUCCESS', 'telINSUF_FEE_P'], validated_results={1: None})
+    results = submitter.submit(make_payments(4))
+
+    first_round = submitter.submitted[:3]
+    second_round = submitter.submitted[3:]
+    assert [tx.sequence for tx in first_round] == [10, 11, 12]
+    assert [tx.memos for tx in second_round] == [p.memos for p in make_payments(4)[1:]]
+    assert [tx.sequence for tx in second_round] == [11, 12, 13]
+    assert all(not isinstance(r, str) for r in results)
+
+def test_held_ter_results_are_waited_for_instead_of_resubmitted():
+    # terPRE_SEQ is held by the server and validates once the gap before it is filled
+    submitter = FakeSubmitter(WALLET, engine_results=['tesSUCCESS', 'terPRE_SEQ', 'tesSUCCESS'])
+    results = submitter.submit(make_payments(3))
+
+    assert [tx.sequence for tx in submitter.submitted] == [10, 11, 12]
+    assert all(r.is_successful() for r in results)
+
+def test_tec_results_are_final():
+    submitter = FakeSubmitter(WALLET, validated_results={1: 'tecPATH_DRY'})
+    results = submitter.submit(make_payments(3))
+
+    assert len(submitter.submitted) == 3
+    assert results[1] == 'Transaction failed: tecPATH_DRY'
+    assert results[0].is_successful() and results[2].is_successful()
+
+def test_gives_up_after_max_attempts():
+    submitter = FakeSubmitter(WALLET, engine_results=['telINSUF_FEE_P'] * 5, max_attempts=2)
+    results = submitter.submit(make_payments(2))
+
+    assert len(submitter.submitted) == 2
+    assert results == [
+        'Transaction submission failed: telINSUF_FEE_P',
+        'Transaction not submitted: an earlier transaction in the batch was rejected',
+    ]
+
+def test_journal_records_each_attempt(tmp_path):
+    journal = TransactionJournal(tmp_path / 'journal.sqlite')
+    submitter = FakeSubmitter(WALLET, engine_results=['tesSUCCESS', 'telINSUF_FEE_P'], journal=journal)
+    submitter.submit(make_payments(3))
+
+    statuses = [journal.get(tx.get_hash()).status for tx in submitter.submitted]
+    assert statuses == [JournalStatus.VALIDATED, JournalStatus.REJECTED, JournalStatus.VALIDATED, JournalStatus.VALIDATED]
+    assert len(journal) == 5  # the third transaction of the first round was signed but never submitted
+    assert journal.unresolved() == []
+    journal.close()
+
+def test_journal_resolves_transactions_not_sent_after_a_submit_error(tmp_path):
+    class RaisingSubmitter(FakeSubmitter):
+        def _submit(self, signed_transaction):
+            if len(self.submitted) == 1:
+                self.submitted.append(signed_transaction)
+                raise ConnectionError("connection reset")
+            return super()._submit(signed_transaction)
+
+    journal = TransactionJournal(tmp_path / 'journal.sqlite')
+    submitter = RaisingSubmitter(WALLET, journal=journal, max_attempts=1)
+    submitter.submit(make_payments(4))
+
+    # The transaction that raised may have reached the server, so it is waited for; the two after it were never sent
+    statuses = [journal.get(tx.get_hash()).status for tx in submitter.submitted]
+    assert statuses == [JournalStatus.VALIDATED, JournalStatus.EXPIRED]
+    assert len(journal) == 4
+    assert journal.unresolved() == []
+    journal.close()
@@ -0,0 +1,69 @@
+from pftpyclient.configuration.configuration import GLOBAL_CONFIG_DEFAULTS
+from pftpyclient.utilities.refresh_scheduler import RefreshScheduler
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_scheduler(clock, min_interval=4, max_delay=15):
+    flushes = []
+    scheduler = RefreshScheduler(
+        lambda grids, balances: flushes.append((grids, balances)), min_interval, max_delay=max_delay, clock=clock
+    )
+    return scheduler, flushes
+
+def test_burst_is_flushed_once_per_ledger_close():
+    clock = Clock()
+    scheduler, flushes = make_scheduler(clock)
+
+    for i in range(10):
+        scheduler.mark_grids(['memos', 'summary'])
+        scheduler.mark_balance('pft', 100 + i)
+    assert flushes == []
+
+    assert scheduler.on_ledger_closed(1000)
+    assert flushes == [({'memos', 'summary'}, {'pft': 109})]
+    assert scheduler.coalesced == 19
+    assert not scheduler.on_ledger_closed(1001)  # nothing dirty
+
+def test_transactions_of_a_ledger_are_flushed_at_the_next_close():
+    # rippled sends ledgerClosed for a ledger before the transactions validated in it
+    clock = Clock()
+    scheduler, flushes = make_scheduler(clock, min_interval=GLOBAL_CONFIG_DEFAULTS['refresh_min_interval_sec'])
+    scheduler.mark_grids(['payments'])
+    assert scheduler.on_ledger_closed(1000)
+
+    clock.now = 0.1
+    scheduler.mark_grids(['memos'])  # streamed after ledger 1000 closed
+    scheduler.mark_balance('pft', 100)
+    clock.now = 3.5
+    assert scheduler.on_ledger_closed(1001)
+    assert flushes == [({'payments'}, {}), ({'memos'}, {'pft': 100})]
+
+def test_min_interval_defers_to_a_later_ledger():
+    clock = Clock()
+    scheduler, flushes = make_scheduler(clock, min_interval=4)
+    scheduler.mark_grids(['payments'])
+    scheduler.on_ledger_closed(1000)
+
+    clock.now = 3
+    scheduler.mark_grids(['memos'])
+    assert not scheduler.on_ledger_closed(1001)
+    clock.now = 6
+    assert scheduler.on_ledger_closed(1002)
+    assert flushes == [({'payments'}, {}), ({'memos'}, {})]
+
+def test_overdue_marks_are_flushed_without_ledger_closes():
+    clock = Clock()
+    scheduler, flushes = make_scheduler(clock)
+    scheduler.mark_grids(['rewards'])
+
+    clock.now = 10
+    assert not scheduler.flush_overdue()
+    clock.now = 16
+    assert scheduler.flush_overdue()
+    assert flushes == [({'rewards'}, {})]
+    assert scheduler.flushes == 1 and scheduler.coalesced == 0
@@ -0,0 +1,47 @@
+import httpx
+import pytest
+from xrpl.models.requests import ServerInfo
+from pftpyclient.utilities.rpc_pool import JsonRpcPool
+
+def make_transport(down=(), busy=()):
+    """Answers server_info for every endpoint except the ones that are down or report tooBusy"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        endpoint = str(request.url)
+        requests.append(endpoint)
+        if endpoint in down:
+            raise httpx.ConnectError("connection refused", request=request)
+        if endpoint in busy:
+            return httpx.Response(200, json={'result': {'status': 'error', 'error': 'tooBusy'}})
+        return httpx.Response(200, json={'result': {'status': 'success', 'info': {'endpoint': endpoint}}})
+
+    return httpx.MockTransport(handler), requests
+
+def test_requests_use_preferred_endpoint():
+    transport, requests = make_transport()
+    pool = JsonRpcPool(['https://a/', 'https://b/'], transport=transport)
+    for _ in range(3):
+        assert pool.client.request(ServerInfo()).result['info']['endpoint'] == 'https://a/'
+    assert requests == ['https://a/'] * 3
+    assert pool.get_health('https://a/').latency is not None
+
+def test_failover_and_cooldown():
+    transport, requests = make_transport(down={'https://a/'}, busy={'https://b/'})
+    pool = JsonRpcPool(['https://a/', 'https://b/', 'https://c/'], transport=transport)
+
+    assert pool.client.request(ServerInfo()).result['info']['endpoint'] == 'https://c/'
+    assert requests == ['https://a/', 'https://b/', 'https://c/']
+
+    # Failed endpoints are skipped while cooling down
+    requests.clear()
+    pool.client.request(ServerInfo())
+    assert requests == ['https://c/']
+    assert pool.get_health('https://a/').consecutive_failures == 1
+
+def test_pinned_client_does_not_fail_over():
+    transport, requests = make_transport(down={'https://a/'})
+    pool = JsonRpcPool(['https://a/', 'https://b/'], transport=transport)
+    with pytest.raises(httpx.ConnectError):
+        pool.client_for('https://a/').request(ServerInfo())
+    assert requests == ['https://a/']
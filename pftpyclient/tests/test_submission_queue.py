@@ -0,0 +1,136 @@
+import dataclasses
+import threading
+import time
+
+import pytest
+import xrpl
+from xrpl.models.requests import Tx
+from xrpl.models.response import Response, ResponseStatus
+from xrpl.models.transactions import Payment
+from xrpl.transaction import XRPLReliableSubmissionException
+from xrpl.wallet import Wallet
+
+from pftpyclient.utilities.submission_queue import (
+    SubmissionStatus,
+    TransactionQueue,
+    ValidationWatcher,
+    submit_and_confirm,
+    summarize_responses,
+)
+from pftpyclient.utilities.transaction_journal import JournalStatus, TransactionJournal, transaction_intent
+
+def validated_response(tx_hash):
+    return Response(status=ResponseStatus.SUCCESS, result={'hash': tx_hash, 'validated': True})
+
+@pytest.fixture
+def queue():
+    updates = []
+    queue = TransactionQueue(on_update=lambda submission: updates.append((submission.submission_id, submission.status)))
+    queue.updates = updates
+    queue.start()
+    yield queue
+    queue.stop()
+
+def test_actions_run_in_order_without_blocking_the_caller(queue):
+    release = threading.Event()
+    order = []
+
+    def action(name):
+        def run():
+            release.wait(timeout=5)
+            order.append(name)
+            return validated_response(name)
+        return run
+
+    futures = [queue.submit(f"action {name}", action(name)) for name in ['A', 'B', 'C']]
+    assert not any(future.done() for future in futures)
+    assert queue.pending() == 3
+
+    release.set()
+    results = [future.result(timeout=5) for future in futures]
+
+    assert order == ['A', 'B', 'C']
+    assert [result.result['hash'] for result in results] == ['A', 'B', 'C']
+    assert [submission.status for submission in queue.submissions] == [SubmissionStatus.VALIDATED] * 3
+    assert [status for submission_id, status in queue.updates if submission_id == 2] == [
+        SubmissionStatus.QUEUED, SubmissionStatus.SUBMITTING, SubmissionStatus.VALIDATED
+    ]
+    assert queue.pending() == 0
+
+def test_failures_are_tracked_and_raised(queue):
+    def raises():
+        raise ValueError("no such task")
+
+    failed = queue.submit("raises", raises)
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    rejected = queue.submit("rejected", lambda: "Transaction submission failed: tecPATH_DRY")
+    rejected.result(timeout=5)
+
+    assert [(s.status, s.detail) for s in queue.submissions] == [
+        (SubmissionStatus.FAILED, "no such task"),
+        (SubmissionStatus.FAILED, "Transaction submission failed: tecPATH_DRY"),
+    ]
+
+def test_summarize_chunked_responses():
+    assert summarize_responses([validated_response('A'), validated_response('B')]) == (SubmissionStatus.VALIDATED, "A, B")
+    assert summarize_responses([validated_response('A'), "Transaction expired"]) == (SubmissionStatus.FAILED, "Transaction expired")
+
+def test_watcher_returns_streamed_validation():
+    watcher = ValidationWatcher()
+    watcher.on_ledger_closed(100)
+    assert watcher.is_live()
+
+    def stream():
+        time.sleep(0.05)
+        watcher.on_transaction({'hash': 'ABC', 'validated': True, 'meta': {'TransactionResult': 'tesSUCCESS'}})
+    threading.Thread(target=stream).start()
+
+    assert watcher.wait_for('ABC', last_ledger_sequence=120)['meta']['TransactionResult'] == 'tesSUCCESS'
+    # Validations that arrived before waiting are found in the history
+    assert watcher.wait_for('ABC', last_ledger_sequence=120)['hash'] == 'ABC'
+
+def test_watcher_expires_and_goes_quiet(monkeypatch):
+    watcher = ValidationWatcher()
+    assert watcher.wait_for('ABC', last_ledger_sequence=120) is None
+
+    watcher.on_transaction({'hash': 'UNVALIDATED', 'validated': False})
+    watcher.on_ledger_closed(121)
+    with pytest.raises(XRPLReliableSubmissionException):
+        watcher.wait_for('ABC', last_ledger_sequence=120)
+    assert watcher.get_validated() == []
+
+    monkeypatch.setattr('pftpyclient.configuration.constants.VALIDATION_STREAM_TIMEOUT_SEC', 0)
+    assert not watcher.is_live()
+    assert watcher.wait_for('ABC', last_ledger_sequence=200) is None
+
+def test_earlier_attempt_validated_outside_the_stream_is_not_resent(tmp_path, monkeypatch):
+    wallet = Wallet.create()
+    payment = Payment(account=wallet.address, destination=Wallet.create().address, amount='1000')
+    signed = xrpl.transaction.sign(dataclasses.replace(payment, sequence=10, fee='12', last_ledger_sequence=120), wallet)
+    journal = TransactionJournal(tmp_path / 'journal.sqlite')
+    journal.record(signed, transaction_intent(payment))
+
+    # The earlier attempt validated before a restart, so the stream never delivered it
+    class NodeClient:
+        def request(self, request):
+            assert isinstance(request, Tx) and request.transaction == signed.get_hash()
+            return Response(status=ResponseStatus.SUCCESS, result={
+                'hash': signed.get_hash(), 'validated': True, 'ledger_index': 110, 'meta': {'TransactionResult': 'tesSUCCESS'}
+            })
+
+    def resign(*args):
+        raise AssertionError("a new transaction was signed")
+
+    monkeypatch.setattr('xrpl.transaction.submit', lambda transaction, client: Response(
+        status=ResponseStatus.SUCCESS, result={'engine_result': 'tefPAST_SEQ'}
+    ))
+    monkeypatch.setattr('xrpl.transaction.autofill_and_sign', resign)
+    watcher = ValidationWatcher()
+    watcher.on_ledger_closed(130)
+
+    response = submit_and_confirm(payment, NodeClient(), wallet, watcher=watcher, journal=journal)
+
+    assert response.result['hash'] == signed.get_hash()
+    assert journal.get(signed.get_hash()).status == JournalStatus.VALIDATED
+    journal.close()
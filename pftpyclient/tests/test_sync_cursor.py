@@ -0,0 +1,88 @@
+import pandas as pd
+from xrpl.wallet import Wallet
+
+from pftpyclient.utilities.sync_cursor import SyncCursor
+from pftpyclient.utilities.task_manager import PostFiatTaskManager
+from pftpyclient.utilities.wallet_state import WalletStateTracker
+
+class SuccessfulResponse:
+    def is_successful(self):
+        return True
+
+class FakeClient:
+    def request(self, request):
+        return SuccessfulResponse()
+
+class FakeTaskManager(PostFiatTaskManager):
+    """Task manager over an in-memory ledger and history file, without credentials or a node"""
+
+    def __init__(self, ledger, saved_history, cursor_path):
+        self.ledger = ledger  # transactions validated on the network, in ledger order
+        self.saved_history = saved_history  # stands in for the transaction cache file
+        self.fetched_from = []
+        self.user_wallet = Wallet.create()
+        self.client = FakeClient()
+        self.transactions = pd.DataFrame()
+        for name in ['memo_transactions', 'tasks', 'memos', 'system_memos']:
+            setattr(self, name, pd.DataFrame())
+        self.tx_history_filepath = 'transactions.csv'
+        self.tx_store = None
+        self.tx_index = None
+        self.backfill_pending = False
+        self.wallet_state_tracker = WalletStateTracker('node')
+        self.sync_cursor = SyncCursor(cursor_path)
+
+    def get_server_ledger_range(self):
+        return 1, max(tx['ledger_index'] for tx in self.ledger)
+
+    def get_new_transactions(self, last_known_ledger_index):
+        self.fetched_from.append(last_known_ledger_index)
+        return [tx for tx in self.ledger if tx['ledger_index'] >= last_known_ledger_index]
+
+    def load_transactions(self):
+        return pd.DataFrame(self.saved_history)
+
+    def save_transactions(self, new_tx_df=None):
+        self.saved_history[:] = self.transactions.to_dict('records')
+
+    def restore_memo_transactions(self, loaded_tx_df):
+        pass
+
+    def sync_memo_transactions(self, new_tx_df):
+        pass
+
+    def reconcile_transaction_journal(self, tx_df=None, validated_ledger=None):
+        pass
+
+def transaction(ledger_index):
+    return {'hash': f'HASH{ledger_index}', 'ledger_index': ledger_index, 'tx_json': {}, 'meta': {}, 'validated': True}
+
+def test_cursor_survives_reloads(tmp_path):
+    path = tmp_path / 'cursor.json'
+    cursor = SyncCursor(path)
+    assert cursor.get() is None
+
+    cursor.set(120)
+    assert SyncCursor(path).get() == 120
+
+    cursor.clear()
+    assert SyncCursor(path).get() is None
+
+def test_streamed_transaction_after_a_gap_does_not_skip_the_gap(tmp_path):
+    ledger = [transaction(100)]
+    saved_history = [transaction(100)]
+    task_manager = FakeTaskManager(ledger, saved_history, tmp_path / 'cursor.json')
+    task_manager.sync_transactions()
+    assert task_manager.sync_cursor.get() == 100
+
+    # Ledger 150 validates while the websocket is down, then ledger 200 is streamed
+    ledger += [transaction(150), transaction(200)]
+    task_manager.ingest_transaction(transaction(200))
+    assert saved_history[-1]['ledger_index'] == 200
+
+    restarted = FakeTaskManager(ledger, saved_history, tmp_path / 'cursor.json')
+    restarted.sync_transactions()
+
+    assert restarted.fetched_from == [101]
+    assert sorted(restarted.transactions['ledger_index']) == [100, 150, 200]
+    assert restarted.sync_cursor.get() == 200
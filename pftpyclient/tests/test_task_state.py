@@ -0,0 +1,83 @@
+import datetime
+import pandas as pd
+from pftpyclient.configuration.constants import TaskType
+from pftpyclient.utilities.task_state import TaskStateTable
+
+def task_row(hash, task_id, task_type, minute):
+    return {
+        'hash': hash,
+        'task_id': task_id,
+        'user': 'alice',
+        'full_output': f"{task_type.value}{task_id} {task_type.name.lower()}",
+        'counterparty_address': 'rNode',
+        'datetime': datetime.datetime(2024, 1, 1, 12, minute),
+        'task_type': task_type.name
+    }
+
+def test_incremental_task_states():
+    table = TaskStateTable()
+    table.update(pd.DataFrame([
+        task_row('H1', '2024-01-01_12:00__AA11', TaskType.REQUEST_POST_FIAT, 0),
+        task_row('H2', '2024-01-01_12:00__AA11', TaskType.PROPOSAL, 1),
+        task_row('H3', '2024-01-01_12:05__BB22', TaskType.PROPOSAL, 5),
+        task_row('H4', '2024-01-01_12:06__CC33', TaskType.PROPOSAL, 6),
+    ]))
+
+    proposals = table.get_proposals()
+    assert proposals['task_id'].tolist() == ['2024-01-01_12:06__CC33', '2024-01-01_12:05__BB22', '2024-01-01_12:00__AA11']
+    first = proposals.iloc[-1]
+    assert first['request'] == '2024-01-01_12:00__AA11 request_post_fiat'
+    assert first['proposal'] == '2024-01-01_12:00__AA11 proposal'
+    assert first['response'] == ''
+
+    # A later batch moves tasks through acceptance, refusal, verification and reward
+    table.update(pd.DataFrame([
+        task_row('H5', '2024-01-01_12:00__AA11', TaskType.ACCEPTANCE, 10),
+        task_row('H6', '2024-01-01_12:05__BB22', TaskType.REFUSAL, 11),
+        task_row('H7', '2024-01-01_12:06__CC33', TaskType.VERIFICATION_PROMPT, 12),
+        task_row('H5', '2024-01-01_12:00__AA11', TaskType.ACCEPTANCE, 10),  # duplicate hash is ignored
+    ]))
+
+    proposals = table.get_proposals()
+    assert proposals['task_id'].tolist() == ['2024-01-01_12:00__AA11']
+    assert proposals.iloc[0]['response'] == 'ACCEPTED: 2024-01-01_12:00__AA11 acceptance'
+
+    with_refused = table.get_proposals(include_refused=True)
+    assert with_refused['task_id'].tolist() == ['2024-01-01_12:05__BB22', '2024-01-01_12:00__AA11']
+    assert with_refused.iloc[0]['response'] == 'REFUSED: 2024-01-01_12:05__BB22 refusal'
+
+    verifications = table.get_verifications()
+    assert verifications['task_id'].tolist() == ['2024-01-01_12:06__CC33']
+    assert verifications.iloc[0]['verification'] == '2024-01-01_12:06__CC33 verification_prompt'
+
+    table.update(
+        pd.DataFrame([task_row('H8', '2024-01-01_12:06__CC33', TaskType.REWARD, 20)]),
+        payouts={'2024-01-01_12:06__CC33': 900.0}
+    )
+    assert table.get_verifications().empty
+    rewards = table.get_rewards()
+    assert rewards.to_dict('records') == [{
+        'task_id': '2024-01-01_12:06__CC33',
+        'proposal': '2024-01-01_12:06__CC33 proposal',
+        'reward': '2024-01-01_12:06__CC33 reward',
+        'payout': 900.0
+    }]
+    assert table.get_latest_state('2024-01-01_12:06__CC33') == TaskType.REWARD.name
+
+def test_out_of_order_rows_keep_latest_state():
+    table = TaskStateTable()
+    table.update(pd.DataFrame([task_row('H2', 'T1', TaskType.ACCEPTANCE, 10)]))
+    table.update(pd.DataFrame([task_row('H1', 'T1', TaskType.PROPOSAL, 1)]))
+    assert table.get_latest_state('T1') == TaskType.ACCEPTANCE.name
+    assert table.get_proposals().iloc[0]['proposal'] == 'T1 proposal'
+
+def test_copy_is_unaffected_by_later_updates():
+    table = TaskStateTable()
+    table.update(pd.DataFrame([task_row('H1', '2024-01-01_12:00__AA11', TaskType.PROPOSAL, 0)]))
+    snapshot = table.copy()
+
+    table.update(pd.DataFrame([task_row('H2', '2024-01-01_12:00__AA11', TaskType.ACCEPTANCE, 1)]))
+
+    assert snapshot.get_latest_state('2024-01-01_12:00__AA11') == TaskType.PROPOSAL.name
+    assert snapshot.get_proposals()['response'].tolist() == ['']
+    assert table.get_latest_state('2024-01-01_12:00__AA11') == TaskType.ACCEPTANCE.name
@@ -0,0 +1,82 @@
+import datetime
+import pandas as pd
+from pftpyclient.utilities.transaction_index import TransactionIndex
+
+NODE = 'rNode'
+
+def make_system_memos():
+    return pd.DataFrame([
+        {'hash': 'H1', 'task_id': 'HANDSHAKE', 'user': 'alice', 'full_output': 'MYKEY',
+         'counterparty_address': NODE, 'datetime': datetime.datetime(2024, 1, 1, 12, 0), 'direction': 'OUTGOING'},
+        {'hash': 'H2', 'task_id': 'HANDSHAKE', 'user': 'node', 'full_output': 'OLDKEY',
+         'counterparty_address': NODE, 'datetime': datetime.datetime(2024, 1, 1, 12, 5), 'direction': 'INCOMING'},
+        {'hash': 'H3', 'task_id': 'HANDSHAKE', 'user': 'node', 'full_output': 'NEWKEY',
+         'counterparty_address': NODE, 'datetime': datetime.datetime(2024, 1, 2, 12, 5), 'direction': 'INCOMING'},
+    ])
+
+def make_tasks():
+    return pd.DataFrame([
+        {'hash': 'T1', 'task_id': '2024-01-01_12:00__AB12', 'user': 'node', 'full_output': 'PROPOSED PF ___ do it',
+         'counterparty_address': NODE, 'datetime': datetime.datetime(2024, 1, 1, 12, 0), 'task_type': 'PROPOSAL'},
+        {'hash': 'T2', 'task_id': '2024-01-01_12:00__AB12', 'user': 'alice', 'full_output': 'ACCEPTANCE REASON ___ ok',
+         'counterparty_address': NODE, 'datetime': datetime.datetime(2024, 1, 1, 13, 0), 'task_type': 'ACCEPTANCE'},
+        {'hash': 'T3', 'task_id': '2024-01-02_12:00__CD34', 'user': 'node', 'full_output': 'PROPOSED PF ___ other',
+         'counterparty_address': NODE, 'datetime': datetime.datetime(2024, 1, 2, 12, 0), 'task_type': 'PROPOSAL'},
+    ])
+
+def test_upsert_lookup_and_reload(tmp_path):
+    db_path = tmp_path / "index.sqlite"
+    index = TransactionIndex(db_path)
+    assert index.get_last_ledger_index() is None
+
+    index.upsert_tasks(make_tasks())
+    index.upsert_tasks(make_tasks())  # upserts are idempotent by hash
+    index.upsert_system_memos(make_system_memos())
+    index.set_last_ledger_index(1234)
+
+    task_df = index.get_task('2024-01-01_12:00__AB12')
+    assert task_df['hash'].tolist() == ['T1', 'T2']
+    assert task_df.sort_values('datetime').iloc[-1]['task_type'] == 'ACCEPTANCE'
+    assert index.get_task('missing').empty
+
+    assert index.get_handshake(NODE, 'HANDSHAKE') == (True, 'NEWKEY')
+    assert index.get_handshake('rOther', 'HANDSHAKE') == (False, None)
+    index.close()
+
+    # Derived data survives a restart
+    index = TransactionIndex(db_path)
+    assert index.get_last_ledger_index() == 1234
+    assert len(index.load_tasks()) == 3
+    assert len(index.load_system_memos()) == 3
+
+    index.clear()
+    assert index.get_last_ledger_index() is None
+    assert index.load_tasks().empty
+    index.close()
+
+def test_memo_transactions_round_trip(tmp_path):
+    index = TransactionIndex(tmp_path / "index.sqlite")
+    memo_tx_df = pd.DataFrame([{
+        'hash': 'M1',
+        'ledger_index': 100,
+        'datetime': datetime.datetime(2024, 1, 1, 12, 0),
+        'account': 'rMe',
+        'destination': NODE,
+        'direction': 'OUTGOING',
+        'counterparty_address': NODE,
+        'is_pft': True,
+        'validated': True,
+        'memo_data': {'user': 'alice', 'task_id': 'INITIATION_RITE', 'full_output': 'I commit'},
+        'tx_json': {'Account': 'rMe', 'Destination': NODE, 'DeliverMax': {'currency': 'PFT', 'value': '1'}},
+        'meta': {'TransactionResult': 'tesSUCCESS'},
+    }])
+    index.upsert_memo_transactions(memo_tx_df)
+
+    loaded = index.load_memo_transactions()
+    row = loaded.iloc[0]
+    assert row['memo_data'] == {'user': 'alice', 'task_id': 'INITIATION_RITE', 'full_output': 'I commit'}
+    assert row['tx_json']['DeliverMax']['value'] == '1'
+    assert row['meta']['TransactionResult'] == 'tesSUCCESS'
+    assert bool(row['is_pft']) is True
+    assert row['datetime'] == pd.Timestamp(2024, 1, 1, 12, 0)
+    index.close()
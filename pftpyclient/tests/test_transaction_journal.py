@@ -0,0 +1,72 @@
+import dataclasses
+
+from xrpl.models.transactions import Memo, Payment
+from xrpl.transaction import sign
+from xrpl.wallet import Wallet
+
+from pftpyclient.utilities.transaction_journal import JournalStatus, TransactionJournal, transaction_intent
+
+WALLET = Wallet.create()
+DESTINATION = Wallet.create().address
+
+def make_payment(memo='hello', amount='1000'):
+    return Payment(
+        account=WALLET.address,
+        destination=DESTINATION,
+        amount=amount,
+        memos=[Memo(memo_data=memo.encode().hex())]
+    )
+
+def signed_payment(payment, sequence=10, last_ledger_sequence=120):
+    return sign(dataclasses.replace(payment, sequence=sequence, fee='12', last_ledger_sequence=last_ledger_sequence), WALLET)
+
+def test_entries_persist_and_are_found_by_hash(tmp_path):
+    path = tmp_path / 'journal.sqlite'
+    payment = make_payment()
+    signed = signed_payment(payment)
+
+    journal = TransactionJournal(path)
+    journal.record(signed, transaction_intent(payment))
+    journal.update(signed.get_hash(), JournalStatus.SUBMITTED, 'tesSUCCESS')
+    journal.close()
+
+    journal = TransactionJournal(path)
+    entry = journal.get(signed.get_hash())
+    assert signed.get_hash() in journal
+    assert entry.status == JournalStatus.SUBMITTED
+    assert entry.result == 'tesSUCCESS'
+    assert entry.tx_blob == signed.blob()
+    assert journal.find_unresolved(transaction_intent(payment)) == entry
+    journal.close()
+
+def test_intent_ignores_signing_fields():
+    payment = make_payment()
+    assert transaction_intent(signed_payment(payment, sequence=10)) == transaction_intent(payment)
+    assert transaction_intent(signed_payment(payment, sequence=11, last_ledger_sequence=200)) == transaction_intent(payment)
+    assert transaction_intent(make_payment(amount='2000')) != transaction_intent(payment)
+
+def test_reconcile_and_expire(tmp_path):
+    journal = TransactionJournal(tmp_path / 'journal.sqlite')
+    validated = signed_payment(make_payment('validated'), sequence=10, last_ledger_sequence=120)
+    expired = signed_payment(make_payment('expired'), sequence=11, last_ledger_sequence=120)
+    pending = signed_payment(make_payment('pending'), sequence=12, last_ledger_sequence=130)
+    for signed in [validated, expired, pending]:
+        journal.record(signed, transaction_intent(signed))
+
+    resolved = journal.reconcile([
+        {'hash': validated.get_hash(), 'meta': {'TransactionResult': 'tecPATH_DRY'}, 'ledger_index': 118},
+        {'hash': 'UNKNOWN', 'meta': {'TransactionResult': 'tesSUCCESS'}, 'ledger_index': 118},
+    ])
+    assert resolved == 1
+    assert journal.expire(validated_ledger=125) == 1
+
+    assert journal.get(validated.get_hash()).status == JournalStatus.VALIDATED
+    assert journal.get(validated.get_hash()).result == 'tecPATH_DRY'
+    assert journal.get(validated.get_hash()).ledger_index == 118
+    assert journal.get(expired.get_hash()).status == JournalStatus.EXPIRED
+    assert journal.unresolved_hashes() == {pending.get_hash()}
+
+    # Validated entries are final
+    journal.update(validated.get_hash(), JournalStatus.EXPIRED)
+    assert journal.get(validated.get_hash()).status == JournalStatus.VALIDATED
+    journal.close()
@@ -0,0 +1,45 @@
+import pandas as pd
+from pftpyclient.utilities.transaction_store import SegmentedTransactionStore
+
+def make_transactions(start_ledger, count):
+    return pd.DataFrame([
+        {
+            'hash': f"HASH{ledger}",
+            'ledger_index': ledger,
+            'validated': True,
+            'tx_json': {'Account': 'rSender', 'Destination': 'rReceiver', 'Memos': [{'Memo': {'MemoData': '6869'}}]},
+            'meta': {'TransactionResult': 'tesSUCCESS', 'delivered_amount': '10'},
+        }
+        for ledger in range(start_ledger, start_ledger + count)
+    ])
+
+def test_append_load_and_compact(tmp_path):
+    store = SegmentedTransactionStore(str(tmp_path / "store"), compaction_threshold=3)
+    assert store.is_empty()
+
+    store.append(make_transactions(100, 5))
+    store.append(make_transactions(103, 5))  # overlaps the first segment by two transactions
+    assert len(store.segments) == 2
+    assert store.get_ledger_range() == (100, 107)
+
+    # Manifest is persisted and reloaded
+    store = SegmentedTransactionStore(str(tmp_path / "store"), compaction_threshold=3)
+    tx_df = store.load()
+    assert len(tx_df) == 8
+    assert tx_df.iloc[0]['tx_json']['Memos'][0]['Memo']['MemoData'] == '6869'
+    assert tx_df.iloc[0]['meta']['delivered_amount'] == '10'
+
+    # Column projection only reads the requested columns
+    ledger_df = store.load(columns=['ledger_index'])
+    assert list(ledger_df.columns) == ['ledger_index']
+
+    # Third segment triggers compaction into a single deduplicated segment
+    store.append(make_transactions(108, 2))
+    assert len(store.segments) == 1
+    assert store.segments[0]['rows'] == 10
+    assert len(list((tmp_path / "store").glob("*.parquet"))) == 1
+    assert store.load()['ledger_index'].tolist() == list(range(100, 110))
+
+    store.clear()
+    assert store.is_empty()
+    assert store.load().empty
@@ -0,0 +1,46 @@
+import pandas as pd
+from pftpyclient.utilities.wallet_state import WalletState, WalletStateTracker
+
+NODE = 'rNodeAddress'
+WALLET = 'rMyWallet'
+
+def memo_row(task_id, direction, counterparty=NODE):
+    return {
+        'memo_data': {'user': 'alice', 'task_id': task_id, 'full_output': 'data'},
+        'destination': counterparty if direction == 'OUTGOING' else WALLET,
+        'counterparty_address': counterparty,
+        'direction': direction
+    }
+
+def test_state_progresses_with_account_and_memo_flags():
+    tracker = WalletStateTracker(NODE)
+    assert tracker.account_stale
+    assert tracker.derive_state() == WalletState.UNFUNDED
+
+    tracker.update_account({'Balance': '20000000'}, [])
+    assert not tracker.account_stale
+    assert tracker.derive_state() == WalletState.FUNDED
+
+    tracker.update_account({'Balance': '19999988'}, [{'currency': 'PFT', 'balance': '0'}])
+    assert tracker.derive_state() == WalletState.TRUSTLINED
+
+    # Memo flags for other nodes, or later steps without earlier ones, do not advance the state
+    assert tracker.update_memos(pd.DataFrame([
+        memo_row('INITIATION_RITE', 'OUTGOING', counterparty='rOtherNode'),
+        memo_row('HANDSHAKE', 'OUTGOING'),
+    ]))
+    assert tracker.derive_state() == WalletState.TRUSTLINED
+
+    tracker.update_memos(pd.DataFrame([memo_row('INITIATION_RITE', 'OUTGOING')]))
+    assert tracker.derive_state() == WalletState.HANDSHAKE_SENT
+
+    tracker.update_memos(pd.DataFrame([memo_row('HANDSHAKE', 'INCOMING'), memo_row('google_doc_context_link', 'OUTGOING')]))
+    assert tracker.derive_state() == WalletState.ACTIVE
+    assert not tracker.update_memos(pd.DataFrame([memo_row('2024-01-01_12:00__AB12', 'INCOMING')]))
+
+def test_unfunded_account():
+    tracker = WalletStateTracker(NODE)
+    tracker.update_account(None, [])
+    assert tracker.derive_state() == WalletState.UNFUNDED
+    tracker.invalidate_account()
+    assert tracker.account_stale
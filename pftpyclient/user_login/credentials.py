@@ -1,6 +1,8 @@
 import sqlite3
 import json
 import shutil
+import threading
+from contextlib import contextmanager
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.hashes import SHA256
 from cryptography.fernet import Fernet
@@ -9,7 +11,7 @@ from loguru import logger
 from xrpl.core import addresscodec
 from xrpl.core.keypairs.ed25519 import ED25519
 import base64
-from pftpyclient.postfiatsecurity.hash_tools import derive_shared_secret
+from pftpyclient.postfiatsecurity.hash_tools import derive_shared_secret, derive_channel_fernet
 import time
 import re
 from xrpl.wallet import Wallet
@@ -27,6 +29,86 @@ def get_credentials_directory():
 def get_database_path():
     return get_credentials_directory() / CREDENTIALS_DB
 
+class UnlockSession:
+    """State of an unlocked CredentialManager for one login.
+
+    Holds a single Fernet for the derived encryption key, one database connection, and the user's
+    decrypted credentials and contacts. The decrypted values are loaded on first use and invalidated
+    on every write, so reads after the first one touch neither the disk nor the cipher.
+    """
+
+    def __init__(self, db_path, username: str, encryption_key: bytes):
+        self.db_path = db_path
+        self.username = username
+        self._fernet = Fernet(encryption_key)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._credentials = None  # key -> decrypted value
+        self._contacts = None  # address -> decrypted name
+
+    def connection(self) -> sqlite3.Connection:
+        """Returns the session's database connection, opening it if needed"""
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._conn
+
+    @contextmanager
+    def transaction(self):
+        """Yields the connection inside a transaction, committed on success"""
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                yield conn
+
+    def execute(self, query: str, params=()) -> list:
+        """Runs a query in its own transaction and returns all rows"""
+        with self.transaction() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def executemany(self, query: str, param_rows):
+        with self.transaction() as conn:
+            conn.executemany(query, param_rows)
+
+    def encrypt(self, value: str) -> str:
+        return self._fernet.encrypt(value.encode()).decode()
+
+    def decrypt(self, encrypted_value: str) -> str:
+        return self._fernet.decrypt(encrypted_value.encode()).decode()
+
+    def get_credentials(self) -> dict:
+        with self._lock:
+            if self._credentials is None:
+                rows = self.execute("""
+                    SELECT key, encrypted_value FROM credentials WHERE username = ?;
+                """, (self.username,))
+                self._credentials = {key: self.decrypt(value) for key, value in rows}
+            return self._credentials
+
+    def get_contacts(self) -> dict:
+        with self._lock:
+            if self._contacts is None:
+                rows = self.execute("""
+                    SELECT address, name FROM contacts WHERE username = ?;
+                """, (self.username,))
+                self._contacts = {address: self.decrypt(name) for address, name in rows}
+            return self._contacts
+
+    def invalidate(self):
+        """Drops the decrypted credentials and contacts, so they are reloaded on next use"""
+        with self._lock:
+            self._credentials = None
+            self._contacts = None
+
+    def close(self):
+        """Drops all decrypted state and closes the database connection"""
+        with self._lock:
+            self.invalidate()
+            self._fernet = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
 class CredentialManager:
     def __init__(self, username, password, allow_new_user=False):
         """Initialize CredentialManager
@@ -38,16 +120,22 @@ class CredentialManager:
         """
         self.postfiat_username = username.lower()
         self.db_path = get_database_path()
-        if not allow_new_user and not self.verify_password(password):
-            raise ValueError("Invalid username or password")
+        # PBKDF2 runs once per login; the key both verifies the password and unlocks the session
         self.encryption_key = self._derive_encryption_key(password)
+        if not allow_new_user and not self._verify_encryption_key(self.encryption_key):
+            raise ValueError("Invalid username or password")
+        self.session = UnlockSession(self.db_path, self.postfiat_username, self.encryption_key)
         self._key_expiry = time.time() + KEY_EXPIRY if KEY_EXPIRY >= 0 else float('inf')
         self._initialize_database()
         self.ecdh_public_key = None 
+        self._channel_ciphers = {}  # counterparty ECDH public key -> Fernet, for this session only
 
     def verify_password(self, password) -> bool:
         """Verify password by attempting to decrypt a known credential"""
-        test_key = self._derive_encryption_key(password)
+        return self._verify_encryption_key(self._derive_encryption_key(password))
+
+    def _verify_encryption_key(self, test_key) -> bool:
+        """Verify a derived encryption key by attempting to decrypt a known credential"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -70,16 +158,7 @@ class CredentialManager:
         self._check_key_expiry()
 
         key = f"{self.postfiat_username}__{credential_type}"
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT encrypted_value FROM credentials 
-                WHERE username = ? and key = ?;
-            """, (self.postfiat_username, key))
-            row = cursor.fetchone()
-            if row:
-                return self._decrypt_value(row[0])
-        return None
+        return self.session.get_credentials().get(key)
     
     def _check_key_expiry(self):
         """Check if encryption key has expired"""
@@ -249,36 +328,24 @@ class CredentialManager:
 
     def _encrypt_value(self, value):
         """Encrypt a value using the derived encryption key"""
-        fernet = Fernet(self.encryption_key)
-        return fernet.encrypt(value.encode()).decode()
+        return self.session.encrypt(value)
     
     def _decrypt_value(self, encrypted_value):
         """Decrypt a value using the derived encryption key"""
-        fernet = Fernet(self.encryption_key)
-        return fernet.decrypt(encrypted_value.encode()).decode()
+        return self.session.decrypt(encrypted_value)
     
     def _decrypt_creds(self):
         """Retrieve and decrypt all credentials for the user"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT key, encrypted_value FROM credentials WHERE username = ?;
-            """, (self.postfiat_username,))
-            rows = cursor.fetchall()
-        return {key: self._decrypt_value(value) for key, value in rows}
+        return dict(self.session.get_credentials())
     
     def enter_and_encrypt_credential(self, credentials_dict):
         """Encrypt and store multiple credentials"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            for key, value in credentials_dict.items():
-                encrypted_value = self._encrypt_value(value)
-                cursor.execute("""
-                    INSERT OR REPLACE INTO credentials (username, key, encrypted_value)
-                    VALUES (?, ?, ?);
-                """, (self.postfiat_username, key, encrypted_value))
-            conn.commit()
-            logger.info(f"Stored {len(credentials_dict)} credentials for {self.postfiat_username}")
+        self.session.executemany("""
+            INSERT OR REPLACE INTO credentials (username, key, encrypted_value)
+            VALUES (?, ?, ?);
+        """, [(self.postfiat_username, key, self._encrypt_value(value)) for key, value in credentials_dict.items()])
+        self.session.invalidate()
+        logger.info(f"Stored {len(credentials_dict)} credentials for {self.postfiat_username}")
 
     def change_password(self, new_password) -> bool:
         """Change the encryption password for the current user's credentials"""
@@ -290,26 +357,25 @@ class CredentialManager:
             contacts = self.get_contacts()
             self._backup_database()
             self.encryption_key = self._derive_encryption_key(new_password)
+            self.session.close()
+            self.session = UnlockSession(self.db_path, self.postfiat_username, self.encryption_key)
 
             # Re-encrypt and store credentials 
             self.enter_and_encrypt_credential(creds)
 
             # Re-encrypt and store contacts
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self.session.transaction() as conn:
                 # First clear existing contacts
-                cursor.execute("""
+                conn.execute("""
                     DELETE FROM contacts WHERE username = ?;
                 """, (self.postfiat_username,))
 
                 # Re-insert contacts with newly encrypted names
-                for address, name in contacts.items():
-                    encrypted_name = self._encrypt_value(name)
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO contacts (username, address, name)
-                        VALUES (?, ?, ?);
-                    """, (self.postfiat_username, address, encrypted_name))
-                conn.commit()
+                conn.executemany("""
+                    INSERT OR REPLACE INTO contacts (username, address, name)
+                    VALUES (?, ?, ?);
+                """, [(self.postfiat_username, address, self._encrypt_value(name)) for address, name in contacts.items()])
+            self.session.invalidate()
 
             logger.info(f"Password changed for {self.postfiat_username}")
             return True
@@ -327,64 +393,52 @@ class CredentialManager:
         if self.ecdh_public_key:
             self.ecdh_public_key = '0' * len(self.ecdh_public_key)
             self.ecdh_public_key = None
+        # Drop derived channel ciphers, decrypted credentials and contacts
+        self._channel_ciphers.clear()
+        self.session.close()
 
     def delete_credentials(self):
         """Delete all credentials for the current user"""
         self._backup_database()
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self.session.transaction() as conn:
             # Delete all credentials
-            cursor.execute("""
+            conn.execute("""
                 DELETE FROM credentials WHERE username = ?;
             """, (self.postfiat_username,))
             # Delete all contacts
-            cursor.execute("""
+            conn.execute("""
                 DELETE FROM contacts WHERE username = ?;
             """, (self.postfiat_username,))
-            conn.commit()
+        self.session.invalidate()
         logger.info(f"Deleted all credentials and contactsfor {self.postfiat_username}")
 
     def get_contacts(self):
         """Retrieve all contacts for the user"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT address, name FROM contacts WHERE username = ?;
-            """, (self.postfiat_username,))
-            contacts = cursor.fetchall()
-            return {
-                address: self._decrypt_value(name)
-                for address, name in contacts
-            }
+        return dict(self.session.get_contacts())
 
     def save_contact(self, address, name):
         """Save or update a contact"""
         # Check if contact already exists
-        existing_contacts = self.get_contacts()
-        if address in existing_contacts:
+        if address in self.session.get_contacts():
             error_msg = f"Contact with address {address} already exists"
             logger.error(f"CredentialManager: {error_msg}")
             raise ValueError(error_msg)
 
         encrypted_name = self._encrypt_value(name)
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO contacts (username, address, name)
-                VALUES (?, ?, ?);
-            """, (self.postfiat_username, address, encrypted_name))
-            conn.commit()
-            logger.info(f"Saved contact {name} at {address} for {self.postfiat_username}")
+        self.session.execute("""
+            INSERT OR REPLACE INTO contacts (username, address, name)
+            VALUES (?, ?, ?);
+        """, (self.postfiat_username, address, encrypted_name))
+        self.session.invalidate()
+        logger.info(f"Saved contact {name} at {address} for {self.postfiat_username}")
 
     def delete_contact(self, address):
         """Delete a contact"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                DELETE FROM contacts WHERE username = ? AND address = ?;
-            """, (self.postfiat_username, address))
-            conn.commit()
-            logger.info(f"Deleted contact at {address} for {self.postfiat_username}")
+        self.session.execute("""
+            DELETE FROM contacts WHERE username = ? AND address = ?;
+        """, (self.postfiat_username, address))
+        self.session.invalidate()
+        logger.info(f"Deleted contact at {address} for {self.postfiat_username}")
 
     def _backup_database(self):
         """Create a backup of the current database"""
@@ -414,6 +468,20 @@ class CredentialManager:
         raw_entropy = self._get_raw_entropy()
         return derive_shared_secret(public_key_hex=received_key, seed_bytes=raw_entropy)
 
+    def get_channel_cipher(self, received_key) -> Fernet:
+        """Returns the Fernet cipher for the encrypted channel with the holder of received_key.
+        The shared secret is derived once per key and session, and kept in memory only"""
+        cipher = self._channel_ciphers.get(received_key)
+        if cipher is None:
+            self._check_key_expiry()
+            cipher = derive_channel_fernet(self.get_shared_secret(received_key))
+            self._channel_ciphers[received_key] = cipher
+        return cipher
+
+    def invalidate_channel_cipher(self, received_key):
+        """Forgets the cipher derived for received_key, e.g. after the counterparty sent a new handshake"""
+        self._channel_ciphers.pop(received_key, None)
+
 class CredentialsExpiredError(Exception):
     """Exception raised when the encryption key has expired"""
     pass
@@ -0,0 +1,223 @@
+import os
+import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+from xrpl.models.requests import AccountTx
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+from pftpyclient.utilities.rpc_pool import JsonRpcPool
+
+PROGRESS_FILENAME = "progress.json"
+PAGE_LIMIT = 1000
+
+class TransactionBackfill:
+    """Fetches an account's transaction history for a ledger range in concurrent windows.
+
+    The range is split into fixed-size ledger windows which are fetched in parallel (at most
+    max_workers in flight), spread round-robin across the RPC endpoints. Each completed window is
+    written to state_directory along with a progress file, so an interrupted backfill only
+    fetches the windows it has not completed yet. Requests reuse the connections of rpc_pool.
+    """
+
+    def __init__(
+            self,
+            account_address: str,
+            endpoints: List[str],
+            state_directory: str,
+            window_size: int = constants.BACKFILL_WINDOW_SIZE_LEDGERS,
+            max_workers: int = constants.BACKFILL_MAX_WORKERS,
+            rpc_pool: Optional[JsonRpcPool] = None
+        ):
+        if not endpoints:
+            raise ValueError("At least one RPC endpoint is required")
+        self.account_address = account_address
+        self.endpoints = list(endpoints)
+        self.state_directory = state_directory
+        self.progress_path = os.path.join(state_directory, PROGRESS_FILENAME)
+        self.window_size = window_size
+        self.max_workers = max_workers
+        self.rpc_pool = rpc_pool or JsonRpcPool(self.endpoints)
+        self._progress_lock = threading.Lock()
+
+    def split_windows(self, ledger_index_min: int, ledger_index_max: int) -> List[tuple[int, int]]:
+        """Splits [ledger_index_min, ledger_index_max] into inclusive windows aligned to ledger_index_min"""
+        return [
+            (start, min(start + self.window_size - 1, ledger_index_max))
+            for start in range(ledger_index_min, ledger_index_max + 1, self.window_size)
+        ]
+
+    def _window_path(self, window: tuple[int, int]) -> str:
+        return os.path.join(self.state_directory, f"window_{window[0]}_{window[1]}.json")
+
+    def _load_progress(self, ledger_index_min: int) -> set:
+        """Returns the windows completed by a previous run over the same account, start ledger and window size"""
+        if not os.path.exists(self.progress_path):
+            return set()
+        try:
+            with open(self.progress_path, 'r') as f:
+                progress = json.load(f)
+        except (IOError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable backfill progress file {self.progress_path}: {e}")
+            return set()
+
+        if (progress.get('account') != self.account_address
+                or progress.get('ledger_index_min') != ledger_index_min
+                or progress.get('window_size') != self.window_size):
+            logger.debug("Backfill progress is for a different range, starting over")
+            self.clear()
+            return set()
+
+        return {
+            tuple(window) for window in progress.get('completed', [])
+            if os.path.exists(self._window_path(tuple(window)))
+        }
+
+    def _save_progress(self, ledger_index_min: int, completed: set):
+        temp_path = f"{self.progress_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'account': self.account_address,
+                'ledger_index_min': ledger_index_min,
+                'window_size': self.window_size,
+                'completed': sorted(completed)
+            }, f)
+        os.replace(temp_path, self.progress_path)
+
+    def _save_window(self, window: tuple[int, int], transactions: List[dict]):
+        path = self._window_path(window)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(transactions, f)
+        os.replace(temp_path, path)
+
+    def _load_window(self, window: tuple[int, int]) -> List[dict]:
+        with open(self._window_path(window), 'r') as f:
+            return json.load(f)
+
+    def _fetch_window(self, window: tuple[int, int], endpoint: str) -> List[dict]:
+        """Pages through AccountTx for a single window using one endpoint"""
+        client = self.rpc_pool.client_for(endpoint)
+        transactions = []
+        marker = None
+
+        while True:
+            response = client.request(AccountTx(
+                account=self.account_address,
+                ledger_index_min=window[0],
+                ledger_index_max=window[1],
+                limit=PAGE_LIMIT,
+                marker=marker,
+                forward=True
+            ))
+            if not response.is_successful():
+                raise BackfillIncompleteException(f"AccountTx failed for window {window} on {endpoint}: {response.result}")
+
+            transactions.extend(response.result.get("transactions", []))
+
+            next_marker = response.result.get("marker")
+            if next_marker is None:
+                return transactions
+            if next_marker == marker:
+                raise BackfillIncompleteException(f"Marker not advancing for window {window} on {endpoint}")
+            marker = next_marker
+
+    def _fetch_window_with_failover(self, window_number: int, window: tuple[int, int]) -> List[dict]:
+        """Fetches a window, starting on its round-robin endpoint and failing over to the others"""
+        errors = []
+        for attempt in range(len(self.endpoints)):
+            endpoint = self.endpoints[(window_number + attempt) % len(self.endpoints)]
+            try:
+                return self._fetch_window(window, endpoint)
+            except Exception as e:
+                logger.warning(f"Backfill window {window} failed on {endpoint}: {e}")
+                errors.append(e)
+        raise BackfillIncompleteException(f"All endpoints failed for window {window}: {errors[-1]}")
+
+    def run(
+            self,
+            ledger_index_min: int,
+            ledger_index_max: int,
+            progress_callback: Optional[Callable[[int, int], None]] = None
+        ) -> List[dict]:
+        """Fetches all transactions in [ledger_index_min, ledger_index_max].
+
+        Args:
+            ledger_index_min: First ledger to fetch
+            ledger_index_max: Last ledger to fetch
+            progress_callback: Optional callable receiving (completed_windows, total_windows)
+
+        Returns:
+            List of transactions in ledger order, deduplicated by hash
+
+        Raises:
+            BackfillIncompleteException: If any window could not be fetched. Completed windows are kept
+                and will not be fetched again on the next run.
+        """
+        ledger_index_min, ledger_index_max = int(ledger_index_min), int(ledger_index_max)
+        windows = self.split_windows(ledger_index_min, ledger_index_max)
+        os.makedirs(self.state_directory, exist_ok=True)
+
+        completed = self._load_progress(ledger_index_min)
+        pending = [(number, window) for number, window in enumerate(windows) if window not in completed]
+        logger.debug(
+            f"Backfilling ledgers {ledger_index_min}-{ledger_index_max}: {len(windows)} windows, "
+            f"{len(windows) - len(pending)} already completed"
+        )
+
+        def report_progress():
+            if progress_callback:
+                progress_callback(len(windows) - len(pending) + finished, len(windows))
+
+        finished = 0
+        failed_windows = []
+        report_progress()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_window_with_failover, number, window): window
+                for number, window in pending
+            }
+            for future in as_completed(futures):
+                window = futures[future]
+                try:
+                    transactions = future.result()
+                except BackfillIncompleteException as e:
+                    logger.error(str(e))
+                    failed_windows.append(window)
+                    continue
+
+                with self._progress_lock:
+                    self._save_window(window, transactions)
+                    completed.add(window)
+                    self._save_progress(ledger_index_min, completed)
+                finished += 1
+                report_progress()
+
+        if failed_windows:
+            raise BackfillIncompleteException(f"{len(failed_windows)} of {len(windows)} backfill windows failed")
+
+        # Windows are contiguous and fetched forward, so concatenating in window order keeps ledger order
+        all_transactions = []
+        seen_hashes = set()
+        for window in windows:
+            for tx in self._load_window(window):
+                tx_hash = tx.get('hash')
+                if tx_hash in seen_hashes:
+                    continue
+                seen_hashes.add(tx_hash)
+                all_transactions.append(tx)
+
+        logger.debug(f"Backfill retrieved {len(all_transactions)} transactions")
+        return all_transactions
+
+    def clear(self):
+        """Deletes all persisted backfill state"""
+        if os.path.exists(self.state_directory):
+            shutil.rmtree(self.state_directory)
+
+class BackfillIncompleteException(Exception):
+    """ This exception is raised when one or more backfill windows could not be fetched """
+    pass
@@ -0,0 +1,102 @@
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+CHUNK_PREFIX_PATTERN = re.compile(r'^chunk_(\d+)__')
+
+class ChunkReassemblyIndex:
+    """Chunks of multi-part memos, keyed by memo_type, with the reassembled payload cached per message.
+
+    Chunk numbers are parsed once as chunks are added. A message is reassembled the first time its
+    payload is requested after a chunk was added to it, and the result (passed through decode, e.g.
+    decompression) is cached until another chunk for the same memo_type arrives.
+
+    Reassembly follows the chunk sequences in datetime order: a chunk_1 following a complete sequence
+    starts a resend that is ignored, while a chunk_1 following an incomplete sequence replaces it.
+    """
+
+    def __init__(self, decode: Optional[Callable[[str], str]] = None):
+        self.decode = decode
+        self._chunks: Dict[str, List[tuple]] = {}  # memo_type -> [(datetime, order, chunk_number, data)]
+        self._seen_hashes = set()
+        self._payloads: Dict[str, Optional[str]] = {}
+        self._order = 0
+
+    def __contains__(self, memo_type):
+        return memo_type in self._chunks
+
+    def clear(self):
+        self._chunks.clear()
+        self._seen_hashes.clear()
+        self._payloads.clear()
+
+    def copy(self) -> 'ChunkReassemblyIndex':
+        """Returns an independent copy, unaffected by chunks added to this index afterwards"""
+        index = ChunkReassemblyIndex(decode=self.decode)
+        index._chunks = {memo_type: list(chunks) for memo_type, chunks in self._chunks.items()}
+        index._seen_hashes = set(self._seen_hashes)
+        index._payloads = dict(self._payloads)
+        index._order = self._order
+        return index
+
+    @staticmethod
+    def parse_chunk(full_output) -> Optional[tuple]:
+        """Returns (chunk_number, data) for a chunk, or None if full_output is not a chunk"""
+        if not isinstance(full_output, str):
+            return None
+        match = CHUNK_PREFIX_PATTERN.match(full_output)
+        if not match:
+            return None
+        return int(match.group(1)), full_output[match.end():]
+
+    def add(self, memo_type: str, full_output: str, datetime, hash: Optional[str] = None) -> bool:
+        """Adds a single memo. Returns True if it was a new chunk"""
+        if hash is not None:
+            if hash in self._seen_hashes:
+                return False
+            self._seen_hashes.add(hash)
+
+        chunk = self.parse_chunk(full_output)
+        if chunk is None:
+            return False
+
+        self._order += 1
+        self._chunks.setdefault(memo_type, []).append((datetime, self._order, chunk[0], chunk[1]))
+        self._payloads.pop(memo_type, None)
+        return True
+
+    def add_rows(self, rows: Iterable[tuple]) -> set:
+        """Adds (memo_type, full_output, datetime, hash) rows. Returns the memo_types that received new chunks"""
+        return {row[0] for row in rows if self.add(*row)}
+
+    def _assemble(self, memo_type: str) -> Optional[str]:
+        chunks = sorted(self._chunks.get(memo_type, ()), key=lambda chunk: (chunk[0], chunk[1]))
+
+        sequence = {}
+        for _, _, chunk_number, data in chunks:
+            # A chunk_1 after other chunks starts a new sequence
+            if chunk_number == 1 and sequence:
+                if set(sequence) == set(range(1, max(sequence) + 1)):
+                    logger.warning(f"Found complete sequence for {memo_type}, ignoring new sequence")
+                    break
+                logger.warning(f"Previous sequence incomplete for {memo_type}, starting new sequence")
+                sequence = {}
+            sequence.setdefault(chunk_number, data)
+
+        if not sequence or set(sequence) != set(range(1, max(sequence) + 1)):
+            logger.warning(f"Missing chunks for {memo_type}. Got {sorted(sequence)}")
+            return None
+
+        return ''.join(sequence[number] for number in sorted(sequence))
+
+    def get_payload(self, memo_type: str) -> Optional[str]:
+        """Returns the reassembled and decoded message, or None if it has no complete chunk sequence"""
+        if memo_type in self._payloads:
+            return self._payloads[memo_type]
+
+        payload = self._assemble(memo_type)
+        if payload is not None and self.decode is not None:
+            payload = self.decode(payload)
+        self._payloads[memo_type] = payload
+        return payload
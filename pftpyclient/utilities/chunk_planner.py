@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Union
+
+from xrpl.models.transactions import Memo
+
+import pftpyclient.configuration.constants as constants
+from pftpyclient.utilities.memo_codec import text_to_hex
+
+# Sizes of a memo serialized in XRPL binary format, which is what rippled measures against its 1 KB limit.
+# Each memo is wrapped in a one-byte field ID and an object end marker, and each of its Blob fields
+# is a one-byte field ID, a variable-length prefix and the raw bytes.
+MEMO_WRAPPER_SIZE = 2
+BLOB_FIELD_ID_SIZE = 1
+
+def length_prefix_size(length: int) -> int:
+    """Returns the size of the XRPL variable-length prefix for a field of length bytes"""
+    if length <= 192:
+        return 1
+    if length <= 12480:
+        return 2
+    if length <= 918744:
+        return 3
+    raise ValueError(f"Field of {length} bytes exceeds the XRPL variable-length limit")
+
+def blob_field_size(length: int) -> int:
+    return BLOB_FIELD_ID_SIZE + length_prefix_size(length) + length
+
+def serialized_memo_size(format_size: int, type_size: int, data_size: int) -> int:
+    """Returns the serialized size of a memo from the byte lengths of its fields"""
+    return MEMO_WRAPPER_SIZE + blob_field_size(format_size) + blob_field_size(type_size) + blob_field_size(data_size)
+
+def max_data_size(room: int) -> int:
+    """Returns the largest data length whose Blob field, less its field ID, fits in room bytes"""
+    size = room - 1
+    while size > 0 and length_prefix_size(size) + size > room:
+        size -= 1
+    return max(size, 0)
+
+def utf8_boundary(data: Union[bytes, memoryview], index: int) -> int:
+    """Moves index back to the nearest UTF-8 code point boundary at or before it"""
+    while 0 < index < len(data) and (data[index] & 0xC0) == 0x80:
+        index -= 1
+    return index
+
+def plan_memo_chunks(
+        memo_format: bytes,
+        memo_type: bytes,
+        memo_data: bytes,
+        max_size: int = constants.MAX_CHUNK_SIZE
+    ) -> List[bytes]:
+    """Splits memo data into labeled chunks (chunk_1__, chunk_2__, ...) that each fill a memo up to max_size
+    serialized bytes. Each chunk's capacity accounts for the exact width of its own label, and chunks are
+    only split on UTF-8 code point boundaries. Filling every chunk greedily minimizes the chunk count.
+
+    Raises:
+        ValueError: If memo_format and memo_type leave no room for data
+    """
+    data = memoryview(memo_data)
+    room = max_size - MEMO_WRAPPER_SIZE - blob_field_size(len(memo_format)) - blob_field_size(len(memo_type)) - BLOB_FIELD_ID_SIZE
+    capacity = max_data_size(room)
+
+    chunks = []
+    start = 0
+    while start < len(data) or not chunks:
+        label = f"chunk_{len(chunks) + 1}__".encode('utf-8')
+        end = min(start + capacity - len(label), len(data))
+        end = utf8_boundary(data, end)
+        if end <= start and start < len(data):
+            raise ValueError(
+                f"No space for data: max_size={max_size}, "
+                f"format={len(memo_format)} bytes, type={len(memo_type)} bytes"
+            )
+        chunks.append(label + data[start:end].tobytes())
+        start = end
+
+    return chunks
+
+@dataclass
+class MemoChunkPlan:
+    """The chunked memos a message will be sent as, and what sending them costs"""
+    memo_format: str
+    memo_type: str
+    chunks: List[bytes]  # memo_data of each chunk, including its chunk label
+    pft_per_chunk: Decimal = Decimal(0)
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks)
+
+    @property
+    def total_pft(self) -> Decimal:
+        return self.pft_per_chunk * self.num_chunks
+
+    def to_memos(self) -> List[Memo]:
+        memo_format = text_to_hex(self.memo_format)
+        memo_type = text_to_hex(self.memo_type)
+        return [Memo(memo_data=text_to_hex(chunk), memo_type=memo_type, memo_format=memo_format) for chunk in self.chunks]
@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pandas as pd
+
+@dataclass
+class GridDiff:
+    """Row changes between the displayed rows of a grid and a new result, matched by key"""
+    removed: List[int] = field(default_factory=list)  # positions in the displayed rows, ascending
+    inserted: List[int] = field(default_factory=list)  # positions in the new rows, ascending
+    updated: List[int] = field(default_factory=list)  # positions in the new rows of kept rows whose values changed
+    kept: dict = field(default_factory=dict)  # displayed position -> new position of each kept row
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.removed or self.inserted or self.updated)
+
+def diff_grid_rows(displayed: pd.DataFrame, data: pd.DataFrame, key_column: str, columns: List[str]) -> Optional[GridDiff]:
+    """Compares a new grid result against the displayed rows by key, over the displayed columns.
+
+    Returns None if the rows cannot be matched up as insertions, updates and removals: when either
+    frame lacks the key or has duplicate keys, the displayed columns differ, or kept rows changed order.
+    The caller should then replace the grid's contents instead.
+    """
+    if displayed.empty or data.empty:
+        return None
+    if key_column not in displayed.columns or key_column not in data.columns:
+        return None
+    old_keys = displayed[key_column]
+    new_keys = data[key_column]
+    if old_keys.duplicated().any() or new_keys.duplicated().any():
+        return None
+    columns = [column for column in columns if column in displayed.columns or column in data.columns]
+    if any(column not in displayed.columns or column not in data.columns for column in columns):
+        return None
+
+    old_positions = pd.Series(range(len(old_keys)), index=old_keys.to_numpy())
+    new_positions = pd.Series(range(len(new_keys)), index=new_keys.to_numpy())
+    is_kept_old = old_keys.isin(new_keys).to_numpy()
+    is_kept_new = new_keys.isin(old_keys).to_numpy()
+
+    kept_keys = old_keys[is_kept_old].to_numpy()
+    if list(kept_keys) != list(new_keys[is_kept_new].to_numpy()):
+        return None
+
+    old_values = displayed.loc[is_kept_old, columns].astype(str).to_numpy()
+    new_values = data.loc[is_kept_new, columns].astype(str).to_numpy()
+    changed = (old_values != new_values).any(axis=1)
+
+    kept_new_positions = new_positions[kept_keys].to_numpy()
+    return GridDiff(
+        removed=[int(i) for i in (~is_kept_old).nonzero()[0]],
+        inserted=[int(i) for i in (~is_kept_new).nonzero()[0]],
+        updated=[int(i) for i in kept_new_positions[changed]],
+        kept=dict(zip((int(i) for i in old_positions[kept_keys].to_numpy()), (int(i) for i in kept_new_positions)))
+    )
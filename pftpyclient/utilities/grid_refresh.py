@@ -0,0 +1,134 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+
+class GridRefreshWorker:
+    """Computes grid data off the UI thread.
+
+    Each request names the grids to refresh and the state to compute them from, typically a task manager
+    snapshot taken when the request was made. Grids are computed concurrently on a thread pool, and all
+    the grids of a round are delivered together through on_result, from a worker thread. Requests that
+    arrive while a round is running are coalesced into a single follow-up round, for the union of their
+    grids and from the most recent state.
+    """
+
+    def __init__(
+            self,
+            compute: Callable[[Any, str], Any],
+            on_result: Callable[[Dict[str, Any]], None],
+            max_workers: int = constants.GRID_REFRESH_MAX_WORKERS
+        ):
+        self.compute = compute  # (state, grid name) -> grid data
+        self.on_result = on_result  # called with grid name -> data for the grids computed without error
+        self._lock = threading.Lock()
+        self._pending_targets: Set[str] = set()
+        self._pending_state: Any = None
+        self._running = False
+        self._stopped = False
+        self._coordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='grid-refresh')
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='grid-compute')
+
+    def request(self, state: Any, targets: Iterable[str]):
+        """Queues a refresh of the named grids from state"""
+        targets = set(targets)
+        if not targets:
+            return
+        with self._lock:
+            if self._stopped:
+                return
+            self._pending_targets |= targets
+            self._pending_state = state
+            if self._running:
+                logger.debug(f"Grid refresh in progress, coalescing request for {targets}")
+                return
+            self._running = True
+        self._coordinator.submit(self._run)
+
+    def is_idle(self) -> bool:
+        with self._lock:
+            return not self._running
+
+    def stop(self):
+        """Drops pending requests and stops delivering results"""
+        with self._lock:
+            self._stopped = True
+            self._pending_targets.clear()
+            self._pending_state = None
+        self._coordinator.shutdown(wait=False, cancel_futures=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _next_round(self) -> Optional[tuple]:
+        with self._lock:
+            if self._stopped or not self._pending_targets:
+                self._running = False
+                return None
+            state, targets = self._pending_state, self._pending_targets
+            self._pending_state, self._pending_targets = None, set()
+            return state, targets
+
+    def _run(self):
+        while (next_round := self._next_round()) is not None:
+            state, targets = next_round
+            logger.debug(f"Computing grids {sorted(targets)}")
+            futures = {target: self._pool.submit(self.compute, state, target) for target in targets}
+
+            results = {}
+            for target, future in futures.items():
+                try:
+                    results[target] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed computing {target} grid: {e}")
+
+            with self._lock:
+                if self._stopped:
+                    return
+            try:
+                self.on_result(results)
+            except Exception as e:
+                logger.error(f"Error delivering grid refresh: {e}")
+
+class GridVersionTracker:
+    """Tracks which grids are out of date, so grids that are not on screen can be computed when first viewed.
+
+    Each grid has a version that is bumped whenever its underlying state changes. A grid is stale until data
+    computed at its current version has been requested, and the version of the displayed data is kept, so
+    showing a grid again is free if nothing changed since it was last computed.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._requested: Dict[str, int] = {}
+        self._rendered: Dict[str, int] = {}
+
+    def invalidate(self, grids: Iterable[str]):
+        for grid in grids:
+            self._versions[grid] = self._versions.get(grid, 0) + 1
+
+    def version(self, grid: str) -> int:
+        return self._versions.get(grid, 0)
+
+    def stale(self, grids: Iterable[str]) -> Set[str]:
+        """Returns the grids that have never been computed, or whose current version has been neither
+        requested nor rendered"""
+        return {
+            grid for grid in grids
+            if max(self._requested.get(grid, -1), self._rendered.get(grid, -1)) < self.version(grid)
+        }
+
+    def mark_requested(self, grids: Iterable[str]) -> Dict[str, int]:
+        """Records that the grids are being computed at their current versions, and returns those versions"""
+        versions = {grid: self.version(grid) for grid in grids}
+        self._requested.update(versions)
+        return versions
+
+    def mark_rendered(self, grid: str, version: int):
+        self._rendered[grid] = max(self._rendered.get(grid, 0), version)
+
+    def clear(self):
+        self._versions.clear()
+        self._requested.clear()
+        self._rendered.clear()
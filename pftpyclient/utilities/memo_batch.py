@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from cryptography.fernet import Fernet
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+from pftpyclient.utilities.memo_codec import LEGACY_COMPRESSED_PREFIX, is_encoded_payload
+
+ENCRYPTED_PREFIX = 'WHISPER__'
+DECRYPTED_PREFIX = '[DECRYPTED] '
+
+# Returns the channel cipher for a counterparty address, or None if the channel has no handshake yet
+CipherResolver = Callable[[str], Optional[Fernet]]
+
+def _map(function: Callable, items: Sequence, max_workers: int) -> list:
+    """Applies function to items on a thread pool, returning the results in input order.
+    Small batches run inline, where a pool costs more than it saves"""
+    if max_workers <= 1 or len(items) < constants.MEMO_BATCH_MIN_PARALLEL:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(function, items))
+
+def is_compressed(payload) -> bool:
+    return isinstance(payload, str) and (payload.startswith(LEGACY_COMPRESSED_PREFIX) or is_encoded_payload(payload))
+
+def _resolve_ciphers(counterparties, get_cipher: CipherResolver) -> Dict[str, Optional[Fernet]]:
+    """Resolves each distinct counterparty's cipher once, on the calling thread"""
+    ciphers = {}
+    for counterparty in counterparties:
+        if counterparty in ciphers:
+            continue
+        try:
+            ciphers[counterparty] = get_cipher(counterparty) if counterparty else None
+        except Exception as e:
+            logger.error(f"Error resolving channel cipher for {counterparty}: {e}")
+            ciphers[counterparty] = None
+    return ciphers
+
+def process_memo_batch(
+        items: Sequence[Tuple[Optional[str], Optional[str]]],
+        decompress: Optional[Callable[[str], str]] = None,
+        get_cipher: Optional[CipherResolver] = None,
+        max_workers: int = constants.MEMO_CRYPTO_MAX_WORKERS
+    ) -> List[Optional[str]]:
+    """Decompresses and decrypts (payload, counterparty) pairs, returning the results in input order.
+
+    Compressed payloads (COMPRESSED__ or a memo codec header) are passed through decompress, then
+    WHISPER__ payloads are decrypted with their counterparty's channel cipher and prefixed with
+    [DECRYPTED]. Plaintext that was compressed before encryption is decompressed after decrypting.
+    Ciphers are resolved once per counterparty on the calling thread; the decompression and
+    decryption run on a thread pool.
+    Payloads whose channel has no cipher are returned still encrypted, and payloads that fail to
+    process are returned as None. Either step is skipped if its function is None.
+    """
+    def decompress_item(payload):
+        if decompress is None or not is_compressed(payload):
+            return payload
+        try:
+            return decompress(payload)
+        except Exception as e:
+            logger.error(f"Error decompressing memo payload: {e}")
+            return None
+
+    payloads = _map(decompress_item, [payload for payload, _ in items], max_workers)
+    if get_cipher is None:
+        return payloads
+
+    encrypted = [
+        i for i, payload in enumerate(payloads)
+        if payload is not None and payload.startswith(ENCRYPTED_PREFIX)
+    ]
+    if not encrypted:
+        return payloads
+
+    ciphers = _resolve_ciphers((items[i][1] for i in encrypted), get_cipher)
+
+    def decrypt_item(i):
+        cipher = ciphers[items[i][1]]
+        if cipher is None:
+            return payloads[i]
+        try:
+            token = payloads[i].replace(ENCRYPTED_PREFIX, '', 1)
+            plaintext = cipher.decrypt(token.encode()).decode()
+            if decompress is not None and is_encoded_payload(plaintext):
+                plaintext = decompress(plaintext)
+            return DECRYPTED_PREFIX + plaintext
+        except Exception as e:
+            logger.error(f"Error decrypting memo payload: {e}")
+            return None
+
+    for i, payload in zip(encrypted, _map(decrypt_item, encrypted, max_workers)):
+        payloads[i] = payload
+    return payloads
+
+def encrypt_memo_batch(
+        items: Sequence[Tuple[str, str]],
+        get_cipher: CipherResolver,
+        max_workers: int = constants.MEMO_CRYPTO_MAX_WORKERS
+    ) -> List[Optional[str]]:
+    """Encrypts (plaintext, counterparty) pairs, returning WHISPER__ payloads in input order.
+    Plaintexts whose channel has no cipher are returned as None. Plaintexts may already be memo
+    codec payloads, since compressing before encrypting is what makes encrypted memos compressible"""
+    ciphers = _resolve_ciphers((counterparty for _, counterparty in items), get_cipher)
+
+    def encrypt_item(item):
+        plaintext, counterparty = item
+        cipher = ciphers[counterparty]
+        if cipher is None:
+            return None
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode()
+        return ENCRYPTED_PREFIX + cipher.encrypt(plaintext).decode()
+
+    return _map(encrypt_item, items, max_workers)
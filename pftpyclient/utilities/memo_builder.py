@@ -1,7 +1,7 @@
 from typing import Union
-import binascii
 from dataclasses import dataclass
 from pftpyclient.configuration.constants import SystemMemoType, TaskType, MessageType
+from pftpyclient.utilities.memo_codec import text_to_hex
 from xrpl.models.amounts import Memo
 from loguru import logger
 import random
@@ -43,7 +43,7 @@ class MemoBuilder:
     @staticmethod
     def to_hex(string: str) -> str:
         """Convert string to hex format"""
-        return binascii.hexlify(string.encode()).decode()
+        return text_to_hex(string)
     
     @staticmethod
     def is_over_1kb(string: str) -> bool:
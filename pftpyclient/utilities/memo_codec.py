@@ -0,0 +1,135 @@
+import base64
+import zlib
+from typing import Dict, Iterable, List, Union
+
+import brotli
+
+# Versioned memo payload headers. The header names the compression method (and dictionary) and the
+# transport encoding, so the decoder never has to guess. Payloads are base85 encoded, which costs
+# 25% over the compressed bytes instead of base64's 33%.
+CODEC_PREFIX = 'PFZ'
+BROTLI_HEADER = 'PFZ1B__'  # brotli, text mode, base85
+DEFLATE_DICTIONARY_HEADER = 'PFZ1D__'  # raw deflate with MEMO_DICTIONARY_V1, base85
+LEGACY_COMPRESSED_PREFIX = 'COMPRESSED__'  # brotli, base64 (decoded by decompress_string)
+
+MAX_DECODED_MEMO_BYTES = 16 * 1024 * 1024  # guards against decompression bombs
+
+# Preset dictionary for short memos, which are too small for a compressor to learn their vocabulary.
+# The Python brotli bindings cannot load a custom dictionary, so it is used with raw deflate, and each
+# memo is encoded with whichever of the two methods is smaller. The dictionary is part of the wire
+# format: never edit it. Add a new version with its own header instead.
+# zlib weights the end of the dictionary most, so the most common strings come last.
+MEMO_DICTIONARY_V1 = (
+    "https://github.com/ https://x.com/ https://docs.google.com/document/d/ /edit?usp=sharing "
+    "screenshot pull request repository commit deployed documentation README tests passing "
+    "implementation integration analysis research report summary strategy framework pipeline "
+    "dashboard database API endpoint script model prompt agent network node wallet address "
+    "transaction ledger XRP token trust line memo encrypted handshake Post Fiat PFT reward "
+    "Please provide evidence of completion. Please verify that the task was completed. "
+    "I have completed the task. Here is the link to the output. The task is complete. "
+    "VERIFICATION RESPONSE ___ VERIFICATION PROMPT ___ COMPLETION JUSTIFICATION ___ "
+    "REFUSAL REASON ___ ACCEPTANCE REASON ___ REWARD RESPONSE __ PROPOSED PF ___ "
+    "REQUEST_POST_FIAT ___ Google Doc context document the user should would could will be "
+    "which their there about from have this that with what when into your you for and the "
+    "of the to the in the on the for the is the that the and the . The "
+).encode('utf-8')
+
+def _b85encode(data: bytes) -> str:
+    return base64.b85encode(data).decode('ascii')
+
+def _inflate(data: bytes) -> bytes:
+    decompressor = zlib.decompressobj(wbits=-15, zdict=MEMO_DICTIONARY_V1)
+    output = decompressor.decompress(data, MAX_DECODED_MEMO_BYTES)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Decoded memo exceeds {MAX_DECODED_MEMO_BYTES} bytes")
+    return output + decompressor.flush()
+
+def encode_memo_payload(text: str) -> str:
+    """Compresses memo text into the smallest versioned payload.
+    Text that does not compress is returned unchanged, since the decoder passes through unprefixed text"""
+    data = text.encode('utf-8')
+
+    deflater = zlib.compressobj(level=9, wbits=-15, memLevel=9, zdict=MEMO_DICTIONARY_V1)
+    candidates = [
+        BROTLI_HEADER + _b85encode(brotli.compress(data, mode=brotli.MODE_TEXT)),
+        DEFLATE_DICTIONARY_HEADER + _b85encode(deflater.compress(data) + deflater.flush()),
+    ]
+    if not text.startswith((CODEC_PREFIX, LEGACY_COMPRESSED_PREFIX)):
+        candidates.append(text)
+
+    # Sizes are compared in UTF-8 bytes, which is what the memo field carries
+    return min(candidates, key=lambda candidate: len(candidate.encode('utf-8')))
+
+def is_encoded_payload(payload) -> bool:
+    return isinstance(payload, str) and payload.startswith((BROTLI_HEADER, DEFLATE_DICTIONARY_HEADER))
+
+def decode_memo_payload(payload: str) -> str:
+    """Decodes a payload produced by encode_memo_payload. Unprefixed payloads are returned unchanged.
+
+    Raises:
+        ValueError: If the payload is corrupt or uses an unknown codec version
+    """
+    if not payload.startswith(CODEC_PREFIX):
+        return payload
+    try:
+        if payload.startswith(BROTLI_HEADER):
+            data = brotli.decompress(base64.b85decode(payload[len(BROTLI_HEADER):]))
+        elif payload.startswith(DEFLATE_DICTIONARY_HEADER):
+            data = _inflate(base64.b85decode(payload[len(DEFLATE_DICTIONARY_HEADER):]))
+        else:
+            raise ValueError(f"Unknown memo codec header: {payload[:8]}")
+        return data.decode('utf-8')
+    except (ValueError, zlib.error, brotli.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Memo payload decoding failed: {e}")
+
+# Memo field hex encoding. XRPL memo fields are hex-encoded UTF-8. These helpers work on bytes and
+# memoryviews directly, and sizes are computed from byte lengths instead of by encoding to hex.
+
+MEMO_FIELD_KEYS = {'MemoFormat': 'user', 'MemoType': 'task_id', 'MemoData': 'full_output'}
+
+def utf8_size(text: Union[str, bytes, memoryview]) -> int:
+    """Returns the UTF-8 byte length of text without encoding it when it is ASCII"""
+    if isinstance(text, str):
+        return len(text) if text.isascii() else len(text.encode('utf-8'))
+    return memoryview(text).nbytes
+
+def hex_size(text: Union[str, bytes, memoryview]) -> int:
+    """Returns the length of text's hex encoding"""
+    return 2 * utf8_size(text)
+
+def text_to_hex(text: Union[str, bytes, memoryview]) -> str:
+    """Hex-encodes a string (as UTF-8) or a bytes-like object"""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return text.hex()
+
+def hex_to_text(hex_string: str) -> str:
+    """Decodes a hex-encoded UTF-8 string"""
+    return bytes.fromhex(hex_string).decode('utf-8')
+
+def decode_memo_fields(memos: Iterable[dict]) -> List[Dict[str, str]]:
+    """Decodes the MemoFormat, MemoType and MemoData fields of many XRPL memo dicts into
+    {'user', 'task_id', 'full_output'} dicts.
+
+    All fields are hex-decoded in a single bytes.fromhex call and each is then decoded as UTF-8
+    straight from a memoryview over the result.
+
+    Raises:
+        ValueError: If a field is not valid hex or not valid UTF-8
+    """
+    fields = [memo.get(key) or '' for memo in memos for key in MEMO_FIELD_KEYS]
+    if any(len(field) % 2 for field in fields):
+        raise ValueError("Memo field is not a whole number of hex-encoded bytes")
+    view = memoryview(bytes.fromhex(''.join(fields)))
+    if 2 * view.nbytes != sum(map(len, fields)):
+        raise ValueError("Memo field contains non-hex characters")  # fromhex skips whitespace
+
+    decoded = []
+    offset = 0
+    for field in fields:
+        end = offset + len(field) // 2
+        decoded.append(str(view[offset:end], 'utf-8'))
+        offset = end
+
+    names = list(MEMO_FIELD_KEYS.values())
+    return [dict(zip(names, decoded[i:i + 3])) for i in range(0, len(decoded), 3)]
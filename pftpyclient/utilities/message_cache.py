@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed_messages (
+    hash TEXT PRIMARY KEY,
+    encrypted_message TEXT NOT NULL
+);
+"""
+
+class ProcessedMessageCache:
+    """Persistent cache of processed (reassembled, decompressed and decrypted) message plaintext, keyed by
+    transaction hash.
+
+    Messages are encrypted at rest with the user's credential encryption key. All stored tokens are
+    read into memory when the cache is opened and each is decrypted on first use, so a warm cache
+    costs one Fernet decrypt per message per session. Entries that no longer decrypt (e.g. after a
+    password change) are dropped and treated as misses.
+    """
+
+    def __init__(self, db_path, encryption_key: bytes):
+        self.db_path = str(db_path)
+        self._fernet = Fernet(encryption_key)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            self._tokens: Dict[str, str] = dict(
+                self._conn.execute("SELECT hash, encrypted_message FROM processed_messages").fetchall()
+            )
+        self._messages: Dict[str, str] = {}
+        logger.debug(f"Loaded {len(self._tokens)} cached messages from {self.db_path}")
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def __contains__(self, tx_hash):
+        return tx_hash in self._tokens
+
+    def get(self, tx_hash: str) -> Optional[str]:
+        """Returns the cached plaintext for a transaction hash, or None on a miss"""
+        message = self._messages.get(tx_hash)
+        if message is not None:
+            return message
+
+        token = self._tokens.get(tx_hash)
+        if token is None:
+            return None
+        try:
+            message = self._fernet.decrypt(token.encode()).decode()
+        except InvalidToken:
+            logger.warning(f"Dropping cached message {tx_hash} that no longer decrypts")
+            self.delete(tx_hash)
+            return None
+
+        self._messages[tx_hash] = message
+        return message
+
+    def put(self, tx_hash: str, message: str):
+        """Encrypts and stores the plaintext for a transaction hash"""
+        token = self._fernet.encrypt(message.encode()).decode()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO processed_messages (hash, encrypted_message) VALUES (?, ?)",
+                (tx_hash, token)
+            )
+        self._tokens[tx_hash] = token
+        self._messages[tx_hash] = message
+
+    def delete(self, tx_hash: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM processed_messages WHERE hash = ?", (tx_hash,))
+        self._tokens.pop(tx_hash, None)
+        self._messages.pop(tx_hash, None)
+
+    def clear(self):
+        """Deletes all cached messages"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM processed_messages")
+        self._tokens.clear()
+        self._messages.clear()
+
+    def close(self):
+        """Drops the in-memory plaintext and closes the underlying database connection"""
+        self._messages.clear()
+        self._fernet = None
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,230 @@
+import dataclasses
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import xrpl
+from xrpl.models.requests import AccountTx
+from xrpl.models.response import Response, ResponseStatus
+from xrpl.models.transactions.transaction import Transaction
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+from pftpyclient.utilities.submission_queue import ValidationWatcher
+from pftpyclient.utilities.transaction_journal import JournalStatus, TransactionJournal, transaction_intent
+
+# Preliminary results that prove a transaction was not applied and cannot be applied later, leaving its
+# Sequence unused. Other results (tes, tec, and ter such as terQUEUED or terPRE_SEQ, which the server holds)
+# may still validate, so those transactions are waited for until their LastLedgerSequence passes
+REJECTED_RESULT_PREFIXES = ('tem', 'tef', 'tel')
+
+@dataclasses.dataclass
+class SubmissionOutcome:
+    response: Union[Response, str]  # the validated transaction, or a description of the failure
+    retry: bool  # whether the transaction never made it into a validated ledger and can be resubmitted
+
+class PipelinedSubmitter:
+    """Submits a batch of transactions from one account without waiting for each to validate.
+
+    The first transaction is autofilled, and the rest reuse its fee and LastLedgerSequence with consecutive
+    Sequence numbers. All are signed up front and submitted back-to-back, then the whole batch is confirmed
+    by polling the account's validated transactions, one request per poll. While a live ValidationWatcher
+    is given, the polls read the websocket stream it records instead of requesting them from the node.
+    With a journal, every signed transaction is recorded before the batch is submitted, along with its outcome.
+
+    Transactions that never reach a validated ledger (rejected with a tem, tef or tel result, not submitted
+    after an earlier rejection, or expired) are resubmitted as a new batch, up to max_attempts times.
+    Transactions held with a ter result are only resubmitted once they have expired. Transactions that validate with
+    a tec result have used their Sequence and are reported as failed without a retry.
+    """
+
+    def __init__(
+            self,
+            client: xrpl.clients.JsonRpcClient,
+            wallet: xrpl.wallet.Wallet,
+            poll_interval: float = constants.PIPELINE_POLL_INTERVAL_SEC,
+            max_attempts: int = constants.PIPELINE_MAX_SUBMIT_ATTEMPTS,
+            watcher: Optional[ValidationWatcher] = None,
+            journal: Optional[TransactionJournal] = None
+        ):
+        self.client = client
+        self.wallet = wallet
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.watcher = watcher
+        self.journal = journal
+
+    def submit(self, transactions: List[Transaction]) -> List[Union[Response, str]]:
+        """Submits the transactions in order and waits for them to validate.
+        Returns each transaction's validated response, or a string describing why it failed"""
+        results: List[Union[Response, str]] = [None] * len(transactions)
+        pending = list(range(len(transactions)))
+
+        for attempt in range(1, self.max_attempts + 1):
+            if not pending:
+                break
+            if attempt > 1:
+                logger.warning(f"Resubmitting {len(pending)} of {len(transactions)} transactions (attempt {attempt})")
+
+            try:
+                outcomes = self._submit_round([transactions[i] for i in pending])
+            except Exception as e:
+                # Some of the batch may have been submitted, so it is not retried, to avoid sending it twice
+                logger.error(f"Error submitting transaction batch: {e}")
+                outcomes = [SubmissionOutcome(f"Unexpected error: {e}", retry=False) for _ in pending]
+
+            retry = []
+            for i, outcome in zip(pending, outcomes):
+                results[i] = outcome.response
+                if outcome.retry:
+                    retry.append(i)
+            pending = retry
+
+        return results
+
+    def _submit_round(self, transactions: List[Transaction]) -> List[SubmissionOutcome]:
+        start_ledger = self._get_validated_ledger()
+        first = self._autofill(transactions[0])
+        signed = [
+            xrpl.transaction.sign(
+                dataclasses.replace(
+                    transaction,
+                    sequence=first.sequence + offset,
+                    fee=first.fee,
+                    last_ledger_sequence=first.last_ledger_sequence,
+                    network_id=first.network_id
+                ),
+                self.wallet
+            )
+            for offset, transaction in enumerate(transactions)
+        ]
+        if self.journal is not None:
+            for transaction, signed_transaction in zip(transactions, signed):
+                self.journal.record(signed_transaction, transaction_intent(transaction))
+
+        outcomes = [
+            SubmissionOutcome("Transaction not submitted: an earlier transaction in the batch was rejected", retry=True)
+            for _ in signed
+        ]
+        submitted = 0
+        stopped_at = len(signed)  # index of the transaction the loop stopped at, when it stopped early
+        for i, signed_transaction in enumerate(signed):
+            try:
+                engine_result = self._submit(signed_transaction)
+            except Exception as e:
+                # The server may still have received it, so it is waited for like the others
+                outcomes[i] = SubmissionOutcome(f"Unexpected error: {e}", retry=True)
+                self._record(signed_transaction.get_hash(), JournalStatus.SUBMITTED)
+                submitted += 1
+                stopped_at = i
+                break
+            if engine_result.startswith(REJECTED_RESULT_PREFIXES):
+                # The Sequence was not used, so the transactions after this one cannot validate either
+                outcomes[i] = SubmissionOutcome(f"Transaction submission failed: {engine_result}", retry=True)
+                self._record(signed_transaction.get_hash(), JournalStatus.REJECTED, engine_result)
+                stopped_at = i
+                break
+            self._record(signed_transaction.get_hash(), JournalStatus.SUBMITTED, engine_result)
+            submitted += 1
+
+        for signed_transaction in signed[stopped_at + 1:]:
+            self._record(signed_transaction.get_hash(), JournalStatus.REJECTED, 'not submitted')
+
+        logger.debug(f"Submitted {submitted} of {len(signed)} transactions, waiting for validation")
+        hashes = {signed_transaction.get_hash(): i for i, signed_transaction in enumerate(signed[:submitted])}
+        self._wait_for_validation(hashes, start_ledger, first.last_ledger_sequence, outcomes)
+        return outcomes
+
+    def _record(self, tx_hash: str, status: JournalStatus, result: Optional[str] = None, ledger_index: Optional[int] = None):
+        if self.journal is not None:
+            self.journal.update(tx_hash, status, result, ledger_index)
+
+    def _wait_for_validation(
+            self,
+            hashes: Dict[str, int],
+            start_ledger: int,
+            last_ledger_sequence: int,
+            outcomes: List[SubmissionOutcome]
+        ):
+        """Polls the account's validated transactions until every hash is found or the batch expires"""
+        pending = dict(hashes)
+        poll_failures = 0
+        while pending:
+            time.sleep(self.poll_interval)
+            try:
+                transactions, validated_ledger = self._fetch_validated_transactions(start_ledger)
+                poll_failures = 0
+            except Exception as e:
+                poll_failures += 1
+                logger.warning(f"Error polling for validated transactions ({poll_failures}): {e}")
+                if poll_failures >= constants.PIPELINE_MAX_POLL_FAILURES:
+                    raise
+                continue
+
+            for entry in transactions:
+                i = pending.pop(entry.get('hash'), None)
+                if i is None:
+                    continue
+                result = entry.get('meta', {}).get('TransactionResult')
+                self._record(entry['hash'], JournalStatus.VALIDATED, result, entry.get('ledger_index'))
+                if result == 'tesSUCCESS':
+                    outcomes[i] = SubmissionOutcome(
+                        Response(status=ResponseStatus.SUCCESS, result=self._to_tx_result(entry)), retry=False
+                    )
+                else:
+                    outcomes[i] = SubmissionOutcome(f"Transaction failed: {result}", retry=False)
+
+            if pending and validated_ledger > last_ledger_sequence:
+                for tx_hash, i in pending.items():
+                    self._record(tx_hash, JournalStatus.EXPIRED)
+                    outcomes[i] = SubmissionOutcome(
+                        f"Transaction expired: not validated by ledger {last_ledger_sequence}", retry=True
+                    )
+                break
+
+    @staticmethod
+    def _to_tx_result(entry: dict) -> dict:
+        """Shapes an account_tx entry like the tx result that submit_and_wait returns"""
+        tx_json = entry.get('tx_json') or entry.get('tx', {})
+        return {
+            **entry,
+            'tx_json': tx_json,
+            'date': entry.get('date', tx_json.get('date')),
+            'ledger_index': entry.get('ledger_index', tx_json.get('ledger_index')),
+        }
+
+    def _get_validated_ledger(self) -> int:
+        return xrpl.ledger.get_latest_validated_ledger_sequence(self.client)
+
+    def _autofill(self, transaction: Transaction) -> Transaction:
+        return xrpl.transaction.autofill(transaction, self.client)
+
+    def _submit(self, signed_transaction: Transaction) -> str:
+        """Submits a signed transaction and returns its preliminary engine result"""
+        response = xrpl.transaction.submit(signed_transaction, self.client)
+        return response.result.get('engine_result', '')
+
+    def _fetch_validated_transactions(self, start_ledger: int) -> Tuple[List[dict], int]:
+        """Returns the account's validated transactions since start_ledger, and the latest validated ledger"""
+        if self.watcher is not None and self.watcher.is_live():
+            return self.watcher.get_validated(), self.watcher.validated_ledger
+
+        transactions = []
+        marker = None
+        while True:
+            response = self.client.request(AccountTx(
+                account=self.wallet.address,
+                ledger_index_min=start_ledger,
+                ledger_index_max=-1,
+                forward=True,
+                marker=marker
+            ))
+            if not response.is_successful():
+                raise PipelinedSubmissionException(f"account_tx failed: {response.result}")
+            transactions.extend(tx for tx in response.result.get('transactions', []) if tx.get('validated'))
+            marker = response.result.get('marker')
+            if not marker:
+                return transactions, response.result.get('ledger_index_max', start_ledger)
+
+class PipelinedSubmissionException(Exception):
+    """ This exception is raised when the status of a submitted batch cannot be retrieved """
+    pass
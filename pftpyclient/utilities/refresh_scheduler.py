@@ -0,0 +1,89 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+
+class RefreshScheduler:
+    """Coalesces UI refreshes triggered by bursts of ledger activity.
+
+    Streamed transactions mark grids and balances as dirty instead of refreshing them right away. The
+    dirty set is flushed when a ledger closes. rippled sends a ledger's ledgerClosed message before the
+    account's transactions in that ledger, so the transactions of ledger N are all streamed by the time
+    ledger N+1 closes, and a multi-chunk message or a batch of rewards validated together is refreshed
+    once, at that close. Flushes are at least min_interval apart; a ledger close within the interval
+    leaves the dirty set for the next one, so min_interval should be shorter than a ledger (about 3-4
+    seconds) for each burst to be flushed at the following close. If ledger closes stop arriving,
+    flush_overdue flushes marks older than max_delay.
+    """
+
+    def __init__(
+            self,
+            flush: Callable[[Set[str], Dict[str, Any]], None],
+            min_interval: float,
+            max_delay: float = constants.REFRESH_MAX_DELAY_SEC,
+            clock: Callable[[], float] = time.monotonic
+        ):
+        self.flush = flush  # called with the dirty grids and the latest value of each dirty balance
+        self.min_interval = min_interval
+        self.max_delay = max_delay
+        self.clock = clock
+        self._grids: Set[str] = set()
+        self._balances: Dict[str, Any] = {}
+        self._requests = 0  # marks since the last flush
+        self._first_marked: Optional[float] = None
+        self._last_flush: Optional[float] = None
+        self.flushes = 0
+        self.coalesced = 0  # refreshes saved by merging marks into a single flush
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._grids or self._balances)
+
+    def mark_grids(self, grids: Iterable[str]):
+        grids = set(grids)
+        if grids:
+            self._grids |= grids
+            self._marked()
+
+    def mark_balance(self, name: str, value: Any):
+        """Marks a balance as dirty. Only its latest value is kept"""
+        self._balances[name] = value
+        self._marked()
+
+    def _marked(self):
+        self._requests += 1
+        if self._first_marked is None:
+            self._first_marked = self.clock()
+
+    def on_ledger_closed(self, ledger_index: Optional[int] = None) -> bool:
+        """Flushes the dirty grids and balances, unless the last flush was within min_interval.
+        Returns True if a flush happened"""
+        if not self.is_dirty:
+            return False
+        if self._last_flush is not None and self.clock() - self._last_flush < self.min_interval:
+            logger.debug(f"Deferring refresh at ledger {ledger_index}, last refresh was under {self.min_interval}s ago")
+            return False
+        return self._flush(f"ledger {ledger_index}")
+
+    def flush_overdue(self) -> bool:
+        """Flushes if the oldest dirty mark has waited longer than max_delay for a ledger close.
+        Returns True if a flush happened"""
+        if not self.is_dirty or self.clock() - self._first_marked < self.max_delay:
+            return False
+        return self._flush("overdue")
+
+    def _flush(self, reason: str) -> bool:
+        grids, balances, requests = self._grids, self._balances, self._requests
+        self._grids, self._balances, self._requests = set(), {}, 0
+        self._first_marked = None
+        self._last_flush = self.clock()
+        self.flushes += 1
+        self.coalesced += requests - 1
+        logger.debug(
+            f"Refreshing {sorted(grids) or 'no grids'} and {sorted(balances) or 'no balances'} ({reason}): "
+            f"{requests} requests coalesced into one, {self.coalesced} coalesced in total"
+        )
+        self.flush(grids, balances)
+        return True
@@ -0,0 +1,225 @@
+import threading
+import time
+from json import JSONDecodeError
+from typing import Dict, List, Optional
+
+import httpx
+import xrpl
+from xrpl.asyncio.clients.client import REQUEST_TIMEOUT
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+from xrpl.models.requests.request import Request
+from xrpl.models.response import Response
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+
+# rippled errors that describe the server rather than the request, so the request is retried elsewhere
+SERVER_ERRORS = {'tooBusy', 'noNetwork', 'noCurrent', 'noClosed', 'slowDown', 'amendmentBlocked'}
+
+class EndpointHealth:
+    """Request timing and failure history for one RPC endpoint"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.latency = None  # exponentially weighted moving average, in seconds
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unavailable_until = 0.0
+
+    def record_success(self, elapsed: float):
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.unavailable_until = 0.0
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            alpha = constants.RPC_LATENCY_SMOOTHING
+            self.latency = alpha * elapsed + (1 - alpha) * self.latency
+
+    def record_failure(self, now: float):
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        cooldown = min(
+            constants.RPC_FAILURE_COOLDOWN_SEC * 2 ** (self.consecutive_failures - 1),
+            constants.RPC_MAX_FAILURE_COOLDOWN_SEC
+        )
+        self.unavailable_until = now + cooldown
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.unavailable_until
+
+    @property
+    def score(self) -> float:
+        """Lower is better. Unmeasured endpoints score as the request timeout, so measured ones are preferred"""
+        latency = self.latency if self.latency is not None else REQUEST_TIMEOUT
+        return latency * (1 + self.consecutive_failures)
+
+class JsonRpcPool:
+    """Keep-alive HTTP sessions to a list of XRPL JSON-RPC endpoints, with health scoring and failover.
+
+    Requests go to the first endpoint (the user's current endpoint) while it is healthy. After a
+    transport error, HTTP 5xx or rippled server error, the endpoint is put in an exponentially growing
+    cooldown and requests fail over to the remaining endpoints, fastest first.
+    """
+
+    def __init__(
+            self,
+            endpoints: List[str],
+            timeout: float = REQUEST_TIMEOUT,
+            transport: Optional[httpx.BaseTransport] = None
+        ):
+        self.timeout = timeout
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, httpx.Client] = {}
+        self._health: Dict[str, EndpointHealth] = {}
+        self.endpoints: List[str] = []
+        self.set_endpoints(endpoints)
+        self.client = PooledJsonRpcClient(self)
+
+    def set_endpoints(self, endpoints: List[str]):
+        """Replaces the endpoint list, keeping the sessions and health of endpoints that remain"""
+        endpoints = list(dict.fromkeys(endpoints))
+        if not endpoints:
+            raise ValueError("At least one RPC endpoint is required")
+        with self._lock:
+            if endpoints == self.endpoints:
+                return
+            for endpoint in set(self._sessions) - set(endpoints):
+                self._sessions.pop(endpoint).close()
+            for endpoint in endpoints:
+                self._health.setdefault(endpoint, EndpointHealth(endpoint))
+            self.endpoints = endpoints
+        logger.debug(f"JSON-RPC pool endpoints: {endpoints}")
+
+    @property
+    def preferred_endpoint(self) -> str:
+        return self.endpoints[0]
+
+    def client_for(self, endpoint: str) -> 'PooledJsonRpcClient':
+        """Returns a client pinned to a single endpoint, for callers that do their own failover"""
+        return PooledJsonRpcClient(self, endpoint=endpoint)
+
+    def get_health(self, endpoint: str) -> EndpointHealth:
+        with self._lock:
+            return self._health.setdefault(endpoint, EndpointHealth(endpoint))
+
+    def _session(self, endpoint: str) -> httpx.Client:
+        with self._lock:
+            session = self._sessions.get(endpoint)
+            if session is None:
+                session = self._sessions[endpoint] = httpx.Client(timeout=self.timeout, transport=self.transport)
+            return session
+
+    def ordered_endpoints(self) -> List[str]:
+        """Returns the endpoints in the order a request should try them"""
+        now = time.monotonic()
+        with self._lock:
+            health = [self._health[endpoint] for endpoint in self.endpoints]
+        preferred, others = health[0], health[1:]
+        available = sorted((h for h in others if h.is_available(now)), key=lambda h: h.score)
+        cooling = sorted((h for h in others if not h.is_available(now)), key=lambda h: h.unavailable_until)
+
+        if preferred.is_available(now):
+            order = [preferred] + available + cooling
+        else:
+            order = available + [preferred] + cooling
+        return [h.endpoint for h in order]
+
+    def post(self, endpoint: str, payload: dict, timeout: float) -> Response:
+        """Sends a JSON-RPC payload to a single endpoint over its keep-alive session, recording its health"""
+        health = self.get_health(endpoint)
+        start = time.monotonic()
+        try:
+            http_response = self._session(endpoint).post(endpoint, json=payload, timeout=timeout)
+            if http_response.status_code >= 500:
+                raise RpcEndpointException(f"{endpoint} returned HTTP {http_response.status_code}")
+            try:
+                response = json_to_response(http_response.json())
+            except JSONDecodeError:
+                raise XRPLRequestFailureException({
+                    "error": http_response.status_code,
+                    "error_message": http_response.text
+                })
+            if not response.is_successful() and response.result.get('error') in SERVER_ERRORS:
+                raise RpcEndpointException(f"{endpoint} is unavailable: {response.result.get('error')}")
+        except (httpx.TransportError, RpcEndpointException, XRPLRequestFailureException):
+            with self._lock:
+                health.record_failure(time.monotonic())
+            raise
+
+        with self._lock:
+            health.record_success(time.monotonic() - start)
+        return response
+
+    def request(self, request: Request, timeout: Optional[float] = None, endpoint: Optional[str] = None) -> Response:
+        """Sends a request, failing over across the endpoints unless one is given"""
+        payload = request_to_json_rpc(request)
+        timeout = timeout or self.timeout
+        if endpoint is not None:
+            return self.post(endpoint, payload, timeout)
+
+        errors = []
+        for candidate in self.ordered_endpoints():
+            try:
+                return self.post(candidate, payload, timeout)
+            except (httpx.TransportError, RpcEndpointException, XRPLRequestFailureException) as e:
+                logger.warning(f"JSON-RPC request {request.method} failed on {candidate}: {e}")
+                errors.append(e)
+        raise errors[-1]
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+class PooledJsonRpcClient(xrpl.clients.JsonRpcClient):
+    """JsonRpcClient that sends its requests through a JsonRpcPool.
+
+    It can be passed anywhere xrpl-py expects a client (autofill, submit_and_wait, ...).
+    """
+
+    def __init__(self, pool: JsonRpcPool, endpoint: Optional[str] = None):
+        super().__init__(endpoint or pool.preferred_endpoint)
+        self.pool = pool
+        self.endpoint = endpoint
+
+    @property
+    def url(self) -> str:
+        return self.endpoint or self.pool.preferred_endpoint
+
+    @url.setter
+    def url(self, value: str):
+        # Set by the base class constructor; the URL is always derived from the pool
+        pass
+
+    async def _request_impl(self, request: Request, *, timeout: float = REQUEST_TIMEOUT) -> Response:
+        return self.pool.request(request, timeout=timeout, endpoint=self.endpoint)
+
+_shared_pool: Optional[JsonRpcPool] = None
+_shared_pool_lock = threading.Lock()
+
+def get_rpc_pool(endpoints: Optional[List[str]] = None) -> JsonRpcPool:
+    """Returns the process-wide JsonRpcPool, creating it or updating its endpoints if endpoints are given"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            if not endpoints:
+                raise ValueError("The shared JSON-RPC pool has not been created yet")
+            _shared_pool = JsonRpcPool(endpoints)
+            return _shared_pool
+    if endpoints:
+        _shared_pool.set_endpoints(endpoints)
+    return _shared_pool
+
+def get_rpc_client(config) -> PooledJsonRpcClient:
+    """Returns the shared pooled client over the ConfigurationManager's network endpoints"""
+    return get_rpc_pool(config.get_network_endpoints()).client
+
+class RpcEndpointException(Exception):
+    """ This exception is raised when an RPC endpoint cannot serve a request """
+    pass
@@ -0,0 +1,289 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, List, Optional, Tuple
+
+import xrpl
+from xrpl.clients import XRPLRequestFailureException
+from xrpl.models.requests import Tx
+from xrpl.models.response import Response, ResponseStatus
+from xrpl.models.transactions.transaction import Transaction
+from xrpl.transaction import XRPLReliableSubmissionException
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+from pftpyclient.utilities.transaction_journal import JournalStatus, TransactionJournal, transaction_intent
+
+class ValidationWatcher:
+    """Tracks the account's validated transactions and the latest validated ledger as they arrive on the
+    websocket subscription, so submitters can wait for a transaction's outcome without polling the node.
+    Fed from the websocket thread and waited on from submitting threads."""
+
+    def __init__(self, history_size: int = constants.VALIDATION_HISTORY_SIZE):
+        self._condition = threading.Condition()
+        self._validated: OrderedDict[str, dict] = OrderedDict()
+        self._history_size = history_size
+        self.validated_ledger = 0
+        self.last_update = None  # time of the last stream message
+
+    def on_ledger_closed(self, ledger_index: int):
+        with self._condition:
+            self.validated_ledger = max(self.validated_ledger, int(ledger_index))
+            self.last_update = time.time()
+            self._condition.notify_all()
+
+    def on_transaction(self, transaction: dict):
+        """Records a transaction from the account stream, shaped like a tx response (tx_json, meta, hash, ...)"""
+        tx_hash = transaction.get('hash')
+        if not transaction.get('validated') or not tx_hash:
+            return
+        with self._condition:
+            self._validated[tx_hash] = transaction
+            while len(self._validated) > self._history_size:
+                self._validated.popitem(last=False)
+            self.last_update = time.time()
+            self._condition.notify_all()
+
+    def is_live(self) -> bool:
+        """Whether the stream has delivered a message recently enough to be relied on"""
+        return self.last_update is not None and time.time() - self.last_update < constants.VALIDATION_STREAM_TIMEOUT_SEC
+
+    def get_validated(self) -> List[dict]:
+        with self._condition:
+            return list(self._validated.values())
+
+    def wait_for(self, tx_hash: str, last_ledger_sequence: int) -> Optional[dict]:
+        """Blocks until the transaction is validated and returns its stream entry.
+        Returns None if the stream goes quiet first, so the caller can fall back to polling.
+
+        Raises:
+            TransactionExpiredException: If a ledger after last_ledger_sequence validated without the transaction
+        """
+        with self._condition:
+            while True:
+                entry = self._validated.get(tx_hash)
+                if entry is not None:
+                    return entry
+                # rippled publishes a ledger's transactions before the next ledgerClosed message,
+                # so once a later ledger has closed the transaction can no longer arrive
+                if self.validated_ledger > last_ledger_sequence:
+                    raise TransactionExpiredException(
+                        f"The latest validated ledger sequence {self.validated_ledger} is "
+                        f"greater than LastLedgerSequence {last_ledger_sequence} in the transaction"
+                    )
+                if not self.is_live():
+                    return None
+                remaining = self.last_update + constants.VALIDATION_STREAM_TIMEOUT_SEC - time.time()
+                self._condition.wait(timeout=max(remaining, 0.1))
+
+def submit_and_confirm(
+        transaction: Transaction,
+        client: xrpl.clients.JsonRpcClient,
+        wallet: xrpl.wallet.Wallet,
+        watcher: Optional[ValidationWatcher] = None,
+        journal: Optional[TransactionJournal] = None
+    ) -> Response:
+    """Signs and submits a transaction, then waits for it to validate. Validation is confirmed on the websocket
+    stream while the watcher is live, and by polling the node otherwise.
+
+    With a journal, the signed transaction is recorded before it is submitted. If an earlier attempt at the
+    same transaction has an unknown outcome, because its submission raised or the client exited before it was
+    confirmed, that signed blob is resubmitted instead of signing a new transaction, so a retry cannot send twice.
+
+    Raises:
+        XRPLReliableSubmissionException: If the transaction is malformed, fails, or expires
+    """
+    intent = transaction_intent(transaction) if journal is not None else None
+    previous = journal.find_unresolved(intent) if journal is not None else None
+    if previous is not None:
+        logger.info(f"Resubmitting earlier attempt {previous.hash} at this transaction, whose outcome is unknown")
+        try:
+            return _submit_signed(Transaction.from_blob(previous.tx_blob), client, watcher, journal)
+        except TransactionExpiredException:
+            logger.info(f"Earlier attempt {previous.hash} expired, signing a new transaction")
+
+    signed = xrpl.transaction.autofill_and_sign(transaction, client, wallet)
+    if journal is not None:
+        journal.record(signed, intent)
+    return _submit_signed(signed, client, watcher, journal)
+
+def _submit_signed(
+        signed: Transaction,
+        client: xrpl.clients.JsonRpcClient,
+        watcher: Optional[ValidationWatcher],
+        journal: Optional[TransactionJournal]
+    ) -> Response:
+    def record(status: JournalStatus, result: Optional[str] = None, ledger_index: Optional[int] = None):
+        if journal is not None:
+            journal.update(tx_hash, status, result, ledger_index)
+
+    tx_hash = signed.get_hash()
+    try:
+        response = xrpl.transaction.submit(signed, client)
+    except Exception as e:
+        # The server may have received the transaction before the error, so its outcome is still awaited
+        logger.warning(f"Error submitting transaction {tx_hash}, waiting for its outcome: {e}")
+        record(JournalStatus.SUBMITTED)
+    else:
+        prelim_result = response.result.get('engine_result', '')
+        if prelim_result.startswith('tem'):
+            record(JournalStatus.REJECTED, prelim_result)
+            raise XRPLReliableSubmissionException(f"{prelim_result}: {response.result.get('engine_result_message')}")
+        record(JournalStatus.SUBMITTED, prelim_result)
+
+    try:
+        result = None
+        if watcher is not None and watcher.is_live():
+            try:
+                result = watcher.wait_for(tx_hash, signed.last_ledger_sequence)
+            except TransactionExpiredException:
+                # The watcher only holds what was streamed this session, so an earlier attempt may have
+                # validated before a restart or while the stream was down
+                result = _get_validated_transaction(client, tx_hash)
+                if result is None:
+                    raise
+        if result is None:
+            logger.debug(f"Polling the node for the outcome of transaction {tx_hash}")
+            result = _poll_for_validation(client, tx_hash, signed.last_ledger_sequence)
+    except TransactionExpiredException:
+        record(JournalStatus.EXPIRED)
+        raise
+
+    return_code = result.get('meta', {}).get('TransactionResult')
+    record(JournalStatus.VALIDATED, return_code, result.get('ledger_index'))
+    if return_code != 'tesSUCCESS':
+        raise XRPLReliableSubmissionException(f"Transaction {tx_hash} failed: {return_code}")
+    return Response(status=ResponseStatus.SUCCESS, result=result)
+
+def _poll_for_validation(client: xrpl.clients.JsonRpcClient, tx_hash: str, last_ledger_sequence: int) -> dict:
+    while True:
+        time.sleep(constants.VALIDATION_FALLBACK_POLL_SEC)
+        # The ledger is read first, so a transaction not found afterwards can no longer validate
+        validated_ledger = xrpl.ledger.get_latest_validated_ledger_sequence(client)
+        result = _get_validated_transaction(client, tx_hash)
+        if result is not None:
+            return result
+        if validated_ledger > last_ledger_sequence:
+            raise TransactionExpiredException(
+                f"The latest validated ledger sequence {validated_ledger} is "
+                f"greater than LastLedgerSequence {last_ledger_sequence} in the transaction"
+            )
+
+def _get_validated_transaction(client: xrpl.clients.JsonRpcClient, tx_hash: str) -> Optional[dict]:
+    """Looks the transaction up on the node. Returns it if it is validated, or None if it is not found or not
+    yet validated"""
+    response = client.request(Tx(transaction=tx_hash))
+    if response.is_successful():
+        return response.result if response.result.get('validated') else None
+    if response.result.get('error') != 'txnNotFound':
+        raise XRPLRequestFailureException(response.result)
+    return None
+
+class SubmissionStatus(Enum):
+    QUEUED = "Queued"
+    SUBMITTING = "Submitting"
+    VALIDATED = "Validated"
+    FAILED = "Failed"
+
+@dataclass
+class QueuedSubmission:
+    """An action in the transaction queue and its progress"""
+    submission_id: int
+    description: str
+    status: SubmissionStatus = SubmissionStatus.QUEUED
+    detail: str = ""  # transaction hashes once validated, or why the action failed
+    queued_at: datetime = field(default_factory=datetime.now)
+
+def summarize_responses(responses: Any) -> Tuple[SubmissionStatus, str]:
+    """Returns the status and a short description of an action's responses.
+    Send methods return a response, a list of them for chunked messages, or a string describing a failure"""
+    responses = responses if isinstance(responses, list) else [responses]
+    for response in responses:
+        if isinstance(response, Response) and response.is_successful():
+            continue
+        if isinstance(response, Response):
+            return SubmissionStatus.FAILED, str(response.result.get('error_message') or response.result)
+        return SubmissionStatus.FAILED, str(response) if response is not None else "No response"
+    return SubmissionStatus.VALIDATED, ", ".join(response.result.get('hash', '') for response in responses)
+
+class TransactionQueue:
+    """Runs outbound transactions in the order they were queued, on a dedicated asyncio loop.
+
+    Each action is a callable that sends transactions and returns their responses, such as a task manager
+    send method. Actions run one at a time on a single worker thread, so each autofills the account Sequence
+    left by the one before it. submit returns a future right away, so the caller never waits on the ledger.
+    """
+
+    def __init__(self, on_update: Optional[Callable[[QueuedSubmission], None]] = None):
+        self.on_update = on_update  # called from the worker thread whenever a submission's status changes
+        self.submissions: List[QueuedSubmission] = []
+        self.loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='transaction-queue')
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._ids = itertools.count(1)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def stop(self):
+        """Stops the queue. Actions that have not started are dropped"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def pending(self) -> int:
+        """Returns the number of actions that have not finished"""
+        return sum(
+            1 for submission in self.submissions
+            if submission.status in (SubmissionStatus.QUEUED, SubmissionStatus.SUBMITTING)
+        )
+
+    def submit(self, description: str, action: Callable[[], Any]) -> Future:
+        """Queues an action and returns a future for its responses"""
+        submission = QueuedSubmission(submission_id=next(self._ids), description=description)
+        self.submissions.append(submission)
+        logger.debug(f"Queued action {submission.submission_id}: {description}")
+        self._notify(submission)
+        return asyncio.run_coroutine_threadsafe(self._process(submission, action), self.loop)
+
+    async def _process(self, submission: QueuedSubmission, action: Callable[[], Any]) -> Any:
+        def run():
+            self._set_status(submission, SubmissionStatus.SUBMITTING)
+            return action()
+
+        try:
+            responses = await self.loop.run_in_executor(self._executor, run)
+        except Exception as e:
+            logger.error(f"Queued action '{submission.description}' failed: {e}")
+            self._set_status(submission, SubmissionStatus.FAILED, str(e))
+            raise
+
+        self._set_status(submission, *summarize_responses(responses))
+        return responses
+
+    def _set_status(self, submission: QueuedSubmission, status: SubmissionStatus, detail: str = ""):
+        submission.status = status
+        submission.detail = detail
+        self._notify(submission)
+
+    def _notify(self, submission: QueuedSubmission):
+        if self.on_update is None:
+            return
+        try:
+            self.on_update(submission)
+        except Exception as e:
+            logger.error(f"Error reporting status of queued action: {e}")
+
+class TransactionExpiredException(XRPLReliableSubmissionException):
+    """ This exception is raised when a ledger past a transaction's LastLedgerSequence validates without it """
+    pass
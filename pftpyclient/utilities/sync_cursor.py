@@ -0,0 +1,48 @@
+import os
+import json
+from typing import Optional
+
+from loguru import logger
+
+class SyncCursor:
+    """Persists the last ledger up to which the local transaction history is known to be complete.
+
+    The history also holds transactions streamed over the websocket, which can arrive after a gap (before
+    the first subscription, or while reconnecting), so its highest ledger index does not mark where the
+    next sync should start. The cursor is only advanced by fetches that cover every ledger up to it,
+    and is kept in a small JSON file next to the history so a restart resumes from it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ledger_index = self._load()
+
+    def _load(self) -> Optional[int]:
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, 'r') as f:
+                return int(json.load(f)['synced_ledger_index'])
+        except (IOError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error reading sync cursor {self.path}: {e}")
+            return None
+
+    def get(self) -> Optional[int]:
+        return self._ledger_index
+
+    def set(self, ledger_index: int):
+        """Atomically replaces the cursor on disk"""
+        self._ledger_index = int(ledger_index)
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'synced_ledger_index': self._ledger_index}, f)
+            os.replace(temp_path, self.path)
+        except IOError as e:
+            logger.error(f"Error saving sync cursor {self.path}: {e}")
+
+    def clear(self):
+        self._ledger_index = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -14,13 +14,13 @@ import base64
 from typing import Union, Optional
 import traceback
 from typing import List
-import math
+import threading
+import copy
 
 # Third-party imports
 import xrpl
 from xrpl.models.requests import AccountTx
 from xrpl.models.transactions import Memo
-from xrpl.utils import str_to_hex
 import nest_asyncio
 import pandas as pd
 import numpy as np
@@ -31,10 +31,12 @@ from cryptography.fernet import Fernet
 
 # PftPyclient imports
 from pftpyclient.basic_utilities.settings import *
-from pftpyclient.user_login.credentials import CredentialManager
+from pftpyclient.user_login.credentials import CredentialManager, get_credentials_directory
+from pftpyclient.postfiatsecurity.hash_tools import derive_channel_fernet
 from pftpyclient.basic_utilities.settings import DATADUMP_DIRECTORY_PATH
 from pftpyclient.utilities.wallet_state import (
     WalletState, 
+    WalletStateTracker,
     requires_wallet_state,
     FUNDED_STATES,
     TRUSTLINED_STATES,
@@ -47,6 +49,27 @@ from pftpyclient.configuration.configuration import ConfigurationManager, get_ne
 from pftpyclient.configuration.constants import *
 import pftpyclient.configuration.constants as constants
 from pftpyclient.utilities.transaction_requirements import TransactionRequirementService
+from pftpyclient.utilities.transaction_store import SegmentedTransactionStore
+from pftpyclient.utilities.transaction_index import TransactionIndex
+from pftpyclient.utilities.task_state import TaskStateTable
+from pftpyclient.utilities.backfill import TransactionBackfill, BackfillIncompleteException
+from pftpyclient.utilities.sync_cursor import SyncCursor
+from pftpyclient.utilities.rpc_pool import get_rpc_client
+from pftpyclient.utilities.chunk_index import ChunkReassemblyIndex
+from pftpyclient.utilities.message_cache import ProcessedMessageCache
+from pftpyclient.utilities.memo_batch import process_memo_batch, is_compressed
+from pftpyclient.utilities.memo_codec import (
+    encode_memo_payload,
+    decode_memo_payload,
+    decode_memo_fields,
+    hex_to_text,
+    text_to_hex,
+    utf8_size
+)
+from pftpyclient.utilities.chunk_planner import MemoChunkPlan, plan_memo_chunks, serialized_memo_size
+from pftpyclient.utilities.pipelined_submission import PipelinedSubmitter
+from pftpyclient.utilities.submission_queue import ValidationWatcher, submit_and_confirm
+from pftpyclient.utilities.transaction_journal import JournalStatus, TransactionJournal
 
 nest_asyncio.apply()
 
@@ -76,6 +99,26 @@ class PostFiatTaskManager:
         self.memos_filepath = os.path.join(DATADUMP_DIRECTORY_PATH, f"{self.user_wallet.address}{network_suffix}_memos.{file_extension}")  # only used for debugging
         self.tasks_filepath = os.path.join(DATADUMP_DIRECTORY_PATH, f"{self.user_wallet.address}{network_suffix}_tasks.{file_extension}")  # only used for debugging
         self.system_memos_filepath = os.path.join(DATADUMP_DIRECTORY_PATH, f"{self.user_wallet.address}{network_suffix}_system_memos.{file_extension}")  # only used for debugging
+
+        # Segmented append-only store, used instead of tx_history_filepath when the cache format is 'parquet'
+        self.tx_store = None
+        if self.config.get_global_config('transaction_cache_format') == 'parquet':
+            self.tx_store = SegmentedTransactionStore(
+                os.path.join(DATADUMP_DIRECTORY_PATH, f"{self.user_wallet.address}{network_suffix}_transaction_store")
+            )
+
+        # Resumable state for the initial historical backfill
+        self.backfill_state_directory = os.path.join(DATADUMP_DIRECTORY_PATH, f"{self.user_wallet.address}{network_suffix}_backfill")
+
+        # Last ledger fetched by sync_transactions; streamed transactions do not advance it
+        self.sync_cursor = SyncCursor(os.path.join(DATADUMP_DIRECTORY_PATH, f"{self.user_wallet.address}{network_suffix}_sync_cursor.json"))
+
+        # Optional SQLite index of processed memos, kept next to credentials.sqlite
+        self.tx_index = None
+        if self.config.get_global_config('use_transaction_index'):
+            self.tx_index = TransactionIndex(
+                get_credentials_directory() / f"{self.user_wallet.address}{network_suffix}_transactions.sqlite"
+            )
         
         # initialize dataframes for caching
         self.transactions = pd.DataFrame()
@@ -84,13 +127,41 @@ class PostFiatTaskManager:
         self.memos = pd.DataFrame()
         self.system_memos = pd.DataFrame()
 
+        # Per-task latest state, maintained incrementally by sync_tasks
+        self.task_states = TaskStateTable()
+
+        # Processed message plaintext by transaction hash, encrypted at rest with the credential key
+        self.message_cache = ProcessedMessageCache(
+            get_credentials_directory() / f"{self.user_wallet.address}{network_suffix}_messages.sqlite",
+            self.credential_manager.encryption_key
+        )
+
+        # Signed outbound transactions and their outcomes, so interrupted submissions are resumed rather than resent
+        self.transaction_journal = TransactionJournal(
+            get_credentials_directory() / f"{self.user_wallet.address}{network_suffix}_outbound_transactions.sqlite"
+        )
+
+        # Chunks of multi-part messages and their reassembled payloads, maintained by sync_memos
+        self.chunk_index = ChunkReassemblyIndex(decode=decompress_memo_payload)
+
+        # Account and memo flags behind the wallet state, maintained incrementally by sync_memo_transactions
+        self.wallet_state_tracker = WalletStateTracker(self.default_node)
+
         self.handshake_cache = {}  # Address -> (handshake_sent, received_key)
 
-        # Initialize client for blockchain queries
-        self.client = xrpl.clients.JsonRpcClient(self.network_url)
+        # Fed by the caller's websocket subscription, so submissions can confirm validation without polling
+        self.validation_watcher: Optional[ValidationWatcher] = None
+        # Held from autofill until validation, so submissions from different threads never share a Sequence
+        self.submission_lock = threading.RLock()
+
+        # Initialize client for blockchain queries. The client is shared process-wide and fails over
+        # across the configured endpoints, reusing keep-alive connections
+        self.client = get_rpc_client(self.config)
         
-        # Initialize transactions
-        self.sync_transactions()
+        # Initialize transactions. Without a local cache, only the most recent transactions are synced here
+        # and the full history is left for the caller to backfill with fetch_history_backfill
+        self.backfill_pending = False
+        self.sync_transactions(defer_backfill=True)
 
         # Initialize transaction requirement service
         self.transaction_requirements = TransactionRequirementService(self.network_config)
@@ -101,43 +172,54 @@ class PostFiatTaskManager:
         self.determine_wallet_state()
 
     def get_xrp_balance(self):
-        return get_xrp_balance(self.network_url, self.user_wallet.classic_address)
+        return get_xrp_balance(self.client, self.user_wallet.classic_address)
     
-    def determine_wallet_state(self) -> bool:
-        """Determine the current state of the wallet based on blockhain"""
-        logger.debug(f"Determining wallet state for {self.user_wallet.classic_address}")
-        client = xrpl.clients.JsonRpcClient(self.network_url)
-        new_state = self.wallet_state
+    def probe_account(self) -> bool:
+        """Fetches AccountInfo and the PFT trust line in one pass and updates the wallet state tracker's account flags
 
+        Returns:
+            bool: True if the probe succeeded
+        """
+        address = self.user_wallet.classic_address
         try:
-            # Check if account exists on XRPL
-            response = client.request(
-                xrpl.models.requests.AccountInfo(
-                    account=self.user_wallet.classic_address,
-                    ledger_index="validated"
-                )
+            response = self.client.request(
+                xrpl.models.requests.AccountInfo(account=address, ledger_index="validated")
+            )
+            if not response.is_successful():
+                if response.result.get('error') != 'actNotFound':
+                    logger.error(f"Failed to get account info: {response.result}")
+                    return False
+                logger.warning(f"Account {address} does not exist on XRPL")
+                self.wallet_state_tracker.update_account(None, [])
+                return True
+
+            lines_response = self.client.request(
+                xrpl.models.requests.AccountLines(account=address, peer=self.pft_issuer, ledger_index="validated")
             )
+            if not lines_response.is_successful():
+                logger.error(f"Failed to get account lines: {lines_response.result}")
+                return False
 
-            if response.is_successful() and 'account_data' in response.result:
-                balance = int(response.result['account_data']['Balance'])
-                if balance > 0:
-                    new_state = WalletState.FUNDED
-                    if self.has_trust_line():
-                        new_state = WalletState.TRUSTLINED
-                        if self.initiation_rite_sent():
-                            new_state = WalletState.INITIATED
-                            if self.handshake_sent():
-                                new_state = WalletState.HANDSHAKE_SENT
-                                if self.handshake_received():
-                                    new_state = WalletState.HANDSHAKE_RECEIVED
-                                    if self.google_doc_sent():
-                                        new_state = WalletState.ACTIVE
-            
-            else:
-                logger.warning(f"Account {self.user_wallet.classic_address} does not exist on XRPL")
-        
-        except xrpl.clients.XRPLRequestFailureException as e:
-            logger.error(f"Error determining wallet state: {e}")
+            self.wallet_state_tracker.update_account(
+                response.result['account_data'],
+                lines_response.result.get('lines', [])
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error probing account {address}: {e}")
+            return False
+
+    @PerformanceMonitor.measure('determine_wallet_state')
+    def determine_wallet_state(self) -> bool:
+        """Determine the current state of the wallet from the wallet state tracker.
+        The account is only probed on the blockchain after a transaction has touched it."""
+        if self.wallet_state_tracker.account_stale:
+            logger.debug(f"Probing account {self.user_wallet.classic_address} for wallet state")
+            if not self.probe_account():
+                return False
+
+        new_state = self.wallet_state_tracker.derive_state()
 
         if new_state != self.wallet_state:
             logger.info(f"Wallet state changed from {self.wallet_state} to {new_state}")
@@ -169,7 +251,7 @@ class PostFiatTaskManager:
     @requires_wallet_state(TRUSTLINED_STATES)
     def send_initiation_rite(self, commitment):
         memo = construct_initiation_rite_memo(user=self.credential_manager.postfiat_username, commitment=commitment)
-        return send_xrp(network_url=self.network_url,
+        return send_xrp(client=self.client,
                         wallet=self.user_wallet, 
                         amount=1, 
                         destination=self.default_node, 
@@ -215,8 +297,24 @@ class PostFiatTaskManager:
             logger.error(f"Unexpected error saving {description} to {filepath}: {e}")
 
     @PerformanceMonitor.measure('save_transactions')
-    def save_transactions(self):
-        self.save_dataframe(self.transactions, self.tx_history_filepath, "transactions")
+    def save_transactions(self, new_tx_df: Optional[pd.DataFrame] = None):
+        """Saves transactions to the local cache.
+
+        Args:
+            new_tx_df: Transactions added since the last save. With the segmented store these are
+                appended as a new segment; otherwise (or if not provided) the full history is rewritten.
+        """
+        if self.tx_store is None:
+            self.save_dataframe(self.transactions, self.tx_history_filepath, "transactions")
+            return
+
+        try:
+            if new_tx_df is not None:
+                self.tx_store.append(new_tx_df)
+            else:
+                self.tx_store.rewrite(self.transactions)
+        except Exception as e:
+            logger.error(f"Error saving transactions to {self.tx_store.directory}: {e}")
 
     @PerformanceMonitor.measure('save_memo_transactions')
     def save_memo_transactions(self):
@@ -237,10 +335,35 @@ class PostFiatTaskManager:
     @PerformanceMonitor.measure('load_transactions')
     def load_transactions(self):
         """ Loads the transactions from file into a dataframe, and deserializes some columns"""
+        if self.tx_store is not None:
+            return self._load_transactions_from_store()
+        return self._load_transactions_from_file(self.config.get_global_config('transaction_cache_format'))
+
+    def _load_transactions_from_store(self):
+        """Loads transactions from the segmented store, importing an existing CSV or pickle cache on first use"""
+        if self.tx_store.is_empty():
+            for legacy_format in ['pickle', 'csv']:
+                tx_df = self._load_transactions_from_file(legacy_format)
+                if not tx_df.empty:
+                    logger.info(f"Importing {len(tx_df)} cached transactions into {self.tx_store.directory}")
+                    self.tx_store.rewrite(tx_df)
+                    return tx_df
+            return pd.DataFrame()
+
+        try:
+            tx_df = self.tx_store.load()
+            logger.debug(f"Loaded {len(tx_df)} transactions from {len(self.tx_store.segments)} segments in {self.tx_store.directory}")
+            return tx_df
+        except Exception as e:
+            logger.error(f"Error loading transactions from {self.tx_store.directory}: {e}. Clearing store.")
+            self.tx_store.clear()
+            return pd.DataFrame()
+
+    def _load_transactions_from_file(self, format_type):
+        """Loads transactions from a CSV or pickle cache file"""
         tx_df = None
         base_path = os.path.splitext(self.tx_history_filepath)[0]
-        format_type = self.config.get_global_config('transaction_cache_format')
-        
+
         # Determine which file to try loading
         if format_type == 'pickle':
             file_path = f"{base_path}.pkl"
@@ -287,28 +410,50 @@ class PostFiatTaskManager:
             limit=1000  # adjust as needed
         )
 
+    def get_server_ledger_range(self) -> Optional[tuple[int, int]]:
+        """Returns the (earliest, latest) ledger index available on the server, or None if unavailable"""
+        server_state = self.client.request(
+            xrpl.models.requests.ServerState()
+        )
+        if not server_state.is_successful():
+            logger.debug("Could not fetch server state")
+            return None
+
+        complete_ledgers = server_state.result['state']['complete_ledgers']
+        # complete_ledgers is typically returned as a string like "32570-94329899"
+        if '-' not in complete_ledgers:
+            logger.debug(f"Unexpected complete_ledgers format: {complete_ledgers}")
+            return None
+
+        earliest_ledger, latest_ledger = map(int, complete_ledgers.split('-'))
+        logger.debug(f"Server ledger range: {earliest_ledger} to {latest_ledger}")
+        return earliest_ledger, latest_ledger
+
+    def _create_backfill(self) -> TransactionBackfill:
+        return TransactionBackfill(
+            account_address=self.user_wallet.classic_address,
+            endpoints=self.config.get_network_endpoints(),
+            state_directory=self.backfill_state_directory,
+            rpc_pool=self.client.pool
+        )
+
     @PerformanceMonitor.measure('sync_transactions')
-    def sync_transactions(self) -> bool:
-        """ Checks for new transactions and caches them locally. Also triggers memo update"""
+    def sync_transactions(self, defer_backfill: bool = False) -> bool:
+        """ Checks for new transactions and caches them locally. Also triggers memo update
+
+        Args:
+            defer_backfill: If there is no local history, only sync the most recent transactions
+                and set backfill_pending instead of backfilling the full history
+        """
         logger.debug("Updating transactions")
 
         # Check if account exists and is funded before proceeding
         try:
             # Get server state to determine available ledger range
-            server_state = self.client.request(
-                xrpl.models.requests.ServerState()
-            )
-            if server_state.is_successful():
-                complete_ledgers = server_state.result['state']['complete_ledgers']
-                # complete_ledgers is typically returned as a string like "32570-94329899"
-                if '-' in complete_ledgers:
-                    earliest_ledger, latest_ledger = map(int, complete_ledgers.split('-'))
-                    logger.debug(f"Server ledger range: {earliest_ledger} to {latest_ledger}")
-                else:
-                    logger.debug(f"Unexpected complete_ledgers format: {complete_ledgers}")
-            else:
-                logger.debug("Could not fetch server state")
+            ledger_range = self.get_server_ledger_range()
+            if ledger_range is None:
                 return False
+            earliest_ledger, latest_ledger = ledger_range
             
             response = self.client.request(
                 xrpl.models.requests.AccountInfo(
@@ -331,7 +476,7 @@ class PostFiatTaskManager:
                 if not loaded_tx_df.empty:
                     logger.debug(f"Loaded {len(loaded_tx_df)} transactions from {self.tx_history_filepath}")
                     self.transactions = loaded_tx_df
-                    self.sync_memo_transactions(loaded_tx_df)
+                    self.restore_memo_transactions(loaded_tx_df)
 
             # Log local ledger index range
             if not self.transactions.empty:
@@ -346,47 +491,249 @@ class PostFiatTaskManager:
                 next_ledger_index = earliest_ledger  # Start from earliest available ledger
                 logger.debug(f"Starting fresh sync from earliest available ledger: {earliest_ledger}")
             else:   
-                next_ledger_index = self.transactions['ledger_index'].max() + 1
+                if self.sync_cursor.get() is None:
+                    # Histories saved before the cursor was persisted only hold synced transactions
+                    self.sync_cursor.set(self.transactions['ledger_index'].max())
+                next_ledger_index = self.sync_cursor.get() + 1
                 logger.debug(f"Next ledger index: {next_ledger_index}")
 
-            # fetch new transactions from the node
-            new_transactions = self.get_new_transactions(next_ledger_index)
+            # fetch new transactions from the node, backfilling the full history concurrently on a fresh sync
+            backfill = None
+            if self.transactions.empty:
+                if defer_backfill:
+                    self.backfill_pending = True
+                    return self.sync_recent_transactions()
+                if self.backfill_pending:
+                    logger.debug("Historical backfill in progress, skipping sync")
+                    return False
+
+                backfill = self._create_backfill()
+                try:
+                    new_transactions = backfill.run(earliest_ledger, latest_ledger)
+                except BackfillIncompleteException as e:
+                    logger.error(f"Historical backfill incomplete, will resume on next sync: {e}")
+                    return False
+            else:
+                new_transactions = self.get_new_transactions(next_ledger_index)
             
             # Convert list of transactions to DataFrame
             if new_transactions and len(new_transactions) > 0:  # Check if list is not empty
                 new_tx_df = pd.DataFrame(new_transactions)
-                logger.debug(f"Adding {len(new_tx_df)} new transactions...")
-                
-                # Add new transactions to the dataframe
-                self.transactions = pd.concat([self.transactions, new_tx_df], ignore_index=True).drop_duplicates(subset=['hash'])
-                self.save_transactions()
-                self.sync_memo_transactions(new_tx_df)
-                return True
+                added = self._add_new_transactions(new_tx_df)
+                self.sync_cursor.set(new_tx_df['ledger_index'].max())
+                if backfill is not None:
+                    backfill.clear()
             else:
                 logger.debug("No new transactions found. Finished updating local tx history")
-                return False
+                added = False
+
+            # The history now holds every transaction validated up to latest_ledger
+            self.reconcile_transaction_journal(validated_ledger=latest_ledger)
+            return added
                 
         except (TypeError, AttributeError) as e:
             logger.error(f"Error processing transaction history: {e}")
             logger.warning("Corrupted transaction history file detected. Deleting and starting fresh.")
 
             try:
-                if os.path.exists(self.tx_history_filepath):
+                if self.tx_store is not None:
+                    self.tx_store.clear()
+                    logger.debug(f"Cleared corrupted transaction store: {self.tx_store.directory}")
+                elif os.path.exists(self.tx_history_filepath):
                     os.remove(self.tx_history_filepath)
                     logger.debug(f"Deleted corrupted cache file: {self.tx_history_filepath}")
+                if self.tx_index is not None:
+                    self.tx_index.clear()
             except Exception as delete_error:
                 logger.error(f"Error deleting corrupted cache file: {delete_error}")
 
             # Reset dataframes
             self.transactions = pd.DataFrame()
+            self.sync_cursor.clear()
             self.memo_transactions = pd.DataFrame()
             self.tasks = pd.DataFrame()
             self.memos = pd.DataFrame()
             self.system_memos = pd.DataFrame()
+            self.task_states.clear()
+            self.wallet_state_tracker.clear_memos()
+            self.chunk_index.clear()
 
             # Try syncing transactions again with fresh state
             return self.sync_transactions()
 
+    def _add_new_transactions(self, new_tx_df: pd.DataFrame) -> bool:
+        """Adds newly fetched transactions to the local history and cache, and processes their memos.
+        Transactions already in the local history (e.g. streamed over the websocket) are skipped.
+
+        Returns:
+            bool: True if any transactions were added
+        """
+        new_tx_df = new_tx_df.drop_duplicates(subset=['hash'])
+        if not self.transactions.empty:
+            new_tx_df = new_tx_df[~new_tx_df['hash'].isin(self.transactions['hash'])]
+        if new_tx_df.empty:
+            logger.debug("All fetched transactions are already in the local history")
+            return False
+
+        logger.debug(f"Adding {len(new_tx_df)} new transactions...")
+        
+        # Add new transactions to the dataframe
+        self.transactions = pd.concat([self.transactions, new_tx_df], ignore_index=True)
+        self.wallet_state_tracker.invalidate_account()
+        self.save_transactions(new_tx_df)
+        self.sync_memo_transactions(new_tx_df.copy())
+        if self.tx_index is not None:
+            self.tx_index.set_last_ledger_index(self.transactions['ledger_index'].max())
+        self.reconcile_transaction_journal(new_tx_df)
+        return True
+
+    def reconcile_transaction_journal(self, tx_df: Optional[pd.DataFrame] = None, validated_ledger: Optional[int] = None):
+        """Resolves journaled outbound transactions found in the transaction history.
+
+        Args:
+            tx_df: Transactions to check, defaulting to the full local history
+            validated_ledger: Ledger the history is complete up to. Unresolved transactions that expired
+                before it are marked as expired
+        """
+        unresolved = self.transaction_journal.unresolved_hashes()
+        if not unresolved:
+            return
+        tx_df = self.transactions if tx_df is None else tx_df
+        if not tx_df.empty:
+            matches = tx_df[tx_df['hash'].isin(unresolved)]
+            self.transaction_journal.reconcile(matches[['hash', 'meta', 'ledger_index']].to_dict('records'))
+        if validated_ledger is not None:
+            self.transaction_journal.expire(validated_ledger)
+
+    @PerformanceMonitor.measure('ingest_transaction')
+    def ingest_transaction(self, tx: dict) -> set:
+        """Adds a single streamed (websocket) transaction to the local history and the derived dataframes.
+        Unvalidated transactions, and any received before the history has been synced (e.g. while a
+        history backfill is pending), only update the derived dataframes; sync_transactions will add
+        them to the history later. Streamed transactions do not advance the sync cursor, so ledgers
+        missed while the websocket was down are still fetched by the next sync.
+
+        Args:
+            tx: Transaction with tx_json, meta, hash, ledger_index and validated keys
+
+        Returns:
+            set: Names of the dataframes that changed (memo_transactions, tasks, memos, system_memos)
+        """
+        derived_frames = ['memo_transactions', 'tasks', 'memos', 'system_memos']
+        row_counts = {name: len(getattr(self, name)) for name in derived_frames}
+
+        tx_df = pd.DataFrame([tx])
+        self.wallet_state_tracker.invalidate_account()
+        if tx.get('validated') and not self.backfill_pending and self.sync_cursor.get() is not None:
+            self._add_new_transactions(tx_df)
+        else:
+            self.sync_memo_transactions(tx_df)
+
+        return {name for name in derived_frames if len(getattr(self, name)) != row_counts[name]}
+
+    def get_balance_changes(self, meta: dict) -> dict:
+        """Returns the user's final XRP and PFT balances from a transaction's metadata.
+
+        Returns:
+            dict: 'xrp' (drops, as a string) and 'pft' (float) for the balances the transaction modified
+        """
+        return get_balance_changes(meta, self.user_wallet.classic_address, self.pft_issuer)
+
+    @PerformanceMonitor.measure('sync_recent_transactions')
+    def sync_recent_transactions(self, limit: int = constants.FIRST_PAINT_TRANSACTION_LIMIT) -> bool:
+        """Processes only the most recent transactions, so the grids can be populated before the full
+        history is backfilled. These are not added to the transaction cache, which must hold a contiguous history"""
+        logger.debug(f"Syncing the {limit} most recent transactions")
+        try:
+            response = self.client.request(AccountTx(
+                account=self.user_wallet.classic_address,
+                ledger_index_min=-1,
+                ledger_index_max=-1,
+                limit=limit,
+                forward=False
+            ))
+        except Exception as e:
+            logger.error(f"Error fetching recent transactions: {e}")
+            return False
+
+        if not response.is_successful():
+            logger.error(f"Error in XRPL response: {response}")
+            return False
+
+        recent_transactions = response.result.get("transactions", [])
+        if not recent_transactions:
+            logger.debug("No recent transactions found")
+            return False
+
+        # Reverse into ledger order, matching a forward sync
+        self.sync_memo_transactions(pd.DataFrame(recent_transactions[::-1]))
+        return True
+
+    @PerformanceMonitor.measure('fetch_history_backfill')
+    def fetch_history_backfill(self, progress_callback=None) -> Optional[list]:
+        """Fetches the full transaction history for a pending backfill. Does not modify any dataframes,
+        so it can run on a worker thread. Pass the result to merge_history_backfill.
+
+        Args:
+            progress_callback: Optional callable receiving (completed_windows, total_windows)
+
+        Returns:
+            List of transactions, or None if the backfill is incomplete
+        """
+        try:
+            ledger_range = self.get_server_ledger_range()
+            if ledger_range is None:
+                return None
+            return self._create_backfill().run(*ledger_range, progress_callback=progress_callback)
+        except Exception as e:
+            logger.error(f"Historical backfill incomplete: {e}")
+            return None
+
+    @PerformanceMonitor.measure('merge_history_backfill')
+    def merge_history_backfill(self, transactions: list) -> bool:
+        """Merges a completed backfill from fetch_history_backfill into the local history. Memos that were
+        already processed from the recent transactions are deduplicated by hash"""
+        self.backfill_pending = False
+        if not transactions:
+            logger.debug("Backfill found no transactions")
+            return False
+
+        backfill_tx_df = pd.DataFrame(transactions)
+        self._add_new_transactions(backfill_tx_df)
+        self.sync_cursor.set(backfill_tx_df['ledger_index'].max())
+        self._create_backfill().clear()
+        return True
+
+    @PerformanceMonitor.measure('restore_memo_transactions')
+    def restore_memo_transactions(self, loaded_tx_df):
+        """Rebuilds the memo-derived dataframes for transactions loaded from the local cache.
+        With the transaction index enabled, the dataframes are read from the index and only
+        transactions beyond the last indexed ledger are replayed."""
+        if self.tx_index is None:
+            self.sync_memo_transactions(loaded_tx_df)
+            return
+
+        last_indexed_ledger = self.tx_index.get_last_ledger_index()
+        if last_indexed_ledger is None:
+            unindexed_tx_df = loaded_tx_df
+        else:
+            self.memo_transactions = self.tx_index.load_memo_transactions()
+            self.tasks = self.tx_index.load_tasks()
+            self.memos = self.tx_index.load_memos()
+            self.system_memos = self.tx_index.load_system_memos()
+            if not self.tasks.empty:
+                self.task_states.update(self.tasks, get_reward_payouts(self.memo_transactions))
+            self.wallet_state_tracker.update_memos(self.memo_transactions)
+            self.index_memo_chunks(self.memos)
+            logger.debug(f"Restored {len(self.memo_transactions)} memo transactions from index up to ledger {last_indexed_ledger}")
+            unindexed_tx_df = loaded_tx_df[loaded_tx_df['ledger_index'] > last_indexed_ledger]
+
+        if not unindexed_tx_df.empty:
+            logger.debug(f"Replaying {len(unindexed_tx_df)} transactions not yet in the index")
+            self.sync_memo_transactions(unindexed_tx_df.copy())
+
+        self.tx_index.set_last_ledger_index(loaded_tx_df['ledger_index'].max())
+
     @PerformanceMonitor.measure('sync_memo_transactions')
     def sync_memo_transactions(self, new_tx_df):
         """Enriches transactions that contain memos with additional columns for easier processing"""
@@ -398,7 +745,7 @@ class PostFiatTaskManager:
             return
 
         # flag rows with memos
-        new_tx_df['has_memos'] = new_tx_df['tx_json'].apply(lambda x: 'Memos' in x)
+        new_tx_df['has_memos'] = [isinstance(tx, dict) and 'Memos' in tx for tx in new_tx_df['tx_json']]
 
         # filter for rows with memos and convert to dataframe
         memo_tx_df = new_tx_df[new_tx_df['has_memos']== True].copy()
@@ -410,40 +757,17 @@ class PostFiatTaskManager:
 
         # Continue with processing only if we have memos
         try:
-            # Extract first memo into a new column, serialize to dict
-            memo_tx_df['memo_data'] = memo_tx_df['tx_json'].apply(
-                lambda x: self.decode_memo_fields_to_dict(x['Memos'][0]['Memo'])
-            )
-            
-            # Extract account and destination
-            memo_tx_df['account'] = memo_tx_df['tx_json'].apply(lambda x: x['Account'])
-            memo_tx_df['destination'] = memo_tx_df['tx_json'].apply(lambda x: x['Destination'])
-            
-            # Determine direction
-            memo_tx_df['direction'] = np.where(
-                memo_tx_df['destination']==self.user_wallet.classic_address, 
-                'INCOMING',
-                'OUTGOING'
-            )
-            
-            # Derive counterparty address
-            memo_tx_df['counterparty_address'] = memo_tx_df[['destination','account']].sum(1).apply(
-                lambda x: str(x).replace(self.user_wallet.classic_address,'')
+            # Extract memo fields, parties, direction, datetime and PFT flag in a single pass
+            fallback_ledger_indexes = (
+                memo_tx_df['ledger_index'].tolist() if 'ledger_index' in memo_tx_df.columns
+                else [0] * len(memo_tx_df)
             )
-            
-            # Convert ripple timestamp to datetime
-            memo_tx_df['datetime'] = memo_tx_df['tx_json'].apply(
-                lambda x: self.convert_ripple_timestamp_to_datetime(x['date'])
-            )
-            
-            # Get ledger_index from either tx_json or root level
-            memo_tx_df['ledger_index'] = memo_tx_df.apply(
-                lambda row: int(row['tx_json'].get('ledger_index', row.get('ledger_index', 0))), 
-                axis=1
+            memo_columns = extract_memo_transaction_columns(
+                tx_jsons=memo_tx_df['tx_json'].tolist(),
+                fallback_ledger_indexes=fallback_ledger_indexes,
+                wallet_address=self.user_wallet.classic_address
             )
-
-            # Flag rows with PFT
-            memo_tx_df['is_pft'] = memo_tx_df['tx_json'].apply(is_pft_transaction)
+            memo_tx_df = memo_tx_df.assign(**memo_columns)
 
             # Update memo_transactions DataFrame
             if not memo_tx_df.empty and len(memo_tx_df) > 0:
@@ -461,6 +785,11 @@ class PostFiatTaskManager:
                 if SAVE_MEMO_TRANSACTIONS:
                     self.save_memo_transactions()
 
+                if self.tx_index is not None:
+                    self.tx_index.upsert_memo_transactions(memo_tx_df)
+
+                self.wallet_state_tracker.update_memos(memo_tx_df)
+
                 # Process derived data
                 self.sync_tasks(memo_tx_df)
                 self.sync_memos(memo_tx_df)
@@ -516,6 +845,10 @@ class PostFiatTaskManager:
 
         # Concatenate new tasks to existing tasks and drop duplicates
         self.tasks = pd.concat([self.tasks, task_df], ignore_index=True).drop_duplicates(subset=['hash'])
+        self.task_states.update(task_df, get_reward_payouts(new_memo_tx_df))
+
+        if self.tx_index is not None:
+            self.tx_index.upsert_tasks(task_df)
 
         # for debugging purposes only
         if SAVE_TASKS:
@@ -564,11 +897,21 @@ class PostFiatTaskManager:
         memo_df = pd.DataFrame(memo_df['memo_data'].tolist())
 
         # Process chunked messages, etc.
-        self.memos = pd.concat([self.memos, memo_df], ignore_index=True)
+        self.memos = pd.concat([self.memos, memo_df], ignore_index=True).drop_duplicates(subset=['hash'])
+        self.index_memo_chunks(memo_df)
+
+        if self.tx_index is not None:
+            self.tx_index.upsert_memos(memo_df)
 
         if SAVE_MEMOS:
             self.save_memos()
 
+    def index_memo_chunks(self, memo_df: pd.DataFrame):
+        """Adds the chunks among memo_df's rows to the chunk reassembly index"""
+        if memo_df.empty:
+            return
+        self.chunk_index.add_rows(zip(memo_df['task_id'], memo_df['full_output'], memo_df['datetime'], memo_df['hash']))
+
     @PerformanceMonitor.measure('sync_system_memos')
     def sync_system_memos(self, new_memo_tx_df):
         """Updates system_memos dataframe with special system messages"""
@@ -602,6 +945,13 @@ class PostFiatTaskManager:
         # Convert memo_data to new dataframe with all fields
         system_df = pd.DataFrame(system_df['memo_data'].tolist())
 
+        # New handshakes change the handshake status, and incoming ones replace the counterparty's channel key
+        handshake_df = system_df[system_df['task_id'].str.contains(SystemMemoType.HANDSHAKE.value, na=False)]
+        for address in handshake_df['counterparty_address'].unique():
+            _, previous_key = self.handshake_cache.pop(address, (False, None))
+            if previous_key is not None:
+                self.credential_manager.invalidate_channel_cipher(previous_key)
+
         # Update system_memos dataframe with deduplication
         self.system_memos = pd.concat(
             [self.system_memos, system_df], 
@@ -610,19 +960,28 @@ class PostFiatTaskManager:
 
         logger.debug(f"Added {len(system_df)} new system messages")
 
+        if self.tx_index is not None:
+            self.tx_index.upsert_system_memos(system_df)
+
         if SAVE_SYSTEM_MEMOS: 
             self.save_system_memos()
 
     def get_task(self, task_id):
         """ Returns the task dataframe for a given task ID """
-        task_df = self.tasks[self.tasks['task_id'] == task_id]
+        if self.tx_index is not None:
+            task_df = self.tx_index.get_task(task_id)
+        else:
+            task_df = self.tasks[self.tasks['task_id'] == task_id]
         if task_df.empty or len(task_df) == 0:
             raise NoMatchingTaskException(f"No task found with task_id {task_id}")
         return task_df
     
     def get_memo(self, memo_id):
         """Returns the memo dataframe for a given memo ID """
-        memo_df = self.memos[self.memos['memo_id'] == memo_id]
+        if self.tx_index is not None:
+            memo_df = self.tx_index.get_memo(memo_id)
+        else:
+            memo_df = self.memos[self.memos['memo_id'] == memo_id]
         if memo_df.empty or len(memo_df) == 0:
             raise NoMatchingMemoException(f"No memo found with memo_id {memo_id}")
         return memo_df
@@ -640,21 +999,18 @@ class PostFiatTaskManager:
     
     def get_task_state_using_task_id(self, task_id):
         """ Returns the latest state of a task given a task ID """
+        if task_id in self.task_states:
+            return self.task_states.get_latest_state(task_id)
         return self.get_task_state(self.get_task(task_id))
 
     def convert_ripple_timestamp_to_datetime(self, ripple_timestamp = 768602652):
-        ripple_epoch_offset = 946684800  # January 1, 2000 (00:00 UTC)
-        
-        
-        unix_timestamp = ripple_timestamp + ripple_epoch_offset
+        unix_timestamp = ripple_timestamp + constants.RIPPLE_EPOCH_OFFSET
         date_object = datetime.datetime.fromtimestamp(unix_timestamp)
         return date_object
 
     @staticmethod
     def hex_to_text(hex_string):
-        bytes_object = bytes.fromhex(hex_string)
-        ascii_string = bytes_object.decode("utf-8")
-        return ascii_string
+        return hex_to_text(hex_string)
     
     @staticmethod
     def generate_custom_id():
@@ -670,7 +1026,20 @@ class PostFiatTaskManager:
     
     @PerformanceMonitor.measure('send_xrp')
     def send_xrp(self, amount, destination, memo="", destination_tag=None):
-        return send_xrp(self.network_url, self.user_wallet, amount, destination, memo, destination_tag=destination_tag)
+        with self.submission_lock:
+            return send_xrp(
+                self.client, self.user_wallet, amount, destination, memo,
+                destination_tag=destination_tag, watcher=self.validation_watcher,
+                journal=self.transaction_journal
+            )
+
+    def submit_and_wait(self, transaction: xrpl.models.Transaction) -> xrpl.models.Response:
+        """Submits a transaction and waits for it to validate, confirming through the validation watcher when it is live.
+        The signed transaction is journaled first, so a retry after an unknown outcome resubmits it instead of sending twice"""
+        with self.submission_lock:
+            return submit_and_confirm(
+                transaction, self.client, self.user_wallet, self.validation_watcher, self.transaction_journal
+            )
 
     @staticmethod
     def decode_memo_fields_to_dict(memo: Union[xrpl.models.transactions.Memo, dict]):
@@ -686,22 +1055,13 @@ class PostFiatTaskManager:
         # TODO: Remove key changes and rely on MemoFormat, MemoType, MemoData to avoid confusion from context-switching
         # Handle xrpl.models.transactions.Memo objects
         if hasattr(memo, 'memo_format'):  # This is a Memo object
-            fields = {
-                'user': memo.memo_format,
-                'task_id': memo.memo_type,
-                'full_output': memo.memo_data
-            }
-        else:  # This is a dictionary from transaction JSON
-            fields = {
-                'user': memo.get('MemoFormat', ''),
-                'task_id': memo.get('MemoType', ''),
-                'full_output': memo.get('MemoData', '')
+            memo = {
+                'MemoFormat': memo.memo_format,
+                'MemoType': memo.memo_type,
+                'MemoData': memo.memo_data
             }
-        
-        return {
-            key: PostFiatTaskManager.hex_to_text(value or '')
-            for key, value in fields.items()
-        }
+
+        return decode_memo_fields([memo])[0]
 
     def spawn_user_wallet(self):
         """ This takes the credential manager and loads the wallet from the
@@ -719,16 +1079,15 @@ class PostFiatTaskManager:
         # TODO: This is a temporary fix to handle the memo type
         # TODO: We need to handle the memo type properly
         if isinstance(memo, str) and is_over_1kb(memo):
-            response = []
             logger.debug("Memo exceeds 1 KB, splitting into chunks")
-            chunked_memo = self._chunk_memos(memo)
+            chunked_memo = [Memo(memo_data=text_to_hex(chunk)) for chunk in plan_memo_chunks(b'', b'', memo.encode('utf-8'))]
 
             # Split amount by number of chunks
-            amount_per_chunk = amount / len(chunked_memo)
+            amount_per_chunk = Decimal(str(amount)) / len(chunked_memo)
 
-            # Send each chunk in a separate transaction
-            for memo_chunk in chunked_memo:
-                response.append(self._send_pft_single(amount_per_chunk, destination, memo_chunk))
+            # Submit the chunks together and wait for all of them to validate
+            payments = [self._build_pft_payment(amount_per_chunk, destination, memo_chunk) for memo_chunk in chunked_memo]
+            response = self.submit_pipelined(payments)
         
         else:
             logger.debug("Memo is under 1 KB, sending in a single transaction")
@@ -736,15 +1095,13 @@ class PostFiatTaskManager:
 
         return response
 
-    def _send_pft_single(self, amount, destination, memo):
-        """Helper method to send a single PFT transaction"""
-        client = xrpl.clients.JsonRpcClient(self.network_url)
-
+    def _build_pft_payment(self, amount, destination, memo) -> xrpl.models.transactions.Payment:
+        """Builds an unsigned PFT payment with a memo"""
         # Handle memo
         if isinstance(memo, Memo):
             memos = [memo]
         elif isinstance(memo, str):
-            memos = [Memo(memo_data=str_to_hex(memo))]
+            memos = [Memo(memo_data=text_to_hex(memo))]
         else:
             logger.error("Memo is not a string or a Memo object, raising ValueError")
             raise ValueError("Memo must be either a string or a Memo object")
@@ -755,22 +1112,20 @@ class PostFiatTaskManager:
             value=str(amount)
         )
 
-        payment = xrpl.models.transactions.Payment(
+        return xrpl.models.transactions.Payment(
             account=self.user_wallet.address,
             amount=amount_to_send,
             destination=destination,
             memos=memos,
         )
 
-        # Sign the transaction to get the hash
-        # We need to derive the hash because the submit_and_wait function doesn't return a hash if transaction fails
-        # TODO: tx_hash does not match the hash in the response
-        # signed_tx = xrpl.transaction.sign(payment, self.user_wallet)
-        # tx_hash = signed_tx.get_hash()
+    def _send_pft_single(self, amount, destination, memo):
+        """Helper method to send a single PFT transaction"""
+        payment = self._build_pft_payment(amount, destination, memo)
 
         try:
             logger.debug("Submitting and waiting for transaction")
-            response = xrpl.transaction.submit_and_wait(payment, client, self.user_wallet)    
+            response = self.submit_and_wait(payment)
         except xrpl.transaction.XRPLReliableSubmissionException as e:
             response = f"Transaction submission failed: {e}"
             logger.error(response)
@@ -857,6 +1212,11 @@ class PostFiatTaskManager:
         if handshake_sent and received_key is not None:
             return handshake_sent, received_key
 
+        if self.tx_index is not None:
+            result = self.tx_index.get_handshake(address, SystemMemoType.HANDSHAKE.value)
+            self.handshake_cache[address] = result
+            return result
+
         if self.system_memos.empty or len(self.system_memos) == 0:
             logger.debug("No system memos found")
             return False, None
@@ -906,10 +1266,6 @@ class PostFiatTaskManager:
         )
         return self.send_memo(destination, handshake, compress=False)
     
-    @staticmethod
-    def calculate_memo_size(memo_format: str, memo_type: str, memo_data: str) -> dict:
-        return calculate_memo_size(memo_format, memo_type, memo_data)
-
     @staticmethod
     def calculate_required_chunks(memo: Memo, max_size: int = constants.MAX_CHUNK_SIZE) -> int:
         """
@@ -917,7 +1273,7 @@ class PostFiatTaskManager:
         
         Args:
             memo: Original Memo object to analyze
-            max_size: Maximum size in bytes for each complete Memo object
+            max_size: Maximum serialized size in bytes for each complete Memo object
             
         Returns:
             int: Number of chunks required
@@ -925,94 +1281,35 @@ class PostFiatTaskManager:
         Raises:
             ValueError: If the memo cannot be chunked (overhead too large)
         """
-        # Extract memo components
-        memo_dict = PostFiatTaskManager.decode_memo_fields_to_dict(memo)
-        memo_format = memo_dict['user']
-        memo_type = memo_dict['task_id']
-        memo_data = memo_dict['full_output']
-
-        logger.debug(f"Deconstructed (plaintext) memo sizes: "
-                    f"memo_format: {len(memo_format)}, "
-                    f"memo_type: {len(memo_type)}, "
-                    f"memo_data: {len(memo_data)}")
-
-        # Calculate overhead sizes
-        size_info = PostFiatTaskManager.calculate_memo_size(memo_format, memo_type, "chunk_999__")  # assuming chunk_999__ is worst-case chunk label overhead
-        max_data_size = max_size - size_info['total_size']
-
-        logger.debug(f"Size allocation:")
-        logger.debug(f"  Max size: {max_size}")
-        logger.debug(f"  Total overhead: {size_info['total_size']}")
-        logger.debug(f"  Available for data: {max_size} - {size_info['total_size']} = {max_data_size}")
-
-        if max_data_size <= 0:
-            raise ValueError(
-                f"No space for data: max_size={max_size}, total_overhead={size_info['total_size']}"
-            )
-        
-        # Calculate number of chunks needed
-        data_bytes = memo_data.encode('utf-8')
-        return math.ceil(len(data_bytes) / max_data_size)
+        return len(PostFiatTaskManager._plan_memo_object_chunks(memo, max_size))
+
+    @staticmethod
+    def _plan_memo_object_chunks(memo: Memo, max_size: int) -> List[bytes]:
+        return plan_memo_chunks(
+            bytes.fromhex(memo.memo_format or ''),
+            bytes.fromhex(memo.memo_type or ''),
+            bytes.fromhex(memo.memo_data or ''),
+            max_size
+        )
     
     @staticmethod
     def _chunk_memos(memo: Memo, max_size: int = constants.MAX_CHUNK_SIZE) -> List[Memo]:
         """
-        Splits a Memo object into multiple Memo objects, each under MAX_CHUNK_SIZE bytes.
+        Splits a Memo object into multiple Memo objects, each under MAX_CHUNK_SIZE serialized bytes.
         Only chunks the memo_data field while preserving memo_format and memo_type.
         
         Args:
             memo: Original Memo object to split
-            max_size: Maximum size in bytes for each complete Memo object
+            max_size: Maximum serialized size in bytes for each complete Memo object
             
         Returns:
             List of Memo objects, each under max_size bytes
         """
         logger.debug("Chunking memo...")
-
-        # Extract memo components
-        memo_dict = PostFiatTaskManager.decode_memo_fields_to_dict(memo)
-        memo_format = memo_dict['user']
-        memo_type = memo_dict['task_id']
-        memo_data = memo_dict['full_output']
-
-        # Calculate chunks needed and validate size
-        num_chunks = PostFiatTaskManager.calculate_required_chunks(memo, max_size)
-        chunk_size = len(memo_data.encode('utf-8')) // num_chunks
-                
-        # Split into chunks
-        chunked_memos = []
-        data_bytes = memo_data.encode('utf-8')
-        for chunk_number in range(1, num_chunks + 1):
-            start_idx = (chunk_number - 1) * chunk_size
-            end_idx = start_idx + chunk_size if chunk_number < num_chunks else len(data_bytes)
-            chunk = data_bytes[start_idx:end_idx]
-            chunk_with_label = f"chunk_{chunk_number}__{chunk.decode('utf-8', errors='ignore')}"
-
-            # Debug the sizes
-            test_format = str_to_hex(memo_format)
-            test_type = str_to_hex(memo_type)
-            test_data = str_to_hex(chunk_with_label)
-            
-            logger.debug(f"Chunk {chunk_number} sizes:")
-            logger.debug(f"  Plaintext Format size: {len(memo_format)}")
-            logger.debug(f"  Plaintext Type size: {len(memo_type)}")
-            logger.debug(f"  Plaintext Data size: {len(chunk_with_label)}")
-            logger.debug(f"  Plaintext Total size: {len(memo_format) + len(memo_type) + len(chunk_with_label)}")
-            logger.debug(f"  Hex Format size: {len(test_format)}")
-            logger.debug(f"  Hex Type size: {len(test_type)}")
-            logger.debug(f"  Hex Data size: {len(test_data)}")
-            logger.debug(f"  Hex Total size: {len(test_format) + len(test_type) + len(test_data)}")
-            
-            chunk_memo = construct_memo(
-                memo_format=memo_format,
-                memo_type=memo_type,
-                memo_data=chunk_with_label,
-                validate_size=False  # TODO: The size validation appears too conservative
-            )
-
-            chunked_memos.append(chunk_memo)
-
-        return chunked_memos
+        return [
+            Memo(memo_data=text_to_hex(chunk), memo_type=memo.memo_type, memo_format=memo.memo_format)
+            for chunk in PostFiatTaskManager._plan_memo_object_chunks(memo, max_size)
+        ]
 
     @PerformanceMonitor.measure('encrypt_memo')
     def encrypt_memo(self, memo: str, shared_secret: str) -> str:
@@ -1022,8 +1319,7 @@ class PostFiatTaskManager:
             shared_secret = shared_secret.encode()
 
         # Generate the Fernet key from shared secret
-        key = base64.urlsafe_b64encode(hashlib.sha256(shared_secret).digest())
-        fernet = Fernet(key)
+        fernet = derive_channel_fernet(shared_secret)
 
         # Ensure memo is str before encoding to bytes
         if isinstance(memo, str):
@@ -1037,6 +1333,38 @@ class PostFiatTaskManager:
         encrypted_bytes = fernet.encrypt(memo)
         return encrypted_bytes.decode()
 
+    def encode_memo_data(self, memo_data: str, destination: str, compress: bool = True, encrypt: bool = False) -> str:
+        """Returns the memo data as it is sent. By default it is encrypted, then compressed with the legacy
+        COMPRESSED__ encoding that every node and client decodes. With use_memo_codec enabled, it is
+        compressed with the memo codec before encryption instead, since ciphertext does not compress.
+
+        Raises HandshakeRequiredError if encryption is requested before the destination sent a handshake.
+        """
+        use_codec = compress and self.config.get_global_config('use_memo_codec')
+        if use_codec:
+            logger.debug(f"Compressing memo of length {len(memo_data)}")
+            memo_data = encode_memo_payload(memo_data)
+            logger.debug(f"Compressed to length {len(memo_data)}")
+
+        if encrypt:
+            # Check handshake status
+            _, received_key = self.get_handshake_for_address(destination)
+            if not received_key:
+                raise HandshakeRequiredError(destination)
+            
+            # Encrypt the memo using the cipher derived from the shared secret (cached per session)
+            logger.debug(f"Encrypting memo: {memo_data[:8]}...")
+            encrypted_memo = self.credential_manager.get_channel_cipher(received_key).encrypt(memo_data.encode()).decode()
+            logger.debug(f"Encrypted memo: {encrypted_memo[:8]}...")
+            memo_data = "WHISPER__" + encrypted_memo
+
+        if compress and not use_codec:
+            logger.debug(f"Compressing memo of length {len(memo_data)}")
+            memo_data = "COMPRESSED__" + compress_string(memo_data)
+            logger.debug(f"Compressed to length {len(memo_data)}")
+
+        return memo_data
+
     @PerformanceMonitor.measure('send_memo')
     def send_memo(
         self, 
@@ -1066,22 +1394,7 @@ class PostFiatTaskManager:
 
         logger.debug(f"Memo getting sent: {memo}")
 
-        # Extract or create memo components
-        if isinstance(memo, Memo):
-            memo_data = self.hex_to_text(memo.memo_data)
-            memo_type = self.hex_to_text(memo.memo_type)
-            memo_format = self.hex_to_text(memo.memo_format)
-        else:
-            memo_data = str(memo)
-            memo_type = message_id or self.generate_custom_id()
-            memo_format = username or self.credential_manager.postfiat_username
-
-        # Get per-tx PFT requirement
-        # TODO: Make this reject if passed pft_amount is too low
-        pft_amount = pft_amount or self.transaction_requirements.get_pft_requirement(
-            address=destination,
-            memo_type=memo_type
-        )
+        memo_format, memo_type, memo_data = self._get_memo_fields(memo, username, message_id)
 
         # Check if this is a system memo type, which requires special handling
         is_system_memo = any(
@@ -1089,64 +1402,109 @@ class PostFiatTaskManager:
             for system_type in SystemMemoType
         )
 
-        # Handle encryption if requested
-        if encrypt:
-            # Check handshake status
-            _, received_key = self.get_handshake_for_address(destination)
-            if not received_key:
-                raise HandshakeRequiredError(destination)
-            
-            # Derive the shared secret
-            shared_secret = self.credential_manager.get_shared_secret(received_key)
-            logger.debug(f"Shared secret: {shared_secret[:8]}...")
-
-            # Encrypt the memo using the shared secret
-            logger.debug(f"Encrypting memo: {memo_data[:8]}...")
-            encrypted_memo = self.encrypt_memo(memo_data, shared_secret)
-            logger.debug(f"Encrypted memo: {encrypted_memo[:8]}...")
-            memo_data = "WHISPER__" + encrypted_memo
+        # Handle chunking for non-system memos if requested.
+        # SystemMemoTypes cannot be chunked due to collision risk, so they are sent as a single memo
+        if chunk and not is_system_memo:
+            plan = self.plan_memo(
+                destination, memo, username=username, message_id=message_id,
+                compress=compress, encrypt=encrypt, pft_amount=pft_amount
+            )
+            try:
+                return self.send_memo_plan(destination, plan)
+            except Exception as e:
+                logger.error(f"Error sending chunked memo: {e}")
+                logger.error(f"traceback: {traceback.format_exc()}")
+                return None
 
-        # Handle compression if requested
-        if compress:
-            logger.debug(f"Compressing memo of length {len(memo_data)}")
-            compressed_data = compress_string(memo_data)
-            logger.debug(f"Compressed to length {len(compressed_data)}")
-            memo_data = "COMPRESSED__" + compressed_data
+        pft_amount = pft_amount or self.get_pft_per_memo(destination, memo_type)
+        memo_data = self.encode_memo_data(memo_data, destination, compress=compress, encrypt=encrypt)
 
-        # For system memos, verify size and prevent chunking
-        # construct_memo will raise ValueError if size exceeds limit, since SystemMemoTypes cannot be chunked due to collision risk
+        # construct_memo will raise ValueError if size exceeds limit
         memo = construct_memo(
             memo_format=memo_format,
             memo_type=memo_type,
             memo_data=memo_data,
-            validate_size=(is_system_memo and chunk) or not chunk
+            validate_size=True
         )
+        return self._send_memo_single(destination, memo, pft_amount)
 
-        if is_system_memo and chunk:
-            return self._send_memo_single(destination, memo_data)
-
-        # Handle chunking for non-system memos if requested
-        if chunk:
-            try:
-                chunk_memos = self._chunk_memos(memo)
-                responses = []
+    def _get_memo_fields(self, memo: Union[str, Memo], username: Optional[str], message_id: Optional[str]) -> tuple:
+        """Returns the (memo_format, memo_type, memo_data) text of a message or pre-constructed Memo"""
+        if isinstance(memo, Memo):
+            return self.hex_to_text(memo.memo_format), self.hex_to_text(memo.memo_type), self.hex_to_text(memo.memo_data)
+        return (
+            username or self.credential_manager.postfiat_username,
+            message_id or self.generate_custom_id(),
+            str(memo)
+        )
 
-                for idx, chunk_memo in enumerate(chunk_memos):
-                    logger.debug(f"Sending chunk {idx+1} of {len(chunk_memos)}: {chunk_memo.memo_data[:100]}...")
-                    responses.append(self._send_memo_single(destination, chunk_memo, pft_amount))
+    def get_pft_per_memo(self, destination: str, memo_type: str) -> Decimal:
+        """Returns the per-transaction PFT requirement for sending a memo to a destination"""
+        # TODO: Make this reject if passed pft_amount is too low
+        return self.transaction_requirements.get_pft_requirement(
+            address=destination,
+            memo_type=memo_type
+        )
 
-                return responses
-            except Exception as e:
-                logger.error(f"Error chunking memo: {e}")
-                logger.error(f"traceback: {traceback.format_exc()}")
+    def plan_memo(
+        self,
+        destination: str,
+        memo: Union[str, Memo],
+        username: Optional[str] = None,
+        message_id: Optional[str] = None,
+        compress: bool = True,
+        encrypt: bool = False,
+        pft_amount: Optional[Decimal] = None
+    ) -> MemoChunkPlan:
+        """Encodes a message and plans the fewest chunks it can be sent in, without sending it.
+        Takes the same arguments as send_memo. The plan can be shown to the user, then sent with send_memo_plan.
 
-        else:
-            return self._send_memo_single(destination, memo, pft_amount)
-    
-    def _send_memo_single(self, destination: str, memo: Memo, pft_amount: Decimal):
-        """ Sends a memo to a destination. """
-        client = xrpl.clients.JsonRpcClient(self.network_url)
+        Raises:
+            HandshakeRequiredError: If encryption is requested before the destination sent a handshake
+            ValueError: If the memo format and type leave no room for data
+        """
+        memo_format, memo_type, memo_data = self._get_memo_fields(memo, username, message_id)
+        memo_data = self.encode_memo_data(memo_data, destination, compress=compress, encrypt=encrypt)
 
+        chunks = plan_memo_chunks(
+            memo_format.encode('utf-8'),
+            memo_type.encode('utf-8'),
+            memo_data.encode('utf-8')
+        )
+        plan = MemoChunkPlan(
+            memo_format=memo_format,
+            memo_type=memo_type,
+            chunks=chunks,
+            pft_per_chunk=Decimal(pft_amount or self.get_pft_per_memo(destination, memo_type))
+        )
+        logger.debug(f"Planned {plan.num_chunks} chunk(s) for {plan.total_bytes} bytes of memo data")
+        return plan
+
+    def send_memo_plan(self, destination: str, plan: MemoChunkPlan) -> list:
+        """Sends the chunks of a MemoChunkPlan, returning the response for each.
+        Multiple chunks are submitted together and confirmed as a batch"""
+        chunk_memos = plan.to_memos()
+        if len(chunk_memos) == 1:
+            return [self._send_memo_single(destination, chunk_memos[0], plan.pft_per_chunk)]
+
+        logger.debug(f"Sending {len(chunk_memos)} chunks to {destination}")
+        payments = [self._build_memo_payment(destination, chunk_memo, plan.pft_per_chunk) for chunk_memo in chunk_memos]
+        return self.submit_pipelined(payments)
+
+    def submit_pipelined(self, payments: List[xrpl.models.transactions.Payment]) -> list:
+        """Submits payments back-to-back with consecutive sequence numbers and waits for all of them to validate.
+        Returns the response for each payment, in order, or a string describing why it failed"""
+        with self.submission_lock:
+            responses = PipelinedSubmitter(
+                self.client, self.user_wallet, watcher=self.validation_watcher, journal=self.transaction_journal
+            ).submit(payments)
+        for idx, response in enumerate(responses):
+            if isinstance(response, str):
+                logger.error(f"Transaction {idx+1} of {len(responses)}: {response}")
+        return responses
+
+    def _build_memo_payment(self, destination: str, memo: Memo, pft_amount: Decimal) -> xrpl.models.transactions.Payment:
+        """Builds an unsigned payment carrying a memo, with PFT if required or the minimum XRP amount otherwise"""
         payment_args = {
             "account": self.user_wallet.address,
             "destination": destination,
@@ -1163,11 +1521,15 @@ class PostFiatTaskManager:
             # Send minimum XRP amount for memo-only transactions
             payment_args["amount"] = xrpl.utils.xrp_to_drops(Decimal(constants.MIN_XRP_PER_TRANSACTION))
 
-        payment = xrpl.models.transactions.Payment(**payment_args)
+        return xrpl.models.transactions.Payment(**payment_args)
+
+    def _send_memo_single(self, destination: str, memo: Memo, pft_amount: Decimal):
+        """ Sends a memo to a destination. """
+        payment = self._build_memo_payment(destination, memo, pft_amount)
 
         try:
             logger.debug("Submitting and waiting for transaction")
-            response = xrpl.transaction.submit_and_wait(payment, client, self.user_wallet)    
+            response = self.submit_and_wait(payment)
         except xrpl.transaction.XRPLReliableSubmissionException as e:
             response = f"Transaction submission failed: {e}"
             logger.error(response)
@@ -1178,83 +1540,6 @@ class PostFiatTaskManager:
 
         return response
 
-    def _reconstruct_chunked_message(
-        self,
-        memo_type: str,
-        memos: pd.DataFrame
-    ) -> str:
-        """Reconstruct a message from its chunks.
-        
-        Args:
-            memo_type: Message ID to reconstruct
-            memo_history: DataFrame containing memo history
-            
-        Returns:
-            str: Reconstructed message or None if reconstruction fails
-        """
-        try: 
-
-            # Get all chunks with this memo type
-            memo_chunks = memos[
-                (memos['task_id'] == memo_type) &
-                (memos['full_output'].str.match(r'^chunk_\d+__'))  # Only get actual chunks
-            ].copy()
-
-            if memo_chunks.empty:
-                return None
-
-            # Extract chunk numbers and sort
-            def extract_chunk_number(x):
-                match = re.search(r'chunk_(\d+)__', x)
-                return int(match.group(1)) if match else 0
-            
-            memo_chunks['chunk_number'] = memo_chunks['full_output'].apply(extract_chunk_number)
-            memo_chunks.sort_values(by='datetime', ascending=True, inplace=True)
-
-            # Detect and handle multiple chunk sequences
-            current_sequence = []
-            highest_chunk_num = 0
-
-            for _, chunk in memo_chunks.iterrows():
-                # If we see a chunk_1 and already have chunks, this is a new sequence
-                if chunk['chunk_number'] == 1 and current_sequence:
-                    # Check if previous sequence was complete (no gaps)
-                    expected_chunks = set(range(1, highest_chunk_num + 1))
-                    actual_chunks = set(chunk['chunk_number'] for chunk in current_sequence)
-
-                    if expected_chunks == actual_chunks:
-                        # First sequence is complete, ignore all subsequent chunks
-                        logger.warning(f"Found complete sequence for {memo_type}, ignoring new sequence")
-                        break
-                    else:
-                        # First sequence was incomplete, start fresh with new sequence
-                        logger.warning(f"Previous sequence incomplete for {memo_type}, starting new sequence")
-                        current_sequence = []
-                        highest_chunk_num = 0
-
-                current_sequence.append(chunk)
-                highest_chunk_num = max(highest_chunk_num, chunk['chunk_number'])
-
-            # Verify final sequence is complete
-            expected_chunks = set(range(1, highest_chunk_num + 1))
-            actual_chunks = set(chunk['chunk_number'] for chunk in current_sequence)
-            if expected_chunks != actual_chunks:
-                logger.warning(f"Missing chunks for {memo_type}. Expected {expected_chunks}, got {actual_chunks}")
-                return None
-            
-            # Combine chunks in order
-            current_sequence.sort(key=lambda x: x['chunk_number'])
-            reconstructed_parts = []
-            for chunk in current_sequence:
-                chunk_data = re.sub(r'^chunk_\d+__', '', chunk['full_output'])
-                reconstructed_parts.append(chunk_data)
-
-            return ''.join(reconstructed_parts)
-
-        except Exception as e:
-            logger.error(f"Error reconstructing message {memo_type}: {e}")
-            return None
-        
     @staticmethod
     def decrypt_memo(encrypted_content: str, shared_secret: Union[str, bytes]) -> Optional[str]:
         """
@@ -1273,8 +1558,7 @@ class PostFiatTaskManager:
                 shared_secret = shared_secret.encode()
 
             # Generate a Fernet key from the shared secret
-            key = base64.urlsafe_b64encode(hashlib.sha256(shared_secret).digest())
-            fernet = Fernet(key)
+            fernet = derive_channel_fernet(shared_secret)
 
             # Decrypt the message
             decrypted_bytes = fernet.decrypt(encrypted_content.encode())
@@ -1291,9 +1575,8 @@ class PostFiatTaskManager:
             decompress: bool = True,
             decrypt: bool = True,
             full_unchunk: bool = False, 
-            memo_history: Optional[pd.DataFrame] = None,
             channel_counterparty: Optional[str] = None,
-        ) -> str:
+        ) -> Optional[str]:
         """Process memo data, handling compression, encryption, and chunking.
         
         For encrypted messages (WHISPER__ prefix), this method handles decryption using ECDH
@@ -1304,79 +1587,128 @@ class PostFiatTaskManager:
             memo_data: Initial memo data string
             decompress: If True, decompresses data if COMPRESSED__ prefix is present
             decrypt: If True, decrypts data if WHISPER__ prefix is present
-            full_unchunk: If True, will attempt to unchunk by referencing memo history
-            memo_history: Pre-filtered memo history required for chunk lookup
+            full_unchunk: If True, will attempt to unchunk using the chunk reassembly index
             channel_counterparty: The other end of the encryption channel
+
+        Returns:
+            The processed memo data, or None if unchunking, decompression or decryption failed
         """
-        try: 
-            processed_data = memo_data
-
-            # Handle chunking
-            if full_unchunk and memo_history is not None:
-                # Skip chunk processing for SystemMemoType messages
-                is_system_memo = any(
-                    memo_type == system_type.value
-                    for system_type in SystemMemoType
-                )
+        return self.process_memo_data_batch(
+            [(memo_type, memo_data, channel_counterparty)],
+            decompress=decompress,
+            decrypt=decrypt,
+            full_unchunk=full_unchunk
+        )[0]
+
+    @PerformanceMonitor.measure('process_memo_data_batch')
+    def process_memo_data_batch(
+            self,
+            memos: List[tuple],
+            decompress: bool = True,
+            decrypt: bool = True,
+            full_unchunk: bool = False
+        ) -> List[Optional[str]]:
+        """Batch version of process_memo_data for (memo_type, memo_data, channel_counterparty) tuples.
+        Results are returned in input order, with None for memos that failed to process.
 
-                # Handle chunking for non-system messages only
-                if not is_system_memo:
-                    # Check if this is a chunked message
-                    chunk_match = re.match(r'^chunk_\d+__', memo_data)
-                    if chunk_match:
-                        reconstructed = self._reconstruct_chunked_message(
-                            memo_type=memo_type,
-                            memos=memo_history
-                        )
-                        if reconstructed:
-                            processed_data = reconstructed
-                        else:
-                            # If reconstruction fails, just clean the prefix from the single message
-                            logger.debug(f"Reconstruction of chunked message {memo_type} failed. Cleaning prefix from single message.")
-                            processed_data = re.sub(r'^chunk_\d+__', '', memo_data)
-
-            elif isinstance(processed_data, str):
-                # Simple chunk prefix removal (no full unchunking)
-                processed_data = re.sub(r'^chunk_\d+__', '', processed_data)
-
-            # Handle decompression
-            if decompress and processed_data.startswith('COMPRESSED__'):
-                processed_data = processed_data.replace('COMPRESSED__', '', 1)
-                # logger.debug(f"Decompressing data of length {len(processed_data)}")
-                processed_data = decompress_string(processed_data)
-
-            # Handle decryption
-            if decrypt and processed_data.startswith('WHISPER__'):
-                if not channel_counterparty:
-                    logger.warning(f"Cannot decrypt message {memo_type} - missing channel_counterparty")
-                    return processed_data
-                
-                # Get handshake status
-                _, received_key = self.get_handshake_for_address(channel_counterparty)
-                if not received_key:
-                    logger.warning(f"Cannot decrypt message {memo_type} - no handshake found")
-                    return processed_data
-                
-                # Get the shared secret
-                shared_secret = self.credential_manager.get_shared_secret(received_key)
-                
-                # Remove the WHISPER__ prefix and decrypt
-                processed_data = processed_data.replace('WHISPER__', '', 1)
-                processed_data = '[DECRYPTED] ' + self.decrypt_memo(processed_data, shared_secret)
+        Chunks are reassembled here, then the decompression and decryption are fanned out to a
+        thread pool, deriving each channel's cipher at most once for the batch.
+        """
+        payloads = []
+        for memo_type, memo_data, channel_counterparty in memos:
+            try:
+                payloads.append((self._unchunk_memo_data(memo_type, memo_data, full_unchunk), channel_counterparty))
+            except Exception as e:
+                logger.error(f"Error processing memo data for {memo_type}: {e}")
+                payloads.append((None, channel_counterparty))
 
-            return processed_data
-        
-        except Exception as e:
-            logger.error(f"Error processing memo data: {e}")
+        return process_memo_batch(
+            payloads,
+            decompress=decompress_memo_payload if decompress else None,
+            get_cipher=self.get_channel_cipher_for_address if decrypt else None
+        )
+
+    def _unchunk_memo_data(self, memo_type: str, memo_data: str, full_unchunk: bool) -> str:
+        """Returns the reassembled message for a chunk, or the memo data with its chunk prefix removed"""
+        if not full_unchunk:
+            # Simple chunk prefix removal (no full unchunking)
+            return re.sub(r'^chunk_\d+__', '', memo_data) if isinstance(memo_data, str) else memo_data
+
+        # Skip chunk processing for SystemMemoType messages
+        is_system_memo = any(
+            memo_type == system_type.value
+            for system_type in SystemMemoType
+        )
+        if is_system_memo or not re.match(r'^chunk_\d+__', memo_data):
+            return memo_data
+
+        # Reassembled and decompressed once, then cached until another chunk arrives
+        reconstructed = self.chunk_index.get_payload(memo_type)
+        if reconstructed:
+            return reconstructed
+
+        # If reconstruction fails, just clean the prefix from the single message
+        logger.debug(f"Reconstruction of chunked message {memo_type} failed. Cleaning prefix from single message.")
+        return re.sub(r'^chunk_\d+__', '', memo_data)
+
+    def get_channel_cipher_for_address(self, channel_counterparty: str) -> Optional[Fernet]:
+        """Returns the cipher for the encrypted channel with an address, or None if it has not sent a handshake"""
+        _, received_key = self.get_handshake_for_address(channel_counterparty)
+        if not received_key:
+            logger.warning(f"Cannot decrypt messages from {channel_counterparty} - no handshake found")
             return None
+        # Derived from the shared secret once per session
+        return self.credential_manager.get_channel_cipher(received_key)
     
+    def get_processed_message(
+            self,
+            tx_hash: str,
+            memo_type: str,
+            memo_data: str,
+            full_unchunk: bool = False,
+            channel_counterparty: Optional[str] = None
+        ) -> str:
+        """Returns process_memo_data's result for a message, using the persistent message cache.
+        Only final results are cached: fully reassembled, decompressed and decrypted."""
+        return self.get_processed_messages(
+            [(tx_hash, memo_type, memo_data, channel_counterparty)],
+            full_unchunk=full_unchunk
+        )[0]
+
+    def get_processed_messages(self, messages: List[tuple], full_unchunk: bool = False) -> List[Optional[str]]:
+        """Batch version of get_processed_message for (tx_hash, memo_type, memo_data, channel_counterparty)
+        tuples. Cache misses are processed together with process_memo_data_batch. Results are in input order."""
+        results = [self.message_cache.get(message[0]) for message in messages]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if not misses:
+            return results
+
+        processed_batch = self.process_memo_data_batch(
+            [messages[i][1:] for i in misses],
+            full_unchunk=full_unchunk
+        )
+
+        for i, processed in zip(misses, processed_batch):
+            results[i] = processed
+            tx_hash, memo_type, memo_data, _ = messages[i]
+
+            if processed is None or processed.startswith('WHISPER__') or is_compressed(processed):
+                continue  # decryption is still pending a handshake, or processing failed
+            is_chunked = full_unchunk and ChunkReassemblyIndex.parse_chunk(memo_data) is not None
+            if is_chunked and self.chunk_index.get_payload(memo_type) is None:
+                continue  # more chunks may still arrive
+
+            self.message_cache.put(tx_hash, processed)
+
+        return results
+
     def get_account_transactions(self, account_address='r3UHe45BzAVB3ENd21X9LeQngr4ofRJo5n', 
                                 ledger_index_min=-1, 
                                 ledger_index_max=-1, 
                                 limit=10
                                 ):
         logger.debug(f"Getting transactions for account {account_address} with ledger index min {ledger_index_min} and max {ledger_index_max} and limit {limit}")
-        client = xrpl.clients.JsonRpcClient(self.network_url)
+        client = self.client
         all_transactions = []
         marker = None
         previous_marker = None
@@ -1391,8 +1723,7 @@ class PostFiatTaskManager:
 
         while iteration_count < max_iterations:
             iteration_count += 1
-            logger.debug(f"Iteration {iteration_count}")
-            print(f"current marker: {marker}")
+            logger.debug(f"Iteration {iteration_count}, marker: {marker}")
 
             request = AccountTx(
                 account=account_address,
@@ -1456,7 +1787,7 @@ class PostFiatTaskManager:
                                 max_attempts=3,
                                 retry_delay=.2):
 
-        client = xrpl.clients.JsonRpcClient(self.network_url)  # Using a public server; adjust as necessary
+        client = self.client
         all_transactions = []  # List to store all transactions
 
         # Fetch transactions using marker pagination
@@ -1554,7 +1885,8 @@ class PostFiatTaskManager:
 
         # Process the memo data to handle both encrypted and unencrypted links
         try:
-            link = self.process_memo_data(
+            link = self.get_processed_message(
+                tx_hash=most_recent_context_link['hash'],
                 memo_type=SystemMemoType.GOOGLE_DOC_CONTEXT_LINK.value,
                 memo_data=memo_data,
                 channel_counterparty=self.default_node
@@ -1581,15 +1913,8 @@ class PostFiatTaskManager:
         return list(all_user_initiation_rites['destination'])
     
     def initiation_rite_sent(self):
-        logger.debug("Checking if user has sent initiation rite...")
-
-        # Check if memos dataframe is empty or missing required columns
-        if self.memo_transactions.empty or not all(col in self.memo_transactions.columns for col in ['destination', 'memo_data']):
-            logger.debug("Memos dataframe is empty or missing required columns, returning False")
-            return False
-
-        user_initiation_rites_destinations = self.get_user_initiation_rites_destinations()
-        return self.default_node in user_initiation_rites_destinations
+        """Checks if the user has sent the initiation rite to the default node"""
+        return self.wallet_state_tracker.initiation_rite_sent
     
     def google_doc_sent(self):
         """Checks if the user has ever sent a google doc context link"""
@@ -1641,162 +1966,37 @@ class PostFiatTaskManager:
             encrypt=True  # Always encrypt Google Doc links
         )
 
+    def snapshot(self) -> 'PostFiatTaskManager':
+        """Returns a shallow copy of the task manager for computing grid data on another thread.
+        Dataframes are replaced rather than modified when transactions are added, so they are shared,
+        while the tables updated in place are copied so the snapshot stays consistent during later syncs"""
+        snapshot = copy.copy(self)
+        snapshot.task_states = self.task_states.copy()
+        snapshot.chunk_index = self.chunk_index.copy()
+        snapshot.handshake_cache = dict(self.handshake_cache)
+        return snapshot
+
     @requires_wallet_state(WalletState.ACTIVE)
     @PerformanceMonitor.measure('get_proposals_df')
     def get_proposals_df(self, include_refused=False):
-        """ This reduces tasks dataframe into a dataframe containing the columns task_id, proposal, and acceptance""" 
-
-        if self.tasks.empty:
-            return pd.DataFrame()
-
-        # Filter tasks with task_type in ['PROPOSAL','ACCEPTANCE']
-        filtered_tasks = self.tasks[self.tasks['task_type'].isin([
-            TaskType.PROPOSAL.name, 
-            TaskType.ACCEPTANCE.name,
-            TaskType.REFUSAL.name
-        ])]
-
-        # Get task_ids where:
-        # 1. The latest state is 'PROPOSAL' or 'ACCEPTANCE' (or REFUSAL if include_refused=True) AND
-        # 2. if include_refused=False, exclude tasks that have ever been refused
-        proposal_task_ids = []
-        valid_states = [TaskType.PROPOSAL.name, TaskType.ACCEPTANCE.name]
-        if include_refused:
-            valid_states.append(TaskType.REFUSAL.name)
-
-        for task_id in filtered_tasks['task_id'].unique():
-            task_df = self.get_task(task_id)
-            latest_state = self.get_task_state(task_df)
-            
-            if latest_state in valid_states:
-                if include_refused or TaskType.REFUSAL.name not in task_df['task_type'].values:
-                    proposal_task_ids.append(task_id)
-
-        # Filter for these tasks
-        filtered_df = self.tasks[(self.tasks['task_id'].isin(proposal_task_ids))].copy()
-
-        if filtered_df.empty:
-            return pd.DataFrame()
-
-        # Create new 'RESPONSE' column to combine acceptance and refusal
-        filtered_df['response_type'] = filtered_df['task_type'].apply(
-            lambda x: 'RESPONSE' if x in [TaskType.ACCEPTANCE.name, TaskType.REFUSAL.name] else x
-        )
-
-        # Pivot the dataframe to get proposals and responses side by side and reset index to make task_id a column
-        pivoted_df = filtered_df.pivot_table(index='task_id', columns='response_type', values='full_output', aggfunc='first').reset_index().copy()
-
-        # Rename the columns for clarity
-        pivoted_df.rename(columns={'REQUEST_POST_FIAT':'request', 'PROPOSAL':'proposal', 'RESPONSE':'response'}, inplace=True)
-
-        # Clean up the proposal column
-        pivoted_df['proposal'] = pivoted_df['proposal'].apply(lambda x: str(x).replace(TaskType.PROPOSAL.value,'').replace('nan',''))
-
-        # Clean up the request column
-        pivoted_df['request'] = pivoted_df['request'].apply(lambda x: str(x).replace(TaskType.REQUEST_POST_FIAT.value,'').replace('nan',''))
-        
-        # Clean up the response column, if it exists (does not exist for the first proposal)
-        if 'response' in pivoted_df.columns:
-            pivoted_df['response'] = pivoted_df['response'].apply(lambda x: str(x).replace(TaskType.ACCEPTANCE.value,'ACCEPTED: ').replace('nan',''))
-            pivoted_df['response'] = pivoted_df['response'].apply(lambda x: str(x).replace(TaskType.REFUSAL.value,'REFUSED: ').replace('nan',''))
-        else:
-            pivoted_df['response'] = ''
-        
-        # Reverse order to get the most recent proposals first
-        result_df = pivoted_df.iloc[::-1].reset_index(drop=True).copy()
-
-        return result_df
+        """ Returns a dataframe containing the columns task_id, request, proposal, and response for tasks
+        whose latest state is PROPOSAL or ACCEPTANCE (or REFUSAL if include_refused=True).
+        Tasks that have ever been refused are excluded unless include_refused=True""" 
+        return self.task_states.get_proposals(include_refused=include_refused)
     
     @requires_wallet_state(WalletState.ACTIVE)
     @PerformanceMonitor.measure('get_verification_df')
     def get_verification_df(self):
-        """ This reduces tasks dataframe into a dataframe containing the columns task_id, original_task, and verification""" 
-
-        if self.tasks.empty:
-            return pd.DataFrame()
-
-        # Filter tasks with task_type in ['PROPOSAL','VERIFICATION_PROMPT']
-        filtered_tasks = self.tasks[self.tasks['task_type'].isin([TaskType.PROPOSAL.name, TaskType.VERIFICATION_PROMPT.name])]
-
-        # Get task_ids where the latest state is 'VERIFICATION_PROMPT'
-        verification_task_ids = [
-            task_id for task_id in filtered_tasks['task_id'].unique()
-            if self.get_task_state_using_task_id(task_id) == TaskType.VERIFICATION_PROMPT.name
-        ]
-
-        # Filter for these tasks
-        filtered_df = self.tasks[(self.tasks['task_id'].isin(verification_task_ids))].copy()
-
-        if filtered_df.empty:
-            return pd.DataFrame()
-
-        # Pivot the dataframe to get proposals and verification prompts side by side and reset index to make task_id a column
-        pivoted_df = filtered_df.pivot_table(index='task_id', columns='task_type', values='full_output', aggfunc='first').reset_index().copy()
-
-        # Rename columns for clarity
-        pivoted_df.rename(columns={'PROPOSAL':'proposal', 'VERIFICATION_PROMPT':'verification'}, inplace=True)
-
-        # clean up the proposal and verification columns
-        pivoted_df['proposal'] = pivoted_df['proposal'].apply(lambda x: str(x).replace(TaskType.PROPOSAL.value,''))
-        pivoted_df['verification'] = pivoted_df['verification'].apply(lambda x: str(x).replace(TaskType.VERIFICATION_PROMPT.value,''))
-
-        # Reverse order to get the most recent proposals first
-        result_df = pivoted_df.iloc[::-1].reset_index(drop=True).copy()
-
-        return result_df
+        """ Returns a dataframe containing the columns task_id, proposal, and verification for tasks
+        whose latest state is VERIFICATION_PROMPT""" 
+        return self.task_states.get_verifications()
     
     @requires_wallet_state(WalletState.ACTIVE)
     @PerformanceMonitor.measure('get_rewards_df')
     def get_rewards_df(self):
-        """ This reduces tasks dataframe into a dataframe containing the columns task_id, proposal, and reward""" 
-
-        if self.tasks.empty:
-            return pd.DataFrame()
-
-        # Filter for only PROPOSAL and REWARD rows
-        filtered_df = self.tasks[self.tasks['task_type'].isin([TaskType.PROPOSAL.name, TaskType.REWARD.name])]
-
-        # Get task_ids where the latest state is 'REWARD'
-        reward_task_ids = [
-            task_id for task_id in filtered_df['task_id'].unique()
-            if self.get_task_state_using_task_id(task_id) == TaskType.REWARD.name
-        ]
-
-        # Filter for these tasks
-        filtered_df = self.tasks[(self.tasks['task_id'].isin(reward_task_ids))].copy()
-
-        if filtered_df.empty:
-            return pd.DataFrame()
-
-        # Pivot the dataframe to get proposals and rewards side by side and reset index to make task_id a column
-        pivoted_df = filtered_df.pivot_table(index='task_id', columns='task_type', values='full_output', aggfunc='first').reset_index().copy()
-
-        # Rename the columns for clarity # TODO: this seems pointless
-        pivoted_df.rename(columns={'PROPOSAL':'proposal', 'REWARD':'reward'}, inplace=True)
-
-        # Clean up the proposal and reward columns
-        pivoted_df['reward'] = pivoted_df['reward'].apply(lambda x: str(x).replace(TaskType.REWARD.value,''))
-        pivoted_df['proposal'] = pivoted_df['proposal'].apply(lambda x: str(x).replace(TaskType.PROPOSAL.value,'').replace('nan',''))
-
-        # Reverse order to get the most recent proposals first
-        result_df = pivoted_df.iloc[::-1].reset_index(drop=True).copy()
-
-        # Add PFT value information
-        pft_only = self.memo_transactions[self.memo_transactions['tx_json'].apply(is_pft_transaction)].copy()
-        pft_only['pft_value'] = pft_only['tx_json'].apply(
-            lambda x: x['DeliverMax']['value']).astype(float) * pft_only['direction'].map({'INCOMING':1,'OUTGOING':-1}
-        )
-        pft_only['task_id'] = pft_only['memo_data'].apply(lambda x: x['task_id'])
-        
-        pft_rewards_only = pft_only[pft_only['memo_data'].apply(lambda x: TaskType.REWARD.value in x['full_output'])].copy()
-        task_id_to_payout = pft_rewards_only.groupby('task_id').last()['pft_value']
-        
-        result_df['payout'] = result_df['task_id'].map(task_id_to_payout)
-
-        # Remove rows where payout is NaN
-        result_df = result_df[result_df['payout'].notna()].reset_index(drop=True).copy()
-
-        return result_df
+        """ Returns a dataframe containing the columns task_id, proposal, reward, and payout for tasks
+        whose latest state is REWARD""" 
+        return self.task_states.get_rewards()
     
     @requires_wallet_state(TRUSTLINED_STATES)
     @PerformanceMonitor.measure('get_payments_df')
@@ -1873,26 +2073,23 @@ class PostFiatTaskManager:
             logger.debug("No memos found")
             return pd.DataFrame()
         
-        processed_messages = []
-        for msg_id in memo_history['task_id'].unique():
-            msg_txns = memo_history[memo_history['task_id'] == msg_id]
-            first_txn = msg_txns.iloc[0]
+        first_txns = memo_history.drop_duplicates(subset=['task_id'])
+        first_txns = first_txns[['hash', 'task_id', 'full_output', 'counterparty_address', 'direction', 'datetime']].to_dict('records')
 
-            try:
-                # process the message (chunking, compression, encryption)
-                processed_message = self.process_memo_data(
-                    memo_type=msg_id,
-                    memo_data=first_txn['full_output'],
-                    full_unchunk=True,
-                    memo_history=memo_history,
-                    channel_counterparty=first_txn['counterparty_address']
-                )
-            except Exception as e:
-                logger.error(f"Error processing message {msg_id}: {e}")
-                processed_message = "[PROCESSING FAILED]"
+        # process the messages (chunking, compression, encryption) as one batch, or read them from the message cache
+        try:
+            processed_batch = self.get_processed_messages(
+                [(txn['hash'], txn['task_id'], txn['full_output'], txn['counterparty_address']) for txn in first_txns],
+                full_unchunk=True
+            )
+        except Exception as e:
+            logger.error(f"Error processing messages: {e}")
+            processed_batch = ["[PROCESSING FAILED]"] * len(first_txns)
 
+        processed_messages = []
+        for first_txn, processed_message in zip(first_txns, processed_batch):
             processed_messages.append({
-                'memo_id': msg_id,
+                'memo_id': first_txn['task_id'],
                 'memo': processed_message,
                 'direction': 'From' if first_txn['direction'] == 'INCOMING' else 'To',
                 'counterparty_address': first_txn['counterparty_address'],
@@ -2054,7 +2251,7 @@ class PostFiatTaskManager:
     ## WALLET UX POPULATION 
     def ux__1_get_user_pft_balance(self):
         """Returns the balance of PFT for the user."""
-        client = xrpl.clients.JsonRpcClient(self.network_url)
+        client = self.client
         account_lines = xrpl.models.requests.AccountLines(
             account=self.user_wallet.classic_address,
             ledger_index="validated"
@@ -2177,7 +2374,11 @@ class PostFiatTaskManager:
         return self.credential_manager.delete_contact(address)
     
     def get_explorer_transaction_url(self, tx_hash: str) -> str:
-        """Returns the appropriate explorer URL for a transaction based on network configuration"""
+        """Returns the appropriate explorer URL for a transaction based on network configuration.
+        Journaled transactions that never made it into a ledger link to the account instead"""
+        entry = self.transaction_journal.get(tx_hash)
+        if entry is not None and entry.status in (JournalStatus.REJECTED, JournalStatus.EXPIRED):
+            return self.get_explorer_account_url(self.user_wallet.address)
         template = self.network_config.explorer_tx_url_mask
         return template.format(hash=tx_hash)
     
@@ -2189,7 +2390,7 @@ class PostFiatTaskManager:
     def get_current_trust_limit(self):
         """Gets the current trust line limit for PFT token"""
         try:
-            client = xrpl.clients.JsonRpcClient(self.network_url)
+            client = self.client
             request = xrpl.models.requests.AccountLines(
                 account=self.user_wallet.address,
                 peer=self.pft_issuer
@@ -2215,7 +2416,7 @@ class PostFiatTaskManager:
     def has_trust_line(self):
         """ Checks if the user has a trust line to the PFT token"""
         try:
-            client = xrpl.clients.JsonRpcClient(self.network_url)
+            client = self.client
             request = xrpl.models.requests.AccountLines(
                 account=self.user_wallet.address,
                 peer=self.pft_issuer  # Only get trust lines with PFT issuer
@@ -2260,7 +2461,6 @@ class PostFiatTaskManager:
         Returns:
             Transaction response
         """
-        client = xrpl.clients.JsonRpcClient(self.network_url)
         trust_set_tx = xrpl.models.transactions.TrustSet(
             account=self.user_wallet.address,
             limit_amount=xrpl.models.amounts.issued_currency_amount.IssuedCurrencyAmount(
@@ -2271,10 +2471,11 @@ class PostFiatTaskManager:
         )
         logger.debug(f"Creating trust line from {self.user_wallet.address} to issuer...")
         try:
-            response = xrpl.transaction.submit_and_wait(trust_set_tx, client, self.user_wallet)
+            response = self.submit_and_wait(trust_set_tx)
         except xrpl.transaction.XRPLReliableSubmissionException as e:
             response = f"Submit failed: {e}"
             logger.error(f"Trust line creation failed: {response}")
+        self.wallet_state_tracker.invalidate_account()
         return response
 
 def is_over_1kb(value: Union[str, int, float]) -> bool:
@@ -2287,45 +2488,8 @@ def is_over_1kb(value: Union[str, int, float]) -> bool:
     else:
         raise TypeError(f"Expected string or number, got {type(value)}")
     
-def calculate_memo_size(memo_format: str, memo_type: str, memo_data: str) -> dict:
-    """
-    Calculates the size components of a memo using consistent logic.
-    
-    Args:
-        memo_format: The format field (usually username)
-        memo_type: The type field (usually task_id)
-        memo_data: The data field (the actual content)
-        
-    Returns:
-        dict: Size breakdown including:
-            - format_size: Size of hex-encoded format
-            - type_size: Size of hex-encoded type
-            - data_size: Size of hex-encoded data
-            - structural_overhead: Fixed overhead for JSON structure
-            - total_size: Total size including all components
-    """
-    format_size = len(str_to_hex(memo_format))
-    type_size = len(str_to_hex(memo_type))
-    data_size = len(str_to_hex(memo_data))
-    structural_overhead = constants.XRP_MEMO_STRUCTURAL_OVERHEAD
-
-    logger.debug(f"Memo size breakdown:")
-    logger.debug(f"  format_size: {format_size}")
-    logger.debug(f"  type_size: {type_size}")
-    logger.debug(f"  data_size: {data_size}")
-    logger.debug(f"  structural_overhead: {structural_overhead}")
-    logger.debug(f"  total_size: {format_size + type_size + data_size + structural_overhead}")
-
-    return {
-        'format_size': format_size,
-        'type_size': type_size,
-        'data_size': data_size,
-        'structural_overhead': structural_overhead,
-        'total_size': format_size + type_size + data_size + structural_overhead
-    }
-
 def to_hex(string):
-    return binascii.hexlify(string.encode()).decode()
+    return text_to_hex(string)
 
 def construct_handshake_memo(user, ecdh_public_key) -> str:
     return construct_memo(memo_format=user, memo_type=SystemMemoType.HANDSHAKE.value, memo_data=ecdh_public_key)
@@ -2341,18 +2505,16 @@ def construct_google_doc_context_memo(user, google_doc_link):
 
 def construct_memo(memo_format, memo_type, memo_data, validate_size=False):
     """Constructs a memo object, checking total size"""
-    # NOTE: This is a hack and appears too conservative
-    # NOTE: We don't know if this is the correct way calculate the XRPL size limits
-    # NOTE: This will raise an error even when a transaction might otherwise succeed
     if validate_size:
-        size_info = calculate_memo_size(memo_format, memo_type, memo_data)
-        if is_over_1kb(size_info['total_size']):
-            raise ValueError(f"Memo exceeds 1 KB, raising ValueError: {size_info['total_size']}")
+        # Measured as rippled does, on the memo serialized in binary format
+        total_size = serialized_memo_size(utf8_size(memo_format), utf8_size(memo_type), utf8_size(memo_data))
+        if total_size > constants.MAX_CHUNK_SIZE:
+            raise ValueError(f"Memo exceeds 1 KB, raising ValueError: {total_size}")
 
     # Convert to hex
-    hex_format = to_hex(memo_format)
-    hex_type = to_hex(memo_type)
-    hex_data = to_hex(memo_data)
+    hex_format = text_to_hex(memo_format)
+    hex_type = text_to_hex(memo_type)
+    hex_data = text_to_hex(memo_data)
 
     return Memo(
         memo_data=hex_data,
@@ -2360,8 +2522,7 @@ def construct_memo(memo_format, memo_type, memo_data, validate_size=False):
         memo_format=hex_format
     )
 
-def get_xrp_balance(network_url, address):
-    client = xrpl.clients.JsonRpcClient(network_url)
+def get_xrp_balance(client: xrpl.clients.JsonRpcClient, address):
     account_info = xrpl.models.requests.account_info.AccountInfo(
         account=address,
         ledger_index="validated"
@@ -2381,16 +2542,23 @@ def get_xrp_balance(network_url, address):
         logger.error(f"Exception when fetching XRP balance: {e}")
         return None
 
-def send_xrp(network_url, wallet: xrpl.wallet.Wallet, amount, destination, memo="", destination_tag=None):
-    client = xrpl.clients.JsonRpcClient(network_url)
-
+def send_xrp(
+        client: xrpl.clients.JsonRpcClient,
+        wallet: xrpl.wallet.Wallet,
+        amount,
+        destination,
+        memo="",
+        destination_tag=None,
+        watcher: Optional[ValidationWatcher] = None,
+        journal: Optional[TransactionJournal] = None
+    ):
     logger.debug(f"Sending {amount} XRP to {destination} with memo {memo}")
 
     # Handle memo
     if isinstance(memo, Memo):
         memos = [memo]
     elif isinstance(memo, str):
-        memos = [Memo(memo_data=str_to_hex(memo))]
+        memos = [Memo(memo_data=text_to_hex(memo))]
     else:
         logger.error("Memo is not a string or a Memo object, raising ValueError")
         raise ValueError("Memo must be either a string or a Memo object")
@@ -2407,16 +2575,10 @@ def send_xrp(network_url, wallet: xrpl.wallet.Wallet, amount, destination, memo=
     if destination_tag:
         payment_args['destination_tag'] = int(destination_tag)
     
-    # Sign the transaction to get the hash
-    # We need to derive the hash because the submit_and_wait function doesn't return a hash if transaction fails
-    # TODO: tx_hash currently not used because it doesn't match the hash produced by xrpl.transaction.submit_and_wait
-    # signed_tx = xrpl.transaction.sign(payment, wallet)
-    # tx_hash = signed_tx.get_hash()
-
     payment = xrpl.models.transactions.Payment(**payment_args)
 
     try:    
-        response = xrpl.transaction.submit_and_wait(payment, client, wallet)    
+        response = submit_and_confirm(payment, client, wallet, watcher, journal)
     except xrpl.transaction.XRPLReliableSubmissionException as e:
         logger.error(f"Transaction submission failed: {e}")
         raise
@@ -2452,6 +2614,108 @@ def is_pft_transaction(tx) -> bool:
     deliver_max = tx.get('DeliverMax', {})
     return isinstance(deliver_max, dict) and deliver_max.get('currency') == 'PFT'
 
+def get_balance_changes(meta: dict, address: str, pft_issuer: str) -> dict:
+    """Extracts an account's final XRP and PFT balances from transaction metadata (AffectedNodes).
+    Only balances modified by the transaction are included."""
+    balances = {}
+    for affected_node in meta.get('AffectedNodes', []):
+        node_type, node = next(iter(affected_node.items()))
+        fields = node.get('FinalFields') or node.get('NewFields') or {}
+        if node_type == 'DeletedNode':
+            fields = {}
+
+        if node.get('LedgerEntryType') == 'AccountRoot' and fields.get('Account') == address:
+            balances['xrp'] = fields['Balance']
+
+        elif node.get('LedgerEntryType') == 'RippleState':
+            balance = fields.get('Balance', {})
+            if not isinstance(balance, dict) or balance.get('currency') != 'PFT':
+                continue
+            low, high = fields['LowLimit']['issuer'], fields['HighLimit']['issuer']
+            # RippleState balances are from the low account's perspective
+            if low == address and high == pft_issuer:
+                balances['pft'] = float(balance['value'])
+            elif high == address and low == pft_issuer:
+                balances['pft'] = -float(balance['value'])
+
+    return balances
+
+def get_reward_payouts(memo_tx_df: pd.DataFrame) -> dict:
+    """Returns task_id -> signed PFT value of the latest reward payment in a memo transactions dataframe"""
+    payouts = {}
+    if memo_tx_df.empty:
+        return payouts
+
+    for tx_json, memo_data, direction in zip(memo_tx_df['tx_json'], memo_tx_df['memo_data'], memo_tx_df['direction']):
+        if not is_pft_transaction(tx_json) or TaskType.REWARD.value not in memo_data['full_output']:
+            continue
+        sign = 1 if direction == 'INCOMING' else -1
+        payouts[memo_data['task_id']] = float(tx_json['DeliverMax']['value']) * sign
+    return payouts
+
+def convert_ripple_timestamps_to_datetimes(ripple_timestamps) -> pd.DatetimeIndex:
+    """Vectorized equivalent of PostFiatTaskManager.convert_ripple_timestamp_to_datetime.
+    Returns naive datetimes in local time, matching datetime.datetime.fromtimestamp"""
+    unix_timestamps = np.asarray(ripple_timestamps, dtype='int64') + constants.RIPPLE_EPOCH_OFFSET
+
+    # UTC offsets only change on hour boundaries, so look them up once per distinct hour
+    hours, inverse = np.unique(unix_timestamps // 3600, return_inverse=True)
+    utc_offsets = np.array([time.localtime(int(hour) * 3600).tm_gmtoff for hour in hours], dtype='int64')
+
+    return pd.to_datetime(unix_timestamps + utc_offsets[inverse], unit='s')
+
+def extract_memo_transaction_columns(
+        tx_jsons: List[dict],
+        fallback_ledger_indexes: List[int],
+        wallet_address: str
+    ) -> dict:
+    """Extracts the memo transaction columns from raw transaction dicts in a single pass.
+
+    Args:
+        tx_jsons: tx_json dicts of transactions that contain memos
+        fallback_ledger_indexes: Root-level ledger indexes, used when tx_json has no ledger_index
+        wallet_address: The user's classic address, used to derive direction and counterparty
+
+    Returns:
+        dict: Column name -> values for memo_data, account, destination, direction,
+            counterparty_address, datetime, ledger_index and is_pft
+    """
+    count = len(tx_jsons)
+    accounts = [None] * count
+    destinations = [None] * count
+    directions = [None] * count
+    counterparties = [None] * count
+    ripple_timestamps = np.empty(count, dtype='int64')
+    ledger_indexes = np.empty(count, dtype='int64')
+    is_pft = np.empty(count, dtype=bool)
+
+    # All memo fields are hex-decoded in one pass
+    memo_data = decode_memo_fields(tx['Memos'][0]['Memo'] for tx in tx_jsons)
+    for i, (tx, fallback_ledger_index) in enumerate(zip(tx_jsons, fallback_ledger_indexes)):
+        account = tx['Account']
+        destination = tx['Destination']
+        accounts[i] = account
+        destinations[i] = destination
+        directions[i] = 'INCOMING' if destination == wallet_address else 'OUTGOING'
+        counterparties[i] = (destination + account).replace(wallet_address, '')
+
+        ripple_timestamps[i] = tx['date']
+        ledger_indexes[i] = int(tx.get('ledger_index', fallback_ledger_index))
+
+        deliver_max = tx.get('DeliverMax', {})
+        is_pft[i] = isinstance(deliver_max, dict) and deliver_max.get('currency') == 'PFT'
+
+    return {
+        'memo_data': memo_data,
+        'account': accounts,
+        'destination': destinations,
+        'direction': directions,
+        'counterparty_address': counterparties,
+        'datetime': convert_ripple_timestamps_to_datetimes(ripple_timestamps),
+        'ledger_index': ledger_indexes,
+        'is_pft': is_pft
+    }
+
 def generate_random_utf8_friendly_hash(length=6):
     # Generate a random sequence of bytes
     random_bytes = os.urandom(16)  # 16 bytes of randomness
@@ -2476,6 +2740,12 @@ def compress_string(input_string):
     except Exception as e:
         raise ValueError(f"Compression failed: {e}")
 
+def decompress_memo_payload(payload: str) -> str:
+    """Decompresses a memo payload if it carries a memo codec header or the legacy COMPRESSED__ prefix"""
+    if payload.startswith('COMPRESSED__'):
+        return decompress_string(payload.replace('COMPRESSED__', '', 1))
+    return decode_memo_payload(payload)
+
 def decompress_string(compressed_string):
     try:
         # Ensure correct padding for Base64 decoding
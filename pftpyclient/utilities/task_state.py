@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from pftpyclient.configuration.constants import TaskType
+
+class TaskStateTable:
+    """Per-task summary of the tasks dataframe, maintained incrementally as task rows are synced.
+
+    For each task_id it tracks the latest state, the first timestamp and output of each task type,
+    the first response (acceptance or refusal), whether the task was ever refused, and the reward payout.
+    Task ids are also bucketed by latest state, so the grid projections only touch the tasks they return.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, dict] = {}
+        self._task_ids_by_state: Dict[str, set] = {}
+        self._seen_hashes = set()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def clear(self):
+        self._tasks.clear()
+        self._task_ids_by_state.clear()
+        self._seen_hashes.clear()
+
+    def copy(self) -> 'TaskStateTable':
+        """Returns an independent copy, unaffected by task rows applied to this table afterwards"""
+        table = TaskStateTable()
+        table._tasks = {
+            task_id: {**task, 'state_datetimes': dict(task['state_datetimes']), 'outputs': dict(task['outputs'])}
+            for task_id, task in self._tasks.items()
+        }
+        table._task_ids_by_state = {state: set(task_ids) for state, task_ids in self._task_ids_by_state.items()}
+        table._seen_hashes = set(self._seen_hashes)
+        return table
+
+    def _new_task(self, task_id: str) -> dict:
+        return {
+            'task_id': task_id,
+            'latest_state': None,
+            'latest_datetime': None,
+            'state_datetimes': {},  # task type name -> first datetime
+            'outputs': {},  # task type name -> first full_output
+            'response': None,
+            'refused': False,
+            'payout': None
+        }
+
+    def _set_latest_state(self, task: dict, state: str, state_datetime):
+        old_state = task['latest_state']
+        if old_state is not None:
+            self._task_ids_by_state[old_state].discard(task['task_id'])
+        task['latest_state'] = state
+        task['latest_datetime'] = state_datetime
+        self._task_ids_by_state.setdefault(state, set()).add(task['task_id'])
+
+    def update(self, task_df: pd.DataFrame, payouts: Optional[Dict[str, float]] = None):
+        """Applies new task rows to the table.
+
+        Args:
+            task_df: New rows of the tasks dataframe (task_id, full_output, hash, datetime, task_type)
+            payouts: Optional task_id -> PFT payout for reward transactions in the same batch
+        """
+        if not task_df.empty:
+            ordered_df = task_df.sort_values('datetime', kind='stable')
+            for row in ordered_df[['task_id', 'full_output', 'hash', 'datetime', 'task_type']].itertuples(index=False):
+                if row.hash in self._seen_hashes:
+                    continue
+                self._seen_hashes.add(row.hash)
+
+                task = self._tasks.get(row.task_id)
+                if task is None:
+                    task = self._tasks[row.task_id] = self._new_task(row.task_id)
+
+                if task['latest_datetime'] is None or row.datetime >= task['latest_datetime']:
+                    self._set_latest_state(task, row.task_type, row.datetime)
+
+                first_seen = task['state_datetimes'].get(row.task_type)
+                if first_seen is None or row.datetime < first_seen:
+                    task['state_datetimes'][row.task_type] = row.datetime
+                    task['outputs'][row.task_type] = row.full_output
+
+                if row.task_type in (TaskType.ACCEPTANCE.name, TaskType.REFUSAL.name):
+                    if task['response'] is None or row.datetime < task['response'][0]:
+                        task['response'] = (row.datetime, row.full_output)
+                if row.task_type == TaskType.REFUSAL.name:
+                    task['refused'] = True
+
+        for task_id, payout in (payouts or {}).items():
+            task = self._tasks.get(task_id)
+            if task is None:
+                task = self._tasks[task_id] = self._new_task(task_id)
+            task['payout'] = payout
+
+    def get_latest_state(self, task_id: str) -> Optional[str]:
+        task = self._tasks.get(task_id)
+        return task['latest_state'] if task else None
+
+    def _tasks_in_states(self, states: Iterable[str]) -> List[dict]:
+        """Returns the tasks whose latest state is in states, most recent task_id first"""
+        task_ids = set()
+        for state in states:
+            task_ids.update(self._task_ids_by_state.get(state, ()))
+        return [self._tasks[task_id] for task_id in sorted(task_ids, reverse=True)]
+
+    @staticmethod
+    def _clean(output: Optional[str], task_type: TaskType, replacement: str = '') -> str:
+        return '' if output is None else str(output).replace(task_type.value, replacement)
+
+    def get_proposals(self, include_refused: bool = False) -> pd.DataFrame:
+        """Returns task_id, request, proposal and response for tasks awaiting or past a response"""
+        valid_states = [TaskType.PROPOSAL.name, TaskType.ACCEPTANCE.name]
+        if include_refused:
+            valid_states.append(TaskType.REFUSAL.name)
+
+        rows = []
+        for task in self._tasks_in_states(valid_states):
+            if task['refused'] and not include_refused:
+                continue
+            response = task['response'][1] if task['response'] else None
+            response = self._clean(response, TaskType.ACCEPTANCE, 'ACCEPTED: ').replace(TaskType.REFUSAL.value, 'REFUSED: ')
+            rows.append({
+                'task_id': task['task_id'],
+                'request': self._clean(task['outputs'].get(TaskType.REQUEST_POST_FIAT.name), TaskType.REQUEST_POST_FIAT),
+                'proposal': self._clean(task['outputs'].get(TaskType.PROPOSAL.name), TaskType.PROPOSAL),
+                'response': response
+            })
+
+        return pd.DataFrame(rows, columns=['task_id', 'request', 'proposal', 'response'])
+
+    def get_verifications(self) -> pd.DataFrame:
+        """Returns task_id, proposal and verification for tasks awaiting a verification response"""
+        rows = [
+            {
+                'task_id': task['task_id'],
+                'proposal': self._clean(task['outputs'].get(TaskType.PROPOSAL.name), TaskType.PROPOSAL),
+                'verification': self._clean(task['outputs'].get(TaskType.VERIFICATION_PROMPT.name), TaskType.VERIFICATION_PROMPT)
+            }
+            for task in self._tasks_in_states([TaskType.VERIFICATION_PROMPT.name])
+        ]
+        return pd.DataFrame(rows, columns=['task_id', 'proposal', 'verification'])
+
+    def get_rewards(self) -> pd.DataFrame:
+        """Returns task_id, proposal, reward and payout for rewarded tasks with a known payout"""
+        rows = [
+            {
+                'task_id': task['task_id'],
+                'proposal': self._clean(task['outputs'].get(TaskType.PROPOSAL.name), TaskType.PROPOSAL),
+                'reward': self._clean(task['outputs'].get(TaskType.REWARD.name), TaskType.REWARD),
+                'payout': task['payout']
+            }
+            for task in self._tasks_in_states([TaskType.REWARD.name])
+            if task['payout'] is not None
+        ]
+        return pd.DataFrame(rows, columns=['task_id', 'proposal', 'reward', 'payout'])
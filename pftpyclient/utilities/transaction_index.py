@@ -0,0 +1,268 @@
+import json
+import sqlite3
+import threading
+from typing import Optional
+
+import pandas as pd
+from loguru import logger
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS memo_transactions (
+    hash TEXT PRIMARY KEY,
+    ledger_index INTEGER,
+    datetime TEXT,
+    account TEXT,
+    destination TEXT,
+    direction TEXT,
+    counterparty_address TEXT,
+    is_pft INTEGER,
+    user TEXT,
+    task_id TEXT,
+    full_output TEXT,
+    validated INTEGER,
+    tx_json TEXT,
+    meta TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_memo_transactions_ledger_index ON memo_transactions (ledger_index);
+CREATE INDEX IF NOT EXISTS idx_memo_transactions_task_id ON memo_transactions (task_id);
+CREATE INDEX IF NOT EXISTS idx_memo_transactions_counterparty ON memo_transactions (counterparty_address);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    hash TEXT PRIMARY KEY,
+    task_id TEXT,
+    user TEXT,
+    full_output TEXT,
+    counterparty_address TEXT,
+    datetime TEXT,
+    task_type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_id ON tasks (task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_counterparty ON tasks (counterparty_address);
+
+CREATE TABLE IF NOT EXISTS memos (
+    hash TEXT PRIMARY KEY,
+    task_id TEXT,
+    user TEXT,
+    full_output TEXT,
+    counterparty_address TEXT,
+    datetime TEXT,
+    direction TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_memos_task_id ON memos (task_id);
+CREATE INDEX IF NOT EXISTS idx_memos_counterparty ON memos (counterparty_address);
+
+CREATE TABLE IF NOT EXISTS system_memos (
+    hash TEXT PRIMARY KEY,
+    task_id TEXT,
+    user TEXT,
+    full_output TEXT,
+    counterparty_address TEXT,
+    datetime TEXT,
+    direction TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_system_memos_task_id ON system_memos (task_id);
+CREATE INDEX IF NOT EXISTS idx_system_memos_counterparty ON system_memos (counterparty_address, direction);
+"""
+
+MEMO_TX_COLUMNS = [
+    'hash', 'ledger_index', 'datetime', 'account', 'destination', 'direction',
+    'counterparty_address', 'is_pft', 'user', 'task_id', 'full_output', 'validated', 'tx_json', 'meta'
+]
+TASK_COLUMNS = ['hash', 'task_id', 'user', 'full_output', 'counterparty_address', 'datetime', 'task_type']
+MEMO_COLUMNS = ['hash', 'task_id', 'user', 'full_output', 'counterparty_address', 'datetime', 'direction']
+SYSTEM_MEMO_COLUMNS = MEMO_COLUMNS
+
+class TransactionIndex:
+    """SQLite index of processed memo transactions, tasks, memos and system memos.
+
+    Rows are upserted by transaction hash as transactions are synced, so derived data survives
+    restarts without replaying the raw history, and lookups by task_id or counterparty use indexes.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._initialize_database()
+
+    def _initialize_database(self):
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = 'schema_version'").fetchone()
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO index_state (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+                )
+            elif int(row['value']) != SCHEMA_VERSION:
+                logger.warning(f"Transaction index schema version {row['value']} does not match {SCHEMA_VERSION}, rebuilding")
+                self._clear_tables()
+                self._conn.execute(
+                    "UPDATE index_state SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION),)
+                )
+
+    def _clear_tables(self):
+        for table in ['memo_transactions', 'tasks', 'memos', 'system_memos']:
+            self._conn.execute(f"DELETE FROM {table}")
+        self._conn.execute("DELETE FROM index_state WHERE key = 'last_ledger_index'")
+
+    def clear(self):
+        """Deletes all indexed rows"""
+        with self._lock, self._conn:
+            self._clear_tables()
+
+    def close(self):
+        """Closes the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def get_last_ledger_index(self) -> Optional[int]:
+        """Returns the highest ledger index of the raw transaction history that has been indexed"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_state WHERE key = 'last_ledger_index'").fetchone()
+        return int(row['value']) if row else None
+
+    def set_last_ledger_index(self, ledger_index: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_state (key, value) VALUES ('last_ledger_index', ?)", (str(int(ledger_index)),)
+            )
+
+    # Serialization helpers
+
+    @staticmethod
+    def _to_text(value):
+        if value is None or (not isinstance(value, (dict, list)) and pd.isna(value)):
+            return None
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
+
+    def _upsert(self, table, columns, records):
+        if not records:
+            return
+        placeholders = ', '.join('?' for _ in columns)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                records
+            )
+
+    def _query(self, sql, params=()) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame([dict(row) for row in rows])
+        if 'datetime' in df.columns:
+            df['datetime'] = pd.to_datetime(df['datetime'])
+        return df
+
+    # Upserts
+
+    def upsert_memo_transactions(self, memo_tx_df: pd.DataFrame):
+        records = []
+        for row in memo_tx_df.to_dict('records'):
+            memo_data = row.get('memo_data') or {}
+            records.append((
+                row['hash'],
+                int(row['ledger_index']),
+                self._to_text(row.get('datetime')),
+                row.get('account'),
+                row.get('destination'),
+                row.get('direction'),
+                row.get('counterparty_address'),
+                int(bool(row.get('is_pft'))),
+                self._to_text(memo_data.get('user')),
+                self._to_text(memo_data.get('task_id')),
+                self._to_text(memo_data.get('full_output')),
+                int(bool(row.get('validated', True))),
+                self._to_text(row.get('tx_json')),
+                self._to_text(row.get('meta')),
+            ))
+        self._upsert('memo_transactions', MEMO_TX_COLUMNS, records)
+
+    def _upsert_memo_frame(self, table, columns, df: pd.DataFrame):
+        records = [
+            tuple(self._to_text(row.get(col)) for col in columns)
+            for row in df.to_dict('records')
+        ]
+        self._upsert(table, columns, records)
+
+    def upsert_tasks(self, task_df: pd.DataFrame):
+        self._upsert_memo_frame('tasks', TASK_COLUMNS, task_df)
+
+    def upsert_memos(self, memo_df: pd.DataFrame):
+        self._upsert_memo_frame('memos', MEMO_COLUMNS, memo_df)
+
+    def upsert_system_memos(self, system_memo_df: pd.DataFrame):
+        self._upsert_memo_frame('system_memos', SYSTEM_MEMO_COLUMNS, system_memo_df)
+
+    # Frame loaders, used to restore the in-memory frames on startup
+
+    def load_memo_transactions(self) -> pd.DataFrame:
+        df = self._query(f"SELECT {', '.join(MEMO_TX_COLUMNS)} FROM memo_transactions ORDER BY ledger_index")
+        if df.empty:
+            return df
+        df['tx_json'] = [json.loads(x) if x else {} for x in df['tx_json']]
+        df['meta'] = [json.loads(x) if x else {} for x in df['meta']]
+        df['memo_data'] = [
+            {'user': user, 'task_id': task_id, 'full_output': full_output}
+            for user, task_id, full_output in zip(df['user'], df['task_id'], df['full_output'])
+        ]
+        df['is_pft'] = df['is_pft'].astype(bool)
+        df['validated'] = df['validated'].astype(bool)
+        df['has_memos'] = True
+        return df.drop(columns=['user', 'task_id', 'full_output'])
+
+    def load_tasks(self) -> pd.DataFrame:
+        return self._query(f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY datetime")
+
+    def load_memos(self) -> pd.DataFrame:
+        return self._query(f"SELECT {', '.join(MEMO_COLUMNS)} FROM memos ORDER BY datetime")
+
+    def load_system_memos(self) -> pd.DataFrame:
+        return self._query(f"SELECT {', '.join(SYSTEM_MEMO_COLUMNS)} FROM system_memos ORDER BY datetime")
+
+    # Indexed lookups
+
+    def get_task(self, task_id: str) -> pd.DataFrame:
+        return self._query(
+            f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE task_id = ? ORDER BY datetime",
+            (task_id,)
+        )
+
+    def get_memo(self, memo_id: str) -> pd.DataFrame:
+        """Returns all chunks of a memo. The memo ID is stored in the task_id column (MemoType)"""
+        return self._query(
+            f"SELECT {', '.join(MEMO_COLUMNS)} FROM memos WHERE task_id = ? ORDER BY datetime",
+            (memo_id,)
+        )
+
+    def get_handshake(self, address: str, handshake_type: str) -> tuple[bool, Optional[str]]:
+        """Returns (handshake_sent, latest_received_key) for a counterparty address"""
+        pattern = f"%{handshake_type}%"
+        with self._lock:
+            sent = self._conn.execute(
+                """SELECT 1 FROM system_memos
+                WHERE counterparty_address = ? AND direction = 'OUTGOING' AND task_id LIKE ?
+                LIMIT 1""",
+                (address, pattern)
+            ).fetchone()
+            received = self._conn.execute(
+                """SELECT full_output FROM system_memos
+                WHERE counterparty_address = ? AND direction = 'INCOMING' AND task_id LIKE ?
+                ORDER BY datetime DESC LIMIT 1""",
+                (address, pattern)
+            ).fetchone()
+        return sent is not None, (received['full_output'] if received else None)
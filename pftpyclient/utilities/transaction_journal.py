@@ -0,0 +1,188 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set
+
+from xrpl.models.transactions.transaction import Transaction
+from loguru import logger
+
+import pftpyclient.configuration.constants as constants
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbound_transactions (
+    hash TEXT PRIMARY KEY,
+    intent TEXT NOT NULL,
+    sequence INTEGER,
+    last_ledger_sequence INTEGER,
+    tx_blob TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    ledger_index INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbound_transactions_intent ON outbound_transactions (intent);
+"""
+
+# Fields filled in by autofill and signing, which differ between attempts at the same transaction
+SIGNING_FIELDS = {'Sequence', 'Fee', 'LastLedgerSequence', 'NetworkID', 'SigningPubKey', 'TxnSignature', 'TicketSequence'}
+
+class JournalStatus(Enum):
+    SIGNED = "signed"  # persisted before submission, not yet known to have reached a server
+    SUBMITTED = "submitted"  # passed a server's preliminary checks, or submission failed in a way that may have reached one
+    VALIDATED = "validated"  # included in a validated ledger, with result holding its tes or tec code
+    REJECTED = "rejected"  # malformed, so it can never validate
+    EXPIRED = "expired"  # a ledger past its LastLedgerSequence validated without it
+
+UNRESOLVED_STATUSES = (JournalStatus.SIGNED, JournalStatus.SUBMITTED)
+
+def transaction_intent(transaction: Transaction) -> str:
+    """Returns a key identifying what a transaction does, independent of its Sequence, fee and signature,
+    so attempts at sending the same transaction can be matched"""
+    fields = {key: value for key, value in transaction.to_xrpl().items() if key not in SIGNING_FIELDS}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
+
+@dataclass
+class JournalEntry:
+    hash: str
+    intent: str
+    sequence: int
+    last_ledger_sequence: int
+    tx_blob: str
+    status: JournalStatus
+    result: Optional[str] = None  # engine result of the submission, or the final result once validated
+    ledger_index: Optional[int] = None
+    created_at: float = 0.0
+
+    @property
+    def is_unresolved(self) -> bool:
+        return self.status in UNRESOLVED_STATUSES
+
+class TransactionJournal:
+    """Persistent journal of signed outbound transactions, keyed by the hash computed when they were signed.
+
+    Each transaction is recorded before it is submitted, so if the submission fails or the client exits
+    without learning the outcome, the same signed blob can be resubmitted instead of signing a new
+    transaction with a fresh Sequence. Since both attempts share a Sequence, at most one can validate.
+    Outcomes are reconciled from submission results, the websocket stream and account_tx history.
+    Entries are kept in memory for lookup by hash, and resolved entries are pruned after
+    TRANSACTION_JOURNAL_RETENTION_DAYS.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        cutoff = time.time() - constants.TRANSACTION_JOURNAL_RETENTION_DAYS * 86400
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(
+                f"DELETE FROM outbound_transactions WHERE created_at < ? AND status NOT IN ({', '.join('?' * len(UNRESOLVED_STATUSES))})",
+                (cutoff, *(status.value for status in UNRESOLVED_STATUSES))
+            )
+            rows = self._conn.execute(
+                "SELECT hash, intent, sequence, last_ledger_sequence, tx_blob, status, result, ledger_index, created_at "
+                "FROM outbound_transactions ORDER BY created_at"
+            ).fetchall()
+        self._entries: Dict[str, JournalEntry] = {
+            row[0]: JournalEntry(*row[:5], JournalStatus(row[5]), *row[6:]) for row in rows
+        }
+        unresolved = len(self.unresolved())
+        logger.debug(f"Loaded {len(self._entries)} journaled transactions ({unresolved} unresolved) from {self.db_path}")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, tx_hash):
+        return tx_hash in self._entries
+
+    def get(self, tx_hash: str) -> Optional[JournalEntry]:
+        return self._entries.get(tx_hash)
+
+    def record(self, signed_transaction: Transaction, intent: str) -> JournalEntry:
+        """Persists a signed transaction. Must be called before the transaction is submitted"""
+        entry = JournalEntry(
+            hash=signed_transaction.get_hash(),
+            intent=intent,
+            sequence=signed_transaction.sequence,
+            last_ledger_sequence=signed_transaction.last_ledger_sequence,
+            tx_blob=signed_transaction.blob(),
+            status=JournalStatus.SIGNED,
+            created_at=time.time()
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO outbound_transactions "
+                "(hash, intent, sequence, last_ledger_sequence, tx_blob, status, result, ledger_index, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.hash, entry.intent, entry.sequence, entry.last_ledger_sequence, entry.tx_blob,
+                 entry.status.value, entry.result, entry.ledger_index, entry.created_at)
+            )
+        self._entries[entry.hash] = entry
+        return entry
+
+    def update(self, tx_hash: str, status: JournalStatus, result: Optional[str] = None, ledger_index: Optional[int] = None):
+        """Records what is known about a transaction's outcome. A validated entry is final and is not changed"""
+        entry = self._entries.get(tx_hash)
+        if entry is None or entry.status == JournalStatus.VALIDATED:
+            return
+        entry.status = status
+        entry.result = result or entry.result
+        entry.ledger_index = ledger_index or entry.ledger_index
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbound_transactions SET status = ?, result = ?, ledger_index = ? WHERE hash = ?",
+                (entry.status.value, entry.result, entry.ledger_index, tx_hash)
+            )
+
+    def unresolved(self) -> List[JournalEntry]:
+        """Returns the entries whose outcome is not yet known, oldest first"""
+        return [entry for entry in self._entries.values() if entry.is_unresolved]
+
+    def unresolved_hashes(self) -> Set[str]:
+        return {entry.hash for entry in self._entries.values() if entry.is_unresolved}
+
+    def find_unresolved(self, intent: str) -> Optional[JournalEntry]:
+        """Returns the latest attempt at a transaction whose outcome is not yet known"""
+        for entry in reversed(list(self._entries.values())):
+            if entry.intent == intent and entry.is_unresolved:
+                return entry
+        return None
+
+    def reconcile(self, transactions: Iterable[dict]) -> int:
+        """Marks journaled transactions found among validated transactions (websocket messages or account_tx
+        entries, with hash, meta and ledger_index keys) as validated. Returns the number of entries resolved"""
+        resolved = 0
+        for transaction in transactions:
+            entry = self._entries.get(transaction.get('hash'))
+            if entry is None or not entry.is_unresolved or transaction.get('validated') is False:
+                continue
+            meta = transaction.get('meta')
+            result = meta.get('TransactionResult') if isinstance(meta, dict) else None
+            self.update(entry.hash, JournalStatus.VALIDATED, result, transaction.get('ledger_index'))
+            resolved += 1
+        if resolved:
+            logger.debug(f"Reconciled {resolved} journaled transactions")
+        return resolved
+
+    def expire(self, validated_ledger: int) -> int:
+        """Marks unresolved transactions whose LastLedgerSequence is before validated_ledger as expired.
+        Only call this once every transaction validated up to validated_ledger has been reconciled.
+        Returns the number of entries expired"""
+        expired = [
+            entry for entry in self.unresolved()
+            if entry.last_ledger_sequence is not None and entry.last_ledger_sequence < validated_ledger
+        ]
+        for entry in expired:
+            self.update(entry.hash, JournalStatus.EXPIRED)
+        if expired:
+            logger.debug(f"Expired {len(expired)} journaled transactions before ledger {validated_ledger}")
+        return len(expired)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
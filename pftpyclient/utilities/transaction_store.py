@@ -0,0 +1,222 @@
+import os
+import json
+import shutil
+from typing import Optional, List
+
+import pandas as pd
+from loguru import logger
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_COMPACTION_THRESHOLD = 16  # number of segments that triggers a compaction
+
+# Nested columns are stored as JSON text so that segments have a flat, stable schema
+JSON_COLUMNS = ['tx_json', 'meta']
+
+class SegmentedTransactionStore:
+    """Append-only on-disk store for raw XRPL account transactions.
+
+    Transactions are written as immutable Parquet segments, each covering a ledger range.
+    A small JSON manifest lists the live segments and their ledger ranges, so the latest
+    known ledger can be read without touching any segment. New transactions are appended
+    as new segments and the segments are periodically compacted into one.
+    """
+
+    def __init__(self, directory: str, compaction_threshold: int = DEFAULT_COMPACTION_THRESHOLD):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        self.compaction_threshold = compaction_threshold
+        self.manifest = self._load_manifest()
+
+    def _empty_manifest(self) -> dict:
+        return {'version': MANIFEST_VERSION, 'next_segment_id': 0, 'segments': []}
+
+    def _load_manifest(self) -> dict:
+        """Loads the manifest from disk, or returns an empty manifest if none exists"""
+        if not os.path.exists(self.manifest_path):
+            return self._empty_manifest()
+
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != MANIFEST_VERSION:
+                logger.warning(f"Unsupported transaction store manifest version {manifest.get('version')}, ignoring store")
+                return self._empty_manifest()
+            return manifest
+        except (IOError, ValueError) as e:
+            logger.error(f"Error reading transaction store manifest {self.manifest_path}: {e}")
+            return self._empty_manifest()
+
+    def _save_manifest(self):
+        """Atomically replaces the manifest on disk"""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    @property
+    def segments(self) -> List[dict]:
+        return self.manifest['segments']
+
+    def is_empty(self) -> bool:
+        return len(self.segments) == 0
+
+    def get_ledger_range(self) -> Optional[tuple[int, int]]:
+        """Returns the (min, max) ledger index covered by the store, read from the manifest only"""
+        if self.is_empty():
+            return None
+        return (
+            min(segment['min_ledger'] for segment in self.segments),
+            max(segment['max_ledger'] for segment in self.segments)
+        )
+
+    def get_transaction_count(self) -> int:
+        """Returns the number of rows across all segments (may include duplicates until compaction)"""
+        return sum(segment['rows'] for segment in self.segments)
+
+    @staticmethod
+    def _serialize(df: pd.DataFrame) -> pd.DataFrame:
+        """Converts nested columns to JSON text"""
+        df = df.copy()
+        for col in JSON_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].apply(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else None)
+        if 'ledger_index' in df.columns:
+            df['ledger_index'] = df['ledger_index'].astype('int64')
+        return df
+
+    @staticmethod
+    def _deserialize(df: pd.DataFrame) -> pd.DataFrame:
+        """Converts JSON text columns back to python objects"""
+        for col in JSON_COLUMNS:
+            if col in df.columns:
+                df[col] = [json.loads(x) if isinstance(x, str) else x for x in df[col]]
+        return df
+
+    def _write_segment(self, df: pd.DataFrame) -> dict:
+        """Writes a single segment file and returns its manifest entry"""
+        os.makedirs(self.directory, exist_ok=True)
+
+        segment_id = self.manifest['next_segment_id']
+        min_ledger = int(df['ledger_index'].min())
+        max_ledger = int(df['ledger_index'].max())
+        filename = f"segment_{segment_id:06d}_{min_ledger}_{max_ledger}.parquet"
+        final_path = os.path.join(self.directory, filename)
+        temp_path = f"{final_path}.tmp"
+
+        self._serialize(df).to_parquet(temp_path, index=False)
+        os.replace(temp_path, final_path)
+
+        self.manifest['next_segment_id'] = segment_id + 1
+        return {
+            'file': filename,
+            'min_ledger': min_ledger,
+            'max_ledger': max_ledger,
+            'rows': len(df)
+        }
+
+    def append(self, new_tx_df: pd.DataFrame) -> bool:
+        """Appends new transactions as a new segment. Compacts the store if it has too many segments.
+
+        Args:
+            new_tx_df: DataFrame of raw transactions (hash, ledger_index, tx_json, meta, ...)
+
+        Returns:
+            bool: True if a segment was written
+        """
+        if new_tx_df is None or new_tx_df.empty:
+            return False
+
+        new_tx_df = new_tx_df.drop(columns=['has_memos'], errors='ignore').drop_duplicates(subset=['hash'])
+        entry = self._write_segment(new_tx_df)
+        self.segments.append(entry)
+        self._save_manifest()
+        logger.debug(f"Appended segment {entry['file']} with {entry['rows']} transactions")
+
+        if len(self.segments) >= self.compaction_threshold:
+            self.compact()
+
+        return True
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Loads transactions from all segments, deduplicated by hash.
+
+        Args:
+            columns: Optional list of columns to read. Only the requested columns are read from disk,
+                and JSON columns are only decoded if requested.
+        """
+        if self.is_empty():
+            return pd.DataFrame()
+
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys(['hash', *columns]))
+
+        frames = []
+        for segment in self.segments:
+            path = os.path.join(self.directory, segment['file'])
+            frames.append(pd.read_parquet(path, columns=read_columns))
+
+        tx_df = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['hash'], ignore_index=True)
+        if columns is not None and 'hash' not in columns:
+            tx_df = tx_df.drop(columns=['hash'])
+
+        return self._deserialize(tx_df)
+
+    def compact(self):
+        """Merges all segments into a single segment sorted by ledger index"""
+        if len(self.segments) <= 1:
+            return
+
+        old_segments = list(self.segments)
+        logger.debug(f"Compacting {len(old_segments)} transaction segments")
+
+        frames = [
+            pd.read_parquet(os.path.join(self.directory, segment['file']))
+            for segment in old_segments
+        ]
+        merged = (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(subset=['hash'])
+            .sort_values('ledger_index', kind='stable')
+        )
+
+        # Segments are already serialized, so write directly instead of going through _write_segment
+        segment_id = self.manifest['next_segment_id']
+        min_ledger = int(merged['ledger_index'].min())
+        max_ledger = int(merged['ledger_index'].max())
+        filename = f"segment_{segment_id:06d}_{min_ledger}_{max_ledger}.parquet"
+        final_path = os.path.join(self.directory, filename)
+        temp_path = f"{final_path}.tmp"
+        merged.to_parquet(temp_path, index=False)
+        os.replace(temp_path, final_path)
+
+        self.manifest['next_segment_id'] = segment_id + 1
+        self.manifest['segments'] = [{
+            'file': filename,
+            'min_ledger': min_ledger,
+            'max_ledger': max_ledger,
+            'rows': len(merged)
+        }]
+        self._save_manifest()
+
+        # Old segments are only removed once the new manifest is in place
+        for segment in old_segments:
+            try:
+                os.remove(os.path.join(self.directory, segment['file']))
+            except OSError as e:
+                logger.warning(f"Could not remove compacted segment {segment['file']}: {e}")
+
+        logger.debug(f"Compacted transaction store into {filename} ({len(merged)} transactions)")
+
+    def rewrite(self, tx_df: pd.DataFrame):
+        """Replaces the entire contents of the store with a single segment"""
+        self.clear()
+        self.append(tx_df)
+
+    def clear(self):
+        """Deletes all segments and the manifest"""
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+        self.manifest = self._empty_manifest()
@@ -1,7 +1,10 @@
 from enum import Enum
 from functools import wraps
+from typing import Optional
 from loguru import logger
 
+from pftpyclient.configuration.constants import SystemMemoType
+
 class WalletState(Enum):
     UNFUNDED = "unfunded"                       # XRP address exists but not activated on XRPL
     FUNDED = "funded"                           # XRP address activated on XRPL
@@ -48,4 +51,83 @@ def requires_wallet_state(required_states):
                 return
             return func(self, *args, **kwargs)
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+class WalletStateTracker:
+    """Flags that determine the wallet state, maintained as the account and memo transactions change.
+
+    Account flags (funded, trust line) come from a single AccountInfo + AccountLines probe, which is only
+    repeated after a transaction touches the account (invalidate_account). Memo flags are updated from
+    each batch of new memo transactions, so deriving the state never rescans the memo dataframes.
+    """
+
+    def __init__(self, node_address: str):
+        self.node_address = node_address
+        self.funded = False
+        self.trust_line = False
+        self.account_stale = True
+        self.clear_memos()
+
+    def clear_memos(self):
+        self.initiation_rite_sent = False
+        self.handshake_sent = False
+        self.handshake_received = False
+        self.google_doc_sent = False
+
+    def invalidate_account(self):
+        """Marks the account flags as out of date, so the next state check probes the account again"""
+        self.account_stale = True
+
+    def update_account(self, account_data: Optional[dict], trust_lines: list):
+        """Sets the account flags from AccountInfo account_data (None if the account does not exist)
+        and the account's AccountLines with the PFT issuer"""
+        self.funded = account_data is not None and int(account_data.get('Balance', 0)) > 0
+        self.trust_line = any(line.get('currency') == 'PFT' for line in trust_lines)
+        self.account_stale = False
+
+    def update_memos(self, memo_tx_df) -> bool:
+        """Updates the memo flags from new rows of the memo_transactions dataframe.
+
+        Returns:
+            bool: True if any flag changed
+        """
+        if memo_tx_df.empty or 'memo_data' not in memo_tx_df.columns:
+            return False
+
+        before = self.memo_flags
+        for memo_data, destination, counterparty, direction in zip(
+            memo_tx_df['memo_data'], memo_tx_df['destination'],
+            memo_tx_df['counterparty_address'], memo_tx_df['direction']
+        ):
+            task_id = str(memo_data.get('task_id', '')) if isinstance(memo_data, dict) else ''
+            if task_id == SystemMemoType.INITIATION_RITE.value and destination == self.node_address:
+                self.initiation_rite_sent = True
+            elif SystemMemoType.HANDSHAKE.value in task_id and counterparty == self.node_address:
+                if direction == 'OUTGOING':
+                    self.handshake_sent = True
+                elif direction == 'INCOMING':
+                    self.handshake_received = True
+            elif task_id == SystemMemoType.GOOGLE_DOC_CONTEXT_LINK.value and direction == 'OUTGOING':
+                self.google_doc_sent = True
+        return self.memo_flags != before
+
+    @property
+    def memo_flags(self) -> tuple:
+        return (self.initiation_rite_sent, self.handshake_sent, self.handshake_received, self.google_doc_sent)
+
+    def derive_state(self) -> WalletState:
+        """Returns the furthest wallet state whose requirements, and those of every earlier state, are met"""
+        requirements = [
+            (WalletState.FUNDED, self.funded),
+            (WalletState.TRUSTLINED, self.trust_line),
+            (WalletState.INITIATED, self.initiation_rite_sent),
+            (WalletState.HANDSHAKE_SENT, self.handshake_sent),
+            (WalletState.HANDSHAKE_RECEIVED, self.handshake_received),
+            (WalletState.ACTIVE, self.google_doc_sent),
+        ]
+        state = WalletState.UNFUNDED
+        for next_state, met in requirements:
+            if not met:
+                break
+            state = next_state
+        return state
@@ -0,0 +1,206 @@
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import wx
+import wx.grid as gridlib
+from loguru import logger
+
+from pftpyclient.utilities.grid_diff import GridDiff
+
+class DataFrameGridTable(gridlib.GridTableBase):
+    """Virtual grid table that reads cell values directly from a DataFrame.
+
+    Values are converted to strings only when the grid draws them, all cells of a column share one
+    attribute (and its wrapping renderer), and rows are kept at a default height until they are
+    measured by size_visible_rows. Rows are identified by key_column so a selection can be restored
+    after the data is replaced.
+    """
+
+    def __init__(self, columns: List[Tuple[str, str, int]], key_column: Optional[str] = None):
+        super().__init__()
+        self.columns = columns  # (column id, label, width), as in WalletApp.GRID_CONFIGS
+        self.key_column = key_column
+        self.data = pd.DataFrame()
+        self._values: List[Optional[np.ndarray]] = [None] * len(columns)
+        self._keys: Optional[np.ndarray] = None
+        self.measured_rows = set()  # rows whose height has been fitted to their content
+
+        self.column_renderers = [gridlib.GridCellAutoWrapStringRenderer() for _ in columns]
+        self.column_attrs = []
+        for renderer in self.column_renderers:
+            attr = gridlib.GridCellAttr()
+            renderer.IncRef()  # the attribute takes a reference, the table keeps its own
+            attr.SetRenderer(renderer)
+            attr.SetReadOnly(True)
+            self.column_attrs.append(attr)
+
+    def GetNumberRows(self):
+        return len(self.data)
+
+    def GetNumberCols(self):
+        return len(self.columns)
+
+    def GetColLabelValue(self, col):
+        return self.columns[col][1]
+
+    def IsEmptyCell(self, row, col):
+        return self._values[col] is None
+
+    def GetValue(self, row, col):
+        values = self._values[col]
+        if values is None or row >= len(values):
+            return ""
+        return str(values[row])
+
+    def SetValue(self, row, col, value):
+        pass  # read-only
+
+    def GetAttr(self, row, col, kind):
+        attr = self.column_attrs[col]
+        attr.IncRef()
+        return attr
+
+    def get_key(self, row: int) -> Any:
+        """Returns the key of a row, or None if the table has no key column"""
+        if self._keys is None or not 0 <= row < len(self._keys):
+            return None
+        return self._keys[row]
+
+    def find_row(self, key: Any) -> Optional[int]:
+        """Returns the first row with the given key, or None"""
+        if self._keys is None or key is None:
+            return None
+        matches = np.flatnonzero(self._keys == key)
+        return int(matches[0]) if len(matches) else None
+
+    def set_data(self, data: pd.DataFrame, grid_name: str = ""):
+        """Replaces the table's data and notifies the grid of the change in row count"""
+        old_rows = self.GetNumberRows()
+        self._load(data, grid_name)
+        self.measured_rows.clear()
+
+        grid = self.GetView()
+        if grid is None:
+            return
+        new_rows = self.GetNumberRows()
+        grid.BeginBatch()
+        if new_rows < old_rows:
+            grid.ProcessTableMessage(
+                gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_DELETED, new_rows, old_rows - new_rows)
+            )
+        elif new_rows > old_rows:
+            grid.ProcessTableMessage(
+                gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_APPENDED, new_rows - old_rows)
+            )
+        grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_REQUEST_VIEW_GET_VALUES))
+        grid.EndBatch()
+
+    def apply_diff(self, data: pd.DataFrame, diff: GridDiff, grid_name: str = ""):
+        """Replaces the table's data with a new result that differs from it by diff, notifying the grid
+        of only the removed, inserted and updated rows. Kept rows keep their measured heights"""
+        self._load(data, grid_name)
+        updated = set(diff.updated)
+        self.measured_rows = {
+            diff.kept[row] for row in self.measured_rows
+            if row in diff.kept and diff.kept[row] not in updated
+        }
+
+        grid = self.GetView()
+        if grid is None:
+            return
+        grid.BeginBatch()
+        # Removals run from the bottom up, so earlier positions are unaffected, and insertions from the top
+        # down, so each position already has every row above it in place
+        for start, count in reversed(_runs(diff.removed)):
+            grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_DELETED, start, count))
+        for start, count in _runs(diff.inserted):
+            grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_INSERTED, start, count))
+        for start, count in _runs(diff.updated):
+            grid.RefreshBlock(start, 0, start + count - 1, self.GetNumberCols() - 1)
+        grid.EndBatch()
+
+    def _load(self, data: pd.DataFrame, grid_name: str):
+        self.data = data.reset_index(drop=True)
+        self._values = []
+        for col_id, _, _ in self.columns:
+            if col_id in self.data.columns:
+                self._values.append(self.data[col_id].to_numpy())
+            else:
+                if not self.data.empty:
+                    logger.error(f"Column {col_id} not found in data for {grid_name}")
+                self._values.append(None)
+        if self.key_column is not None and self.key_column in self.data.columns:
+            self._keys = self.data[self.key_column].to_numpy()
+        else:
+            self._keys = None
+
+def _runs(positions: List[int]) -> List[Tuple[int, int]]:
+    """Groups ascending positions into (start, count) runs of consecutive positions"""
+    runs = []
+    for position in positions:
+        if runs and runs[-1][0] + runs[-1][1] == position:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((position, 1))
+    return runs
+
+def get_scroll_anchor(grid: gridlib.Grid) -> Optional[Tuple[Any, int]]:
+    """Returns the key of the top visible row and how far the view is scrolled past its top edge"""
+    table = grid.GetTable()
+    rows = visible_rows(grid)
+    if not isinstance(table, DataFrameGridTable) or not rows:
+        return None
+    _, top = grid.CalcUnscrolledPosition(0, 0)
+    return table.get_key(rows[0]), top - grid.CellToRect(rows[0], 0).GetTop()
+
+def restore_scroll_anchor(grid: gridlib.Grid, anchor: Optional[Tuple[Any, int]]):
+    """Scrolls so the anchored row is back where it was, after rows were inserted or removed above it"""
+    table = grid.GetTable()
+    if anchor is None or not isinstance(table, DataFrameGridTable):
+        return
+    key, offset = anchor
+    row = table.find_row(key)
+    if row is None:
+        return
+    _, pixels_per_unit = grid.GetScrollPixelsPerUnit()
+    if pixels_per_unit <= 0:
+        return
+    target = grid.CellToRect(row, 0).GetTop() + offset
+    _, top = grid.CalcUnscrolledPosition(0, 0)
+    if target // pixels_per_unit != top // pixels_per_unit:
+        grid.Scroll(-1, target // pixels_per_unit)
+
+def visible_rows(grid: gridlib.Grid) -> range:
+    """Returns the rows currently within the grid's viewport"""
+    num_rows = grid.GetNumberRows()
+    if num_rows == 0:
+        return range(0)
+    _, top = grid.CalcUnscrolledPosition(0, 0)
+    _, height = grid.GetGridWindow().GetClientSize()
+    first = grid.YToRow(top, clipToMinMax=True)
+    last = grid.YToRow(top + height, clipToMinMax=True)
+    return range(max(first, 0), min(last, num_rows - 1) + 1)
+
+def size_visible_rows(grid: gridlib.Grid, margin: int, zoom_factor: float):
+    """Fits the heights of the visible rows that have not been measured yet to their wrapped content.
+    Rows start at the grid's default height, which is no taller than a measured row, so measuring
+    can only push rows out of the viewport and the visible range is settled in one pass"""
+    table = grid.GetTable()
+    if not isinstance(table, DataFrameGridTable):
+        return
+    rows = [row for row in visible_rows(grid) if row not in table.measured_rows]
+    if not rows:
+        return
+
+    dc = wx.ClientDC(grid.GetGridWindow())
+    grid.BeginBatch()
+    for row in rows:
+        height = 0
+        for col in range(table.GetNumberCols()):
+            renderer = table.column_renderers[col]
+            attr = table.column_attrs[col]
+            height = max(height, renderer.GetBestHeight(grid, attr, dc, row, col, grid.GetColSize(col)))
+        grid.SetRowSize(row, int((height + margin) * zoom_factor))
+        table.measured_rows.add(row)
+    grid.EndBatch()
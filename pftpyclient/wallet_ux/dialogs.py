@@ -5,6 +5,7 @@ import webbrowser
 from typing import Optional, TYPE_CHECKING
 from .dialog_parent import WalletDialogParent
 import traceback
+from pftpyclient.utilities.rpc_pool import get_rpc_pool
 
 if TYPE_CHECKING:
     from pftpyclient.utilities.task_manager import PostFiatTaskManager
@@ -329,16 +330,29 @@ class PreferencesDialog(wx.Dialog):
         self.perf_monitor.SetValue(self.config.get_global_config('performance_monitor'))
         app_sbs.Add(self.perf_monitor, 0, wx.ALL | wx.EXPAND, 5)
 
+        # Transaction Index checkbox
+        self.use_transaction_index = wx.CheckBox(panel, label="Use SQLite transaction index")
+        self.use_transaction_index.SetValue(self.config.get_global_config('use_transaction_index'))
+        app_sbs.Add(self.use_transaction_index, 0, wx.ALL | wx.EXPAND, 5)
+
+        # Memo Codec checkbox
+        self.use_memo_codec = wx.CheckBox(panel, label="Send memos in the compact format (not yet readable by nodes)")
+        self.use_memo_codec.SetValue(self.config.get_global_config('use_memo_codec'))
+        app_sbs.Add(self.use_memo_codec, 0, wx.ALL | wx.EXPAND, 5)
+
         # Cache Format radio buttons
         cache_box = wx.StaticBox(panel, label="Transaction Cache Format")
         cache_sbs = wx.StaticBoxSizer(cache_box, wx.HORIZONTAL)
         self.cache_csv = wx.RadioButton(panel, label="CSV", style=wx.RB_GROUP)
         self.cache_pickle = wx.RadioButton(panel, label="Pickle")
+        self.cache_parquet = wx.RadioButton(panel, label="Parquet (append-only)")
         current_format = self.config.get_global_config("transaction_cache_format")
         self.cache_csv.SetValue(current_format == "csv")
-        self.cache_pickle.SetValue(current_format != "csv")
+        self.cache_pickle.SetValue(current_format == "pickle")
+        self.cache_parquet.SetValue(current_format == "parquet")
         cache_sbs.Add(self.cache_csv, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         cache_sbs.Add(self.cache_pickle, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        cache_sbs.Add(self.cache_parquet, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         app_sbs.Add(cache_sbs, 0, wx.ALL | wx.EXPAND, 5)
 
         vbox.Add(app_sbs, 0, wx.ALL | wx.EXPAND, 10)
@@ -484,6 +498,7 @@ class PreferencesDialog(wx.Dialog):
                 # Update the main WalletApp's endpoint
                 if endpoint_type == 'http':
                     self.parent.network_url = new_endpoint
+                    get_rpc_pool(self.config.get_network_endpoints())  # new endpoint becomes the pool's preferred one
                 else:
                     self.parent.ws_url = new_endpoint
                     self.parent.restart_xrpl_monitor()
@@ -520,7 +535,15 @@ class PreferencesDialog(wx.Dialog):
         self.config.set_global_config('use_testnet', new_network)
         self.config.set_global_config('require_password_for_payment', self.require_password_for_payment.GetValue())
         self.config.set_global_config('performance_monitor', self.perf_monitor.GetValue())
-        self.config.set_global_config('transaction_cache_format', 'csv' if self.cache_csv.GetValue() else 'pickle')
+        self.config.set_global_config('use_transaction_index', self.use_transaction_index.GetValue())
+        self.config.set_global_config('use_memo_codec', self.use_memo_codec.GetValue())
+        if self.cache_parquet.GetValue():
+            cache_format = 'parquet'
+        elif self.cache_pickle.GetValue():
+            cache_format = 'pickle'
+        else:
+            cache_format = 'csv'
+        self.config.set_global_config('transaction_cache_format', cache_format)
         self.EndModal(wx.ID_OK)
 
 class LinkOpeningHtmlWindow(wx.html.HtmlWindow):
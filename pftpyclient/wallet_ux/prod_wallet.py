@@ -35,11 +35,11 @@ from pftpyclient.utilities.wallet_state import (
 from pftpyclient.utilities.task_manager import (
     PostFiatTaskManager, 
     NoMatchingTaskException, 
-    WrongTaskStateException, 
-    compress_string,
-    construct_memo
+    WrongTaskStateException
 )
 from pftpyclient.user_login.credentials import CredentialManager
+from pftpyclient.utilities.rpc_pool import get_rpc_client
+from pftpyclient.utilities.submission_queue import TransactionQueue, ValidationWatcher
 from pftpyclient.basic_utilities.configure_logger import configure_logger, update_wx_sink
 from pftpyclient.performance.monitor import PerformanceMonitor
 from pftpyclient.configuration.configuration import ConfigurationManager, get_network_config
@@ -48,6 +48,15 @@ from pftpyclient.user_login.migrate_credentials import check_and_show_migration_
 from pftpyclient.utilities.updater import check_and_show_update_dialog
 from pftpyclient.wallet_ux.dialogs import *
 from pftpyclient.wallet_ux.dialogs import CustomDialog
+from pftpyclient.wallet_ux.data_grid import (
+    DataFrameGridTable,
+    get_scroll_anchor,
+    restore_scroll_anchor,
+    size_visible_rows,
+)
+from pftpyclient.utilities.grid_diff import diff_grid_rows
+from pftpyclient.utilities.grid_refresh import GridRefreshWorker, GridVersionTracker
+from pftpyclient.utilities.refresh_scheduler import RefreshScheduler
 from pftpyclient.version import VERSION
 
 # Configure the logger at module level
@@ -231,9 +240,16 @@ class XRPLMonitorThread(Thread):
                 self.set_ui_state(WalletUIState.IDLE, "Failed to connect to XRPL websocket.")
                 raise Exception(f"Subscription failed: {response.result}")
             
+            if self.gui.validation_watcher is not None and 'ledger_index' in response.result:
+                self.gui.validation_watcher.on_ledger_closed(response.result['ledger_index'])
+
             self.set_ui_state(WalletUIState.IDLE)
             logger.info(f"Successfully subscribed to account {self.account} updates on node {self.url}")
 
+            # Transactions validated while not subscribed (before the first subscription, or while reconnecting)
+            # are not streamed, so fetch them from the last synced ledger
+            wx.CallAfter(self.gui._sync_and_refresh)
+
             # Create task for timeout checking
             async def check_timeouts():
                 while True:
@@ -255,6 +271,8 @@ class XRPLMonitorThread(Thread):
                         
                         if mtype == "ledgerClosed":
                             self.last_ledger_time = time.time()
+                            if self.gui.validation_watcher is not None:
+                                self.gui.validation_watcher.on_ledger_closed(message["ledger_index"])
                             wx.CallAfter(self.gui.update_ledger, message)
                         elif mtype == "transaction":
                             await self.process_transaction(message)
@@ -285,27 +303,12 @@ class XRPLMonitorThread(Thread):
                 "validated": tx_message.get("validated", False)
             }
 
-            # Create DataFrame in same format as sync_transactions expects
-            tx_df = pd.DataFrame([formatted_tx])
-
-            # Process through sync_memo_transactions pipeline
-            if not tx_df.empty:
-                wx.CallAfter(self.gui.task_manager.sync_memo_transactions, tx_df)
-
-                # Update account info
-                response = await self.client.request(xrpl.models.requests.AccountInfo(
-                    account=self.account,
-                    ledger_index="validated"
-                ))
-
-                if response.is_successful():
-                    def update_all():
-                        self.gui.update_account(response.result["account_data"])
-                        self.gui.update_tokens()
-                        self.gui.refresh_grids()
-                    wx.CallAfter(update_all)
-                else:
-                    logger.error(f"Failed to get account info: {response.result}")
+            # Queued submissions are confirmed from this thread, without waiting on the UI
+            if self.gui.validation_watcher is not None:
+                self.gui.validation_watcher.on_transaction(formatted_tx)
+
+            # Balances and derived dataframes are updated from the message itself, without further requests
+            wx.CallAfter(self.gui.ingest_websocket_transaction, formatted_tx)
             
             self.set_ui_state(WalletUIState.IDLE)
 
@@ -316,18 +319,37 @@ class XRPLMonitorThread(Thread):
 
 class WalletApp(wx.Frame):
 
+    # Grids that display each of the task manager's derived dataframes
+    GRIDS_BY_DATAFRAME = {
+        'memo_transactions': ('summary', 'payments'),
+        'tasks': ('proposals', 'rewards', 'verification'),
+        'memos': ('summary', 'memos'),
+        'system_memos': ('summary',)
+    }
+
+    # Tab each refreshed grid is shown on, so only the visible tab's grids are computed eagerly
+    GRID_TABS = {
+        'summary': 'Summary',
+        'proposals': 'Proposals',
+        'verification': 'Verification',
+        'rewards': 'Rewards',
+        'payments': 'Payments',
+        'memos': 'Memos'
+    }
+
     STATE_AVAILABLE_TABS = {
         WalletState.UNFUNDED: ["Summary", "Log"],
-        WalletState.FUNDED: ["Summary", "Payments", "Log"],
-        WalletState.TRUSTLINED: ["Summary", "Payments", "Memos", "Log"],
-        WalletState.INITIATED: ["Summary", "Payments", "Memos", "Log"],
-        WalletState.HANDSHAKE_SENT: ["Summary", "Payments", "Memos", "Log"],
-        WalletState.HANDSHAKE_RECEIVED: ["Summary", "Payments", "Memos", "Log"],
-        WalletState.ACTIVE: ["Summary", "Proposals", "Verification", "Rewards", "Payments", "Memos", "Log"]
+        WalletState.FUNDED: ["Summary", "Payments", "Outbox", "Log"],
+        WalletState.TRUSTLINED: ["Summary", "Payments", "Memos", "Outbox", "Log"],
+        WalletState.INITIATED: ["Summary", "Payments", "Memos", "Outbox", "Log"],
+        WalletState.HANDSHAKE_SENT: ["Summary", "Payments", "Memos", "Outbox", "Log"],
+        WalletState.HANDSHAKE_RECEIVED: ["Summary", "Payments", "Memos", "Outbox", "Log"],
+        WalletState.ACTIVE: ["Summary", "Proposals", "Verification", "Rewards", "Payments", "Memos", "Outbox", "Log"]
     }
 
     GRID_CONFIGS = {
         'proposals': {
+            'key': 'task_id',  # identifies a row when restoring the selection
             'columns': [
                 ('task_id', 'Task ID', 200),
                 ('request', 'Request', 250),
@@ -336,6 +358,7 @@ class WalletApp(wx.Frame):
             ]
         },
         'rewards': {
+            'key': 'task_id',
             'columns': [
                 ('task_id', 'Task ID', 170),
                 ('proposal', 'Proposal', 300),
@@ -344,6 +367,7 @@ class WalletApp(wx.Frame):
             ]
         },
         'verification': {
+            'key': 'task_id',
             'columns': [
                 ('task_id', 'Task ID', 190),
                 ('proposal', 'Proposal', 300),
@@ -351,6 +375,7 @@ class WalletApp(wx.Frame):
             ]
         },
         'memos': {
+            'key': 'memo_id',
             'columns': [
                 ('memo_id', 'Message ID', 190),
                 ('memo', 'Memo', 500),
@@ -359,12 +384,14 @@ class WalletApp(wx.Frame):
             ]
         },
         'summary': {
+            'key': 'Key',
             'columns': [
                 ('Key', 'Key', 125),
                 ('Value', 'Value', 550)
             ]
         },
         'payments': {
+            'key': 'tx_hash',
             'columns': [
                 ('datetime', 'Date', 120),
                 ('amount', 'Amount', 70),
@@ -373,6 +400,16 @@ class WalletApp(wx.Frame):
                 ('display_address', 'Address', 250),
                 ('tx_hash', 'Tx Hash', 450)
             ]
+        },
+        'outbox': {
+            'key': 'submission_id',
+            'columns': [
+                ('submission_id', '#', 40),
+                ('queued_at', 'Queued', 130),
+                ('description', 'Action', 300),
+                ('status', 'Status', 90),
+                ('detail', 'Detail', 450)
+            ]
         }
     }
 
@@ -415,6 +452,8 @@ class WalletApp(wx.Frame):
         self.create_menu_bar()
 
         self.tab_pages = {}  # Store references to tab pages
+        self.grid_tables = {}  # Grid name -> DataFrameGridTable, populated by setup_grid
+        self.row_height_margin = 25
 
         self.wallet = None
         self.build_ui()
@@ -423,14 +462,16 @@ class WalletApp(wx.Frame):
         update_wx_sink(self.log_text)
 
         self.worker = None
+        self.transaction_queue = None
+        self.validation_watcher = None
+        self.grid_refresh_worker = None
+        self.refresh_scheduler = None
+        self.grid_versions = GridVersionTracker()
         self.Bind(wx.EVT_CLOSE, self.on_close)
         self.Bind(EVT_UPDATE_GRID, self.update_grid)
 
         # grid dimensions
-        self.grid_row_heights = {}
         self.grid_column_widths = {}
-        self.grid_base_row_height = 125
-        self.row_height_margin = 25
 
         self.username = None
 
@@ -446,13 +487,37 @@ class WalletApp(wx.Frame):
         check_and_show_update_dialog(parent=self)
 
     def setup_grid(self, grid, grid_name):
-        """Setup grid with columns based on grid configuration"""
-        columns = self.GRID_CONFIGS[grid_name]['columns']
-        grid.CreateGrid(0, len(columns))
-        for idx, (col_id, col_label, width) in enumerate(columns):
-            grid.SetColLabelValue(idx, col_label)
+        """Setup grid with a virtual table whose columns are based on grid configuration"""
+        config = self.GRID_CONFIGS[grid_name]
+        table = DataFrameGridTable(config['columns'], key_column=config.get('key'))
+        self.grid_tables[grid_name] = table
+        grid.SetTable(table, takeOwnership=True)
+        for idx, (col_id, col_label, width) in enumerate(config['columns']):
             grid.SetColSize(idx, width)
+        grid.SetDefaultRowSize(self.get_default_row_height(grid))
+
+        # Row heights are fitted to their content as rows scroll into view
+        def on_view_changed(event):
+            wx.CallAfter(self.size_visible_rows, grid)
+            event.Skip()
+
+        def on_col_size(event):
+            table.measured_rows.clear()
+            wx.CallAfter(self.size_visible_rows, grid)
+            event.Skip()
+
+        grid.Bind(wx.EVT_SCROLLWIN, on_view_changed)
+        grid.Bind(wx.EVT_SIZE, on_view_changed)
+        grid.Bind(gridlib.EVT_GRID_COL_SIZE, on_col_size)
         return grid
+
+    def get_default_row_height(self, grid):
+        """Height of a single-line row, which unmeasured rows are shown at"""
+        return int((grid.GetCharHeight() + self.row_height_margin) * self.zoom_factor)
+
+    def size_visible_rows(self, grid):
+        if grid:  # the grid may have been destroyed before a deferred call
+            size_visible_rows(grid, self.row_height_margin, self.zoom_factor)
     
     def create_menu_bar(self):
         """Create the menu bar with File and Extras menus"""
@@ -792,6 +857,23 @@ class WalletApp(wx.Frame):
         # Store reference to memos tab page
         self.tab_pages["Memos"] = self.memos_tab
 
+        #################################
+        # OUTBOX
+        #################################
+
+        self.outbox_tab = wx.Panel(self.tabs)
+        self.tabs.AddPage(self.outbox_tab, "Outbox")
+        self.outbox_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.outbox_tab.SetSizer(self.outbox_sizer)
+
+        # Add grid of queued transactions and their status to Outbox tab
+        self.outbox_grid = self.setup_grid(gridlib.Grid(self.outbox_tab), 'outbox')
+        self.outbox_grid.EnableEditing(False)
+        self.outbox_sizer.Add(self.outbox_grid, 1, wx.EXPAND | wx.ALL, 20)
+
+        # Store reference to outbox tab page
+        self.tab_pages["Outbox"] = self.outbox_tab
+
         #################################
         # LOGS
         #################################
@@ -1118,32 +1200,25 @@ class WalletApp(wx.Frame):
             self.set_wallet_ui_state(WalletUIState.IDLE)
             return
         
-        self.set_wallet_ui_state(message="Submitting payment...")
-        self.btn_send.Disable()
+        def on_error(e):
+            logger.error(f"Error submitting payment: {e}")
+            wx.MessageBox(f"Error submitting payment: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
         try:
             if token_type == "XRP":
                 dest_tag = int(destination_tag) if destination_tag.strip() else None
-                response = self.task_manager.send_xrp(amount, destination, memo, destination_tag=dest_tag)
+                action = lambda: self.task_manager.send_xrp(amount, destination, memo, destination_tag=dest_tag)
             else: # PFT
-                response = self.task_manager.send_pft(amount, destination, memo)
+                action = lambda: self.task_manager.send_pft(amount, destination, memo)
 
-            formatted_response = self.format_response(response)
-            dialog = SelectableMessageDialog(self, f"{token_type} Payment Submitted", formatted_response)
-            dialog.ShowModal()
-            dialog.Destroy()
+            self.queue_transaction(
+                f"Send {amount} {token_type} to {destination}", action, f"{token_type} Payment Submitted", on_error=on_error
+            )
 
         except ValueError as e:
             logger.error(f"Invalid input: {e}")
             wx.MessageBox(f"Invalid input: {e}", "Error", wx.OK | wx.ICON_ERROR)
-        except xrpl.transaction.XRPLReliableSubmissionException as e:
-            logger.error(f"Error submitting payment: {e}")
-            wx.MessageBox(f"Error submitting payment: {e}", "Error", wx.OK | wx.ICON_ERROR)
-        except Exception as e:
-            logger.error(f"Error submitting payment: {e}")
-            wx.MessageBox(f"Error submitting payment: {e}", "Error", wx.OK | wx.ICON_ERROR)
         
-        self.btn_send.Enable()
         self.btn_send.SetLabel("Send")
         # self._sync_and_refresh()
         self.set_wallet_ui_state(WalletUIState.IDLE)
@@ -1415,6 +1490,26 @@ class WalletApp(wx.Frame):
         
         self.wallet = self.task_manager.user_wallet
 
+        # Transactions are sent in the background through the queue, and confirmed by validations seen on the websocket
+        self.validation_watcher = ValidationWatcher()
+        self.task_manager.validation_watcher = self.validation_watcher
+        self.transaction_queue = TransactionQueue(on_update=lambda submission: wx.CallAfter(self.update_outbox))
+        self.transaction_queue.start()
+
+        # Grid data is computed on worker threads so syncing and decryption do not block the UI
+        self.grid_versions.clear()
+        worker = GridRefreshWorker(
+            compute=lambda state, grid_type: (state[1][grid_type], self.compute_grid_data(state[0], grid_type)),
+            on_result=lambda results: wx.CallAfter(self.on_grid_data_ready, worker, results)
+        )
+        self.grid_refresh_worker = worker
+
+        # Updates from streamed transactions are applied once per ledger close rather than per transaction
+        self.refresh_scheduler = RefreshScheduler(
+            flush=self.apply_streamed_updates,
+            min_interval=self.config.get_global_config('refresh_min_interval_sec')
+        )
+
         self.update_ui_based_on_wallet_state()
 
         logger.info(f"Logged in as {self.username}")
@@ -1442,10 +1537,51 @@ class WalletApp(wx.Frame):
         self.refresh_grids()
         self.auto_size_window()
 
-        self.set_wallet_ui_state(WalletUIState.IDLE)
+        # Without a local cache, the grids only show recent transactions until the history backfill completes
+        if self.task_manager.backfill_pending:
+            self.start_history_backfill()
+        else:
+            self.set_wallet_ui_state(WalletUIState.IDLE)
 
         self.update_all_destination_comboboxes()
 
+    def start_history_backfill(self):
+        """Backfills the full transaction history on a worker thread and merges it on the main thread"""
+        task_manager = self.task_manager
+        if task_manager is None or not task_manager.backfill_pending:
+            return
+
+        def report_progress(completed, total):
+            wx.CallAfter(self.set_wallet_ui_state, WalletUIState.SYNCING, f"Loading transaction history ({completed}/{total})...")
+
+        def backfill_thread():
+            transactions = task_manager.fetch_history_backfill(progress_callback=report_progress)
+            wx.CallAfter(self.on_history_backfill_complete, task_manager, transactions)
+
+        self.set_wallet_ui_state(WalletUIState.SYNCING, "Loading transaction history...")
+        Thread(target=backfill_thread, daemon=True).start()
+
+    def on_history_backfill_complete(self, task_manager, transactions):
+        """Merges the backfilled history and refreshes the UI, or schedules a retry if the backfill failed"""
+        if task_manager is not getattr(self, 'task_manager', None):
+            logger.debug("Discarding history backfill for a logged out session")
+            return
+
+        if transactions is None:
+            self.set_wallet_ui_state(WalletUIState.IDLE, "Transaction history incomplete, retrying shortly")
+            wx.CallLater(constants.UPDATE_TIMER_INTERVAL_SEC * 1000, self.start_history_backfill)
+            return
+
+        try:
+            task_manager.merge_history_backfill(transactions)
+            self.check_wallet_state()
+            self.refresh_grids()
+            self.set_wallet_ui_state(WalletUIState.IDLE)
+        except Exception as e:
+            logger.error(f"Error merging transaction history: {e}")
+            logger.error(traceback.format_exc())
+            self.set_wallet_ui_state(WalletUIState.IDLE, f"Sync error: {e}")
+
     def update_network_display(self):
         """Update UI elements that display network information"""
         self.summary_lbl_endpoint.SetLabel(f"HTTPS: {self.network_url}")
@@ -1686,7 +1822,23 @@ class WalletApp(wx.Frame):
             asyncio.run_coroutine_threadsafe(job, self.worker.loop)
 
     def update_ledger(self, message):
-        pass  # Simplified for this version
+        """Applies the updates streamed since the last ledger close"""
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.on_ledger_closed(message.get('ledger_index'))
+
+    def flush_overdue_updates(self):
+        """Applies streamed updates that have waited too long for a ledger close, e.g. after a disconnect"""
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.flush_overdue()
+
+    def apply_streamed_updates(self, grids, balances):
+        """Refreshes the balances and grids marked dirty by streamed transactions"""
+        if 'xrp' in balances:
+            self.update_account({'Balance': balances['xrp']})
+        if 'pft' in balances:
+            self.summary_lbl_pft_balance.SetLabel(f"PFT Balance: {balances['pft']}")
+        if grids:
+            self.refresh_grids(targets=grids)
 
     @PerformanceMonitor.measure('update_account')
     def update_account(self, acct):
@@ -1772,7 +1924,7 @@ class WalletApp(wx.Frame):
     def update_tokens(self):
         logger.debug(f"Fetching token balances for account: {self.wallet.address}")
         try:
-            client = xrpl.clients.JsonRpcClient(self.network_url)
+            client = get_rpc_client(self.config)
             account_lines = xrpl.models.requests.AccountLines(
                 account=self.wallet.address,
                 ledger_index="validated"
@@ -1840,46 +1992,109 @@ class WalletApp(wx.Frame):
             self.btn_force_update.SetLabel("Force Update")
             self.btn_force_update.Update()
 
+    @PerformanceMonitor.measure('ingest_websocket_transaction')
+    def ingest_websocket_transaction(self, tx):
+        """Adds a streamed transaction to the task manager and marks the balances and grids it affects for
+        the next refresh"""
+        if not self.task_manager or self.refresh_scheduler is None:
+            return
+
+        try:
+            changed_frames = self.task_manager.ingest_transaction(tx)
+            balances = self.task_manager.get_balance_changes(tx.get('meta') or {})
+        except Exception as e:
+            logger.error(f"Failed ingesting websocket transaction: {e}")
+            logger.error(traceback.format_exc())
+            return
+
+        targets = set()
+        for frame in changed_frames:
+            targets.update(self.GRIDS_BY_DATAFRAME.get(frame, ()))
+        logger.debug(f"Websocket transaction changed {changed_frames or 'no dataframes'}, marking {targets or 'no grids'}")
+
+        was_dirty = self.refresh_scheduler.is_dirty
+        for name, value in balances.items():
+            self.refresh_scheduler.mark_balance(name, value)
+        self.refresh_scheduler.mark_grids(targets)
+        if not was_dirty and self.refresh_scheduler.is_dirty:
+            wx.CallLater(int(constants.REFRESH_MAX_DELAY_SEC * 1000) + 100, self.flush_overdue_updates)
+
     @PerformanceMonitor.measure('refresh_grids')
-    def refresh_grids(self, event=None):
-        """Update all grids based on wallet state with proper error handling"""
-        logger.debug("Starting grid refresh")
-        current_state = self.task_manager.wallet_state
+    def refresh_grids(self, event=None, targets=None):
+        """Update grids based on wallet state. The grids on the visible tab are computed by the grid refresh
+        worker from a snapshot of the task manager and posted back to the UI thread once ready, while the
+        others are marked stale and computed when their tab is shown.
+        If targets is given, only the named grids are refreshed."""
+        if getattr(self, 'task_manager', None) is None or self.grid_refresh_worker is None:
+            return
+        requested = self.get_available_grids()
+        if targets is not None:
+            requested &= set(targets)
+        self.grid_versions.invalidate(requested)
+
+        visible = self.get_visible_grids()
+        logger.debug(
+            f"Refreshing {sorted(requested & visible) or 'no visible grids'}, "
+            f"marking {sorted(requested - visible) or 'no grids'} stale"
+        )
+        self.request_grid_data(requested & visible)
 
-        # Summary grid (available in FUNDED_STATES)
+    def get_available_grids(self):
+        """Returns the grids the current wallet state allows: summary in FUNDED_STATES, memos and payments
+        in TRUSTLINED_STATES, and proposals, rewards and verification in ACTIVATED_STATES"""
+        current_state = self.task_manager.wallet_state
+        available = set()
         if current_state in FUNDED_STATES:
-            try: 
-                key_account_details = self.task_manager.process_account_info()
-                wx.PostEvent(self, UpdateGridEvent(data=key_account_details, target="summary", caller=f"{self.__class__.__name__}.refresh_grids"))
-            except Exception as e:
-                logger.error(f"Failed updating summary grid: {e}")
-
-        # Memos, payments grid (available in TRUSTLINED_STATES)
+            available.add("summary")
         if current_state in TRUSTLINED_STATES:
-            for grid_type, getter_method in [
-                ("memos", self.task_manager.get_memos_df),
-                ("payments", self.task_manager.get_payments_df)
-            ]:
-                try:
-                    data = getter_method()
-                    wx.PostEvent(self, UpdateGridEvent(data=data, target=grid_type, caller=f"{self.__class__.__name__}.refresh_grids"))
-                except Exception as e:
-                    logger.error(f"Failed updating {grid_type} grid: {e}")
-                    logger.error(traceback.format_exc())
-
-        # Proposals, Rewards, and Verification grids (available in PFT_STATES)
+            available.update(["memos", "payments"])
         if current_state in ACTIVATED_STATES:
-            for grid_type, getter_method in [
-                ("proposals", self.task_manager.get_proposals_df),
-                ("rewards", self.task_manager.get_rewards_df),
-                ("verification", self.task_manager.get_verification_df)
-            ]:
-                try:
-                    data = getter_method()
-                    wx.PostEvent(self, UpdateGridEvent(data=data, target=grid_type, caller=f"{self.__class__.__name__}.refresh_grids"))
-                except Exception as e:
-                    logger.error(f"Failed updating {grid_type} grid: {e}")
-                    logger.error(traceback.format_exc())
+            available.update(["proposals", "rewards", "verification"])
+        return available
+
+    def get_visible_grids(self):
+        """Returns the grids on the currently selected tab"""
+        current_page = self.tabs.GetCurrentPage()
+        return {
+            grid_type for grid_type, tab_label in self.GRID_TABS.items()
+            if current_page is not None and self.tab_pages.get(tab_label) is current_page
+        }
+
+    def request_grid_data(self, grids):
+        """Queues the grids for computation from a snapshot of the current task manager state"""
+        if not grids:
+            return
+        self.grid_versions.mark_requested(grids)
+        versions = {grid_type: self.grid_versions.version(grid_type) for grid_type in self.GRID_TABS}
+        self.grid_refresh_worker.request((self.task_manager.snapshot(), versions), grids)
+
+    @staticmethod
+    def compute_grid_data(task_manager: PostFiatTaskManager, grid_type: str):
+        """Computes a grid's data from a task manager snapshot. Runs on the grid refresh worker's threads"""
+        match grid_type:
+            case "summary":
+                return task_manager.process_account_info()
+            case "memos":
+                return task_manager.get_memos_df()
+            case "payments":
+                return task_manager.get_payments_df()
+            case "proposals":
+                return task_manager.get_proposals_df()
+            case "rewards":
+                return task_manager.get_rewards_df()
+            case "verification":
+                return task_manager.get_verification_df()
+            case _:
+                raise ValueError(f"Unknown grid: {grid_type}")
+
+    def on_grid_data_ready(self, worker, results):
+        """Posts grid data computed by the grid refresh worker, unless the session it was computed for has ended"""
+        if worker is not self.grid_refresh_worker:
+            logger.debug("Discarding grid data for a logged out session")
+            return
+        for grid_type, (version, data) in results.items():
+            self.grid_versions.mark_rendered(grid_type, version)
+            wx.PostEvent(self, UpdateGridEvent(data=data, target=grid_type, caller=f"{self.__class__.__name__}.refresh_grids"))
 
     @PerformanceMonitor.measure('update_grid')
     def update_grid(self, event):
@@ -1929,104 +2144,66 @@ class WalletApp(wx.Frame):
 
     @PerformanceMonitor.measure('populate_grid_generic')
     def populate_grid_generic(self, grid: wx.grid.Grid, data: pd.DataFrame, grid_name: str):
-        """Generic grid population method that respects zoom settings"""
+        """Generic grid population method that respects zoom settings.
+        When the rows can be matched to the displayed ones by key, only the inserted, updated and
+        removed rows are applied, and the grid is left alone if nothing changed"""
+        table = self.grid_tables.get(grid_name)
+        if table is None:
+            logger.error(f"No grid table found for {grid_name}")
+            return
 
         if data.empty:
             logger.debug(f"No data to populate {grid_name} grid")
-            grid.ClearGrid()
+            if table.data.empty:
+                return
+
+        config = self.GRID_CONFIGS[grid_name]
+        diff = diff_grid_rows(table.data, data, config.get('key'), [col_id for col_id, _, _ in config['columns']])
+        if diff is not None and diff.is_empty:
+            logger.debug(f"No changes to {grid_name} grid")
             return
-        
-        # Store all values from the selected row if there is one
-        had_selection = grid.GetSelectedRows()
-        selected_row_values = None
-        if had_selection:
-            selected_row_values = [
-                grid.GetCellValue(had_selection[0], col) 
-                for col in range(grid.GetNumberCols())
-            ]
 
-        if grid.GetNumberRows() > 0:
-            grid.DeleteRows(0, grid.GetNumberRows())
+        # Remember the selected row and the top visible row by key, so they can be found again in the new data
+        selected_rows = grid.GetSelectedRows()
+        selected_key = table.get_key(selected_rows[0]) if selected_rows else None
+        scroll_anchor = get_scroll_anchor(grid)
 
         # Store original column sizes if not already stored
         if grid_name not in self.grid_column_widths:
             self.grid_column_widths[grid_name] = [grid.GetColSize(col) for col in range(grid.GetNumberCols())]
 
-        # Add new rows
-        grid.AppendRows(len(data))
-
-        # Get the column configuration for this grid
-        columns = self.GRID_CONFIGS.get(grid_name, {}).get('columns', [])
-        if not columns:
-            logger.error(f"No column configuration found for {grid_name}")
-            return
-        
-        # Get the column configuration for this grid
-        columns = self.GRID_CONFIGS.get(grid_name, {}).get('columns', [])
-        if not columns:
-            logger.error(f"No column configuration found for {grid_name}")
+        if diff is not None:
+            logger.debug(
+                f"Updating {grid_name} grid: {len(diff.inserted)} inserted, "
+                f"{len(diff.updated)} updated, {len(diff.removed)} removed"
+            )
+            table.apply_diff(data, diff, grid_name)
+            restore_scroll_anchor(grid, scroll_anchor)
+            self.restore_grid_selection(grid, table, selected_key)
+            self.size_visible_rows(grid)
             return
 
-        # Populate data using the column mapping
-        for idx in range(len(data)):
-            for col, (col_id, _, _) in enumerate(columns):
-                if col_id in data.columns:
-                    value = data.iloc[idx][col_id]
-                    grid.SetCellValue(idx, col, str(value))
-                    grid.SetCellRenderer(idx, col, gridlib.GridCellAutoWrapStringRenderer())
-                else:
-                    logger.error(f"Column {col_id} not found in data for {grid_name}")
+        table.set_data(data, grid_name)
 
-        # Let wxPython handle initial row sizing
-        grid.AutoSizeRows()
-
-        # Store the auto-sized row heights with an additional margin
-        self.grid_row_heights[grid_name] = [
-            grid.GetRowSize(row) + self.row_height_margin 
-            for row in range(grid.GetNumberRows())
-            ]
-        
-        # Apply the stored row heights and column widths with the zoom factor
-        for row in range(grid.GetNumberRows()):
-            grid.SetRowSize(row, int(self.grid_row_heights[grid_name][row] * self.zoom_factor))
+        # Rows start at the single-line height and are fitted to their content once visible
+        grid.SetDefaultRowSize(self.get_default_row_height(grid), resizeExistingRows=True)
 
         column_zoom_factor = 1.0 + ((self.zoom_factor - 1.0) * 0.3)  # 30% of the regular zoom effect
         for col, original_width in enumerate(self.grid_column_widths[grid_name]):
             grid.SetColSize(col, int(original_width * column_zoom_factor))
 
-        # self.auto_size_window()
-
-        # Restore selection if there was one
-        if selected_row_values:
-            # Find the row with matching values
-            for row in range(grid.GetNumberRows()):
-                current_row_values = [
-                    grid.GetCellValue(row, col) 
-                    for col in range(grid.GetNumberCols())
-                ]
-                if current_row_values == selected_row_values:
-                    grid.SelectRow(row)
-                    break
-        else:
-            grid.ClearSelection()  # Only clear if there wasn't a previous selection
-
+        self.restore_grid_selection(grid, table, selected_key)
+        self.size_visible_rows(grid)
         grid.Refresh()
 
-        # Restore selection if there was one
-        if selected_row_values:
-            # Find the row with matching values
-            for row in range(grid.GetNumberRows()):
-                current_row_values = [
-                    grid.GetCellValue(row, col) 
-                    for col in range(grid.GetNumberCols())
-                ]
-                if current_row_values == selected_row_values:
-                    grid.SelectRow(row)
-                    break
+    def restore_grid_selection(self, grid, table, selected_key):
+        """Selects the row with the given key, if it is still in the table"""
+        selected_row = table.find_row(selected_key)
+        if selected_row is not None:
+            if selected_row not in grid.GetSelectedRows():
+                grid.SelectRow(selected_row)
         else:
-            grid.ClearSelection()  # Only clear if there wasn't a previous selection
-
-        grid.Refresh()
+            grid.ClearSelection()
 
     @PerformanceMonitor.measure('populate_summary_grid')
     def populate_summary_grid(self, key_account_details):
@@ -2074,8 +2251,6 @@ class WalletApp(wx.Frame):
     def store_grid_dimensions(self, grid, grid_name):
         if grid_name not in self.grid_column_widths:
             self.grid_column_widths[grid_name] = [grid.GetColSize(col) for col in range(grid.GetNumberCols())]
-        if grid_name not in self.grid_row_heights:
-            self.grid_row_heights[grid_name] = [grid.GetRowSize(row) for row in range(grid.GetNumberRows())]
 
     def apply_zoom(self):
         base_font_size = 10
@@ -2088,43 +2263,22 @@ class WalletApp(wx.Frame):
             if isinstance(window, wx.grid.Grid):
                 window.SetDefaultCellFont(font)
 
-                # Let wxPython handle initial row sizes based on new font
-                window.AutoSizeRows()
-
-                # Apply margin and zoom to the auto-sized rows
-                for row in range(window.GetNumberRows()):
-                    current_height = window.GetRowSize(row)
-                    window.SetRowSize(row, int((current_height + self.row_height_margin) * self.zoom_factor))
-
-                grid_name = None
-                match window:
-                    case self.proposals_grid:
-                        grid_name = "proposals"
-                    case self.rewards_grid:
-                        grid_name = "rewards"
-                    case self.verification_grid:
-                        grid_name = "verification"
-                    case self.summary_grid:
-                        grid_name = "summary"
-                    case self.payments_grid:
-                        grid_name = "payments"
-                    case self.memos_grid:
-                        grid_name = "memos"
-                    case _:
-                        grid_name = None
-                        logger.error(f"No grid name found for {window}")
-
-                if grid_name and grid_name in self.grid_column_widths:
-                    self.store_grid_dimensions(window, grid_name)
-                    column_zoom_factor = 1.0 + ((self.zoom_factor - 1.0) * 0.3)  # 30% of the regular zoom effect
-                    for col, original_size in enumerate(self.grid_column_widths[grid_name]):
-                        window.SetColSize(col, int(original_size * column_zoom_factor))
-
             for child in window.GetChildren():
                 set_font_recursive(child)
 
         set_font_recursive(self)
 
+        # Measured row heights depend on the font, so rows are measured again as they become visible
+        column_zoom_factor = 1.0 + ((self.zoom_factor - 1.0) * 0.3)  # 30% of the regular zoom effect
+        for grid_name, table in self.grid_tables.items():
+            grid = getattr(self, f"{grid_name}_grid")
+            self.store_grid_dimensions(grid, grid_name)
+            for col, original_size in enumerate(self.grid_column_widths[grid_name]):
+                grid.SetColSize(col, int(original_size * column_zoom_factor))
+            table.measured_rows.clear()
+            grid.SetDefaultRowSize(self.get_default_row_height(grid), resizeExistingRows=True)
+            self.size_visible_rows(grid)
+
         # Refresh layout
         self.panel.Layout()
         self.tabs.Layout()
@@ -2136,6 +2290,13 @@ class WalletApp(wx.Frame):
     def on_tab_changed(self, event):
         # self.auto_size_window()  # NOTE: Users complained about this, so it's disabled for now. Consider deprecating.
         event.Skip()
+
+        # Grids that changed while their tab was hidden are computed on first view
+        if getattr(self, 'task_manager', None) is not None and self.grid_refresh_worker is not None:
+            stale = self.grid_versions.stale(self.get_visible_grids() & self.get_available_grids())
+            if stale:
+                logger.debug(f"Computing stale grids {sorted(stale)} for the selected tab")
+                self.request_grid_data(stale)
         
     def on_proposal_selection(self, event):
         """Handle proposal grid selection"""
@@ -2191,15 +2352,17 @@ class WalletApp(wx.Frame):
         dialog = CustomDialog(self, "Request Task", ["Task Request"])
         if dialog.ShowModal() == wx.ID_OK:
             request_message = dialog.GetValues()["Task Request"]
-            try:
-                response = self.task_manager.request_post_fiat(request_message=request_message)
-                formatted_response = self.format_response(response)
-                dialog = SelectableMessageDialog(self, "Task Request Result", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
-            except Exception as e:
+
+            def on_error(e):
                 logger.error(f"Error requesting task: {e}")
                 wx.MessageBox(f"Error requesting task: {e}", 'Task Request Error', wx.OK | wx.ICON_ERROR)
+
+            self.queue_transaction(
+                "Request task",
+                lambda: self.task_manager.request_post_fiat(request_message=request_message),
+                "Task Request Result",
+                on_error=on_error
+            )
         dialog.Destroy()
 
         self.btn_request_task.SetLabel("Request Task")
@@ -2226,26 +2389,18 @@ class WalletApp(wx.Frame):
             values = dialog.GetValues()
             task_id = values["Task ID"]
             acceptance_string = values["Acceptance String"]
-            try:
-                response = self.task_manager.send_acceptance_for_task_id(
+            self.queue_transaction(
+                f"Accept task {task_id}",
+                lambda: self.task_manager.send_acceptance_for_task_id(
                     task_id=task_id,
                     acceptance_string=acceptance_string
+                ),
+                "Task Acceptance Result",
+                on_error=lambda e: self.show_task_error(
+                    e, task_id, "accepting task", 'Task Acceptance Error',
+                    f"Task ID {task_id} is not in the correct state to be accepted."
                 )
-                formatted_response = self.format_response(response)
-                dialog = SelectableMessageDialog(self, "Task Acceptance Result", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
-            except NoMatchingTaskException as e:
-                logger.error(f"Error accepting task: {e}")
-                wx.MessageBox(f"Couldn't find task with task ID {task_id}. Did you enter it correctly?", 'Task Acceptance Error', wx.OK | wx.ICON_ERROR)
-            except WrongTaskStateException as e:
-                logger.error(f"Error accepting task: {e}")
-                wx.MessageBox(f"Task ID {task_id} is not in the correct state to be accepted. Current status: {e}", 'Task Acceptance Error', wx.OK | wx.ICON_ERROR)
-            except Exception as e:
-                logger.error(f"Error accepting task: {e}")
-                wx.MessageBox(f"Error accepting task: {e}", 'Task Acceptance Error', wx.OK | wx.ICON_ERROR)
-            # else:
-            #     wx.CallLater(constants.REFRESH_GRIDS_AFTER_TASK_DELAY_SEC * 1000, self._sync_and_refresh)
+            )
         dialog.Destroy()
 
         self.btn_accept_task.SetLabel("Accept Task")
@@ -2272,26 +2427,18 @@ class WalletApp(wx.Frame):
             values = dialog.GetValues()
             task_id = values["Task ID"]
             refusal_reason = values["Refusal Reason"]
-            try:
-                response = self.task_manager.send_refusal_for_task(
+            self.queue_transaction(
+                f"Refuse task {task_id}",
+                lambda: self.task_manager.send_refusal_for_task(
                     task_id=task_id,
                     refusal_reason=refusal_reason
+                ),
+                "Task Refusal Result",
+                on_error=lambda e: self.show_task_error(
+                    e, task_id, "refusing task", 'Task Refusal Error',
+                    f"Task ID {task_id} is not in the correct state to be refused."
                 )
-                formatted_response = self.format_response(response)
-                dialog = SelectableMessageDialog(self, "Task Refusal Result", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
-            except NoMatchingTaskException as e:
-                logger.error(f"Error refusing task: {e}")
-                wx.MessageBox(f"Couldn't find task with task ID {task_id}. Did you enter it correctly?", 'Task Refusal Error', wx.OK | wx.ICON_ERROR)
-            except WrongTaskStateException as e:
-                logger.error(f"Error refusing task: {e}")
-                wx.MessageBox(f"Task ID {task_id} is not in the correct state to be refused. Current status: {e}", 'Task Refusal Error', wx.OK | wx.ICON_ERROR)
-            except Exception as e:
-                logger.error(f"Error refusing task: {e}")
-                wx.MessageBox(f"Error refusing task: {e}", 'Task Refusal Error', wx.OK | wx.ICON_ERROR)
-            # else:
-            #     wx.CallLater(constants.REFRESH_GRIDS_AFTER_TASK_DELAY_SEC * 1000, self._sync_and_refresh)
+            )
 
         dialog.Destroy()
         self.btn_refuse_task.SetLabel("Refuse Task")
@@ -2318,26 +2465,18 @@ class WalletApp(wx.Frame):
             values = dialog.GetValues()
             task_id = values["Task ID"]
             completion_string = values["Completion String"]
-            try:
-                response = self.task_manager.submit_initial_completion(
+            self.queue_transaction(
+                f"Submit task {task_id} for verification",
+                lambda: self.task_manager.submit_initial_completion(
                     completion_string=completion_string,
                     task_id=task_id
+                ),
+                "Task Submission Result",
+                on_error=lambda e: self.show_task_error(
+                    e, task_id, "submitting initial completion", 'Task Submission Error',
+                    f"Task ID {task_id} has not yet been accepted."
                 )
-                formatted_response = self.format_response(response)
-                dialog = SelectableMessageDialog(self, "Task Submission Result", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
-            except NoMatchingTaskException as e:
-                logger.error(f"Error submitting initial completion: {e}")
-                wx.MessageBox(f"Couldn't find task with task ID {task_id}. Did you enter it correctly?", 'Task Submission Error', wx.OK | wx.ICON_ERROR)
-            except WrongTaskStateException as e:
-                logger.error(f"Error submitting initial completion: {e}")
-                wx.MessageBox(f"Task ID {task_id} has not yet been accepted. Current status: {e}", 'Task Submission Error', wx.OK | wx.ICON_ERROR)
-            except Exception as e:
-                logger.error(f"Error submitting initial completion: {e}")
-                wx.MessageBox(f"Error submitting initial completion: {e}", 'Task Submission Error', wx.OK | wx.ICON_ERROR)
-            # else:
-            #     wx.CallLater(constants.REFRESH_GRIDS_AFTER_TASK_DELAY_SEC * 1000, self._sync_and_refresh)
+            )
         dialog.Destroy()
 
         self.btn_submit_for_verification.SetLabel("Submit for Verification")
@@ -2380,18 +2519,15 @@ class WalletApp(wx.Frame):
 
         if dialog.ShowModal() == wx.ID_OK:
             values = dialog.GetValues()
-            try:
-                response = self.task_manager.send_refusal_for_task(
+            self.queue_transaction(
+                f"Refuse task {values['Task ID']}",
+                lambda: self.task_manager.send_refusal_for_task(
                     task_id=values["Task ID"],
                     refusal_reason=values["Refusal Reason"]
-                )
-                formatted_response = self.format_response(response)
-                result_dialog = SelectableMessageDialog(self, "Task Refusal Result", formatted_response)
-                result_dialog.ShowModal()
-                result_dialog.Destroy()
-                # wx.CallLater(constants.REFRESH_GRIDS_AFTER_TASK_DELAY_SEC * 1000, self._sync_and_refresh)
-            except Exception as e:
-                wx.MessageBox(f"Error refusing task: {e}", "Error", wx.OK | wx.ICON_ERROR)
+                ),
+                "Task Refusal Result",
+                on_error=lambda e: wx.MessageBox(f"Error refusing task: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            )
 
         dialog.Destroy()  
 
@@ -2407,30 +2543,23 @@ class WalletApp(wx.Frame):
         if not task_id or not response_string:
             wx.MessageBox("Please enter verification details", "Error", wx.OK | wx.ICON_ERROR)
         else:
-            try:
-                response = self.task_manager.send_verification_response(
-                    response_string=response_string,
-                    task_id=task_id
-                )
-                formatted_response = self.format_response(response)
-                dialog = SelectableMessageDialog(self, "Verification Submission Result", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
-            except NoMatchingTaskException as e:
-                logger.error(f"Error sending verification response: {e}")
-                wx.MessageBox(f"Couldn't find task with task ID {task_id}. Did you enter it correctly?", 'Verification Submission Error', wx.OK | wx.ICON_ERROR)
-            except WrongTaskStateException as e:
-                logger.error(f"Error sending verification response: {e}")
-                wx.MessageBox(f"Task ID {task_id} is not in the correct state for verification. Current status: {e}", 'Verification Submission Error', wx.OK | wx.ICON_ERROR)
-            except Exception as e:
-                logger.error(f"Error sending verification response: {e}")
-                wx.MessageBox(f"Error sending verification response: {e}", 'Verification Submission Error', wx.OK | wx.ICON_ERROR)
-            else:
+            def on_success(responses):
                 self.verification_txt_details.SetValue("")
                 self.verification_txt_task_id.SetLabel("")
-                self.btn_submit_verification_details.SetLabel("Submit Verification Details")
-                self.btn_submit_verification_details.Update()
-                # wx.CallLater(constants.REFRESH_GRIDS_AFTER_TASK_DELAY_SEC * 1000, self._sync_and_refresh)
+
+            self.queue_transaction(
+                f"Submit verification details for task {task_id}",
+                lambda: self.task_manager.send_verification_response(
+                    response_string=response_string,
+                    task_id=task_id
+                ),
+                "Verification Submission Result",
+                on_error=lambda e: self.show_task_error(
+                    e, task_id, "sending verification response", 'Verification Submission Error',
+                    f"Task ID {task_id} is not in the correct state for verification."
+                ),
+                on_success=on_success
+            )
 
         self.btn_submit_verification_details.SetLabel("Submit Verification Details")
         self.btn_submit_verification_details.Update()
@@ -2441,24 +2570,27 @@ class WalletApp(wx.Frame):
         self.btn_log_pomodoro.SetLabel("Logging Pomodoro...")
         self.btn_log_pomodoro.Update()
 
-        task_id = self.verification_txt_task_id.GetValue()
+        task_id = self.verification_txt_task_id.GetLabel()
         pomodoro_text = self.verification_txt_details.GetValue()
 
         if not task_id or not pomodoro_text:
             wx.MessageBox("Please enter a task ID and pomodoro text", "Error", wx.OK | wx.ICON_ERROR)
         else:
-            try:
-                response = self.task_manager.send_pomodoro_for_task_id(task_id=task_id, pomodoro_text=pomodoro_text)
-                formatted_response = self.format_response(response)
-                dialog = SelectableMessageDialog(self, "Pomodoro Log Result", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
-            except Exception as e:
+            def on_error(e):
                 logger.error(f"Error logging pomodoro: {e}")
                 wx.MessageBox(f"Error logging pomodoro: {e}", 'Pomodoro Log Error', wx.OK | wx.ICON_ERROR)
-            else:
+
+            def on_success(responses):
                 self.verification_txt_details.SetValue("")
 
+            self.queue_transaction(
+                f"Log pomodoro for task {task_id}",
+                lambda: self.task_manager.send_pomodoro_for_task_id(task_id=task_id, pomodoro_text=pomodoro_text),
+                "Pomodoro Log Result",
+                on_error=on_error,
+                on_success=on_success
+            )
+
         self.btn_log_pomodoro.SetLabel("Log Pomodoro")
         self.btn_log_pomodoro.Update()
         self.set_wallet_ui_state(WalletUIState.IDLE)
@@ -2526,13 +2658,13 @@ class WalletApp(wx.Frame):
                             wx.YES_NO | wx.ICON_QUESTION
                         ):
                             logger.debug(f"Sending handshake to {recipient}")
-                            response = self.task_manager.send_handshake(recipient)
-                            formatted_response = self.format_response(response)
-                            dialog = SelectableMessageDialog(self, "Handshake Submission Result", formatted_response)
-                            dialog.ShowModal()
-                            dialog.Destroy()
+                            self.queue_transaction(
+                                f"Send handshake to {recipient}",
+                                lambda: self.task_manager.send_handshake(recipient),
+                                "Handshake Submission Result"
+                            )
                             wx.MessageBox(
-                                "Handshake sent. You'll need to wait for the recipient to send their handshake "
+                                "Handshake queued. You'll need to wait for the recipient to send their handshake "
                                 "before you can send encrypted messages.\n\nWould you like to send this message "
                                 "unencrypted instead?",
                                 "Handshake Sent",
@@ -2554,25 +2686,13 @@ class WalletApp(wx.Frame):
                             return
                         encrypt = False
 
-            # Estimate chunks needed
-            test_memo = memo_text 
-            if encrypt:
-                # Add encryption overhead to size estimate
-                test_memo = self.task_manager.encrypt_memo(test_memo, received_key)
-
-            # Create test Memo object
-            compressed_memo = construct_memo(
-                memo_format=self.task_manager.credential_manager.postfiat_username,
-                memo_type=self.task_manager.generate_custom_id(),
-                memo_data=compress_string(test_memo)
-            )
-
-            # Calculate chunks needed
-            num_chunks = self.task_manager.calculate_required_chunks(compressed_memo)
+            # Encode and chunk the memo up front, so the confirmation shows exactly what will be sent
+            plan = self.task_manager.plan_memo(recipient, memo_text, compress=True, encrypt=encrypt)
 
             message = (
-                f"Memo will be {'encrypted, ' if encrypt else ''}compressed and sent over {num_chunks} transaction(s) and "
-                f"cost 1 PFT per chunk ({num_chunks} PFT + {num_chunks * constants.MIN_XRP_PER_TRANSACTION} XRP total).\n\n"
+                f"Memo will be {'encrypted, ' if encrypt else ''}compressed to {plan.total_bytes} bytes and sent over "
+                f"{plan.num_chunks} transaction(s) and cost {plan.pft_per_chunk} PFT per chunk "
+                f"({plan.total_pft} PFT + {plan.num_chunks * constants.MIN_XRP_PER_TRANSACTION} XRP total).\n\n"
                 f"Destination XRP Address: {recipient}\n"
                 f"Memo: {memo_text[:20]}{'...' if len(memo_text) > 20 else ''}\n\n"
                 f"Continue?"
@@ -2582,18 +2702,12 @@ class WalletApp(wx.Frame):
                 return
             
             # Send the memo
-            responses = self.task_manager.send_memo(recipient, memo_text, chunk=True, encrypt=encrypt)
-            
-            formatted_responses = [self.format_response(response) for response in responses]
-            logger.info(f"Memo Submission Result: {formatted_responses}")
-
-            for idx, formatted_response in enumerate(formatted_responses):
-                if idx == 0:
-                    dialog = SelectableMessageDialog(self, f"Memo Submission Result", formatted_response)
-                else:
-                    dialog = SelectableMessageDialog(self, f"Memo Submission Result {idx + 1}", formatted_response)
-                dialog.ShowModal()
-                dialog.Destroy()
+            self.queue_transaction(
+                f"Send memo to {recipient} ({plan.num_chunks} transaction(s))",
+                lambda: self.task_manager.send_memo_plan(recipient, plan),
+                "Memo Submission Result",
+                on_success=lambda responses: logger.info(f"Memo Submission Result: {responses}")
+            )
 
         except Exception as e:
             logger.error(f"Error submitting memo: {e}")
@@ -2801,6 +2915,81 @@ class WalletApp(wx.Frame):
         else:
             dialog.Destroy()
 
+    def queue_transaction(self, description: str, action, title: str, on_error=None, on_success=None):
+        """Queues a transaction-sending action and returns without waiting for it.
+        Its progress is shown in the Outbox tab, and its result in a dialog once it completes.
+
+        Args:
+            description: Summary of the action for the Outbox tab
+            action: Callable that sends the transactions and returns their responses
+            title: Title of the result dialog
+            on_error: Called with the exception if the action raises, instead of the default error message
+            on_success: Called with the responses before they are shown
+        """
+        future = self.transaction_queue.submit(description, action)
+        future.add_done_callback(
+            lambda future: wx.CallAfter(self.on_queued_transaction_done, future, title, on_error, on_success)
+        )
+        return future
+
+    def on_queued_transaction_done(self, future, title: str, on_error=None, on_success=None):
+        """Shows the result of a queued action"""
+        if not self.task_manager:
+            return
+
+        try:
+            responses = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            else:
+                logger.error(f"{title}: {e}")
+                wx.MessageBox(f"{title}: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            return
+
+        if on_success:
+            on_success(responses)
+
+        responses = responses if isinstance(responses, list) else [responses]
+        for idx, response in enumerate(responses):
+            dialog_title = title if idx == 0 else f"{title} {idx + 1}"
+            dialog = SelectableMessageDialog(self, dialog_title, self.format_response(response))
+            dialog.ShowModal()
+            dialog.Destroy()
+
+    def show_task_error(self, error: Exception, task_id: str, action: str, title: str, wrong_state_message: str):
+        """Shows why a queued task action failed"""
+        logger.error(f"Error {action}: {error}")
+        if isinstance(error, NoMatchingTaskException):
+            message = f"Couldn't find task with task ID {task_id}. Did you enter it correctly?"
+        elif isinstance(error, WrongTaskStateException):
+            message = f"{wrong_state_message} Current status: {error}"
+        else:
+            message = f"Error {action}: {error}"
+        wx.MessageBox(message, title, wx.OK | wx.ICON_ERROR)
+
+    def update_outbox(self):
+        """Shows the transaction queue in the Outbox tab, newest first"""
+        if self.transaction_queue is None:
+            return
+
+        data = pd.DataFrame([
+            {
+                'submission_id': submission.submission_id,
+                'queued_at': submission.queued_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'description': submission.description,
+                'status': submission.status.value,
+                'detail': submission.detail
+            }
+            for submission in reversed(self.transaction_queue.submissions)
+        ])
+        self.populate_grid_generic(self.outbox_grid, data, 'outbox')
+
+        pending = self.transaction_queue.pending()
+        tab_index = self.tabs.FindPage(self.outbox_tab)
+        if tab_index != wx.NOT_FOUND:
+            self.tabs.SetPageText(tab_index, f"Outbox ({pending})" if pending else "Outbox")
+
     def format_response(self, response):
         if isinstance(response, list):
             response = response[0]  # Take the first transaction if its a list
@@ -2847,8 +3036,13 @@ class WalletApp(wx.Frame):
 
             return formatted_response
         
-        elif hasattr(self, 'wallet.classic_address'):
-            livenet_link = self.task_manager.get_explorer_account_url(self.wallet.address)
+        elif getattr(self, 'wallet', None) is not None:
+            # Failures of journaled transactions name the transaction hash, which the explorer can show
+            tx_hash = re.search(r'\b[0-9A-F]{64}\b', str(response))
+            if tx_hash:
+                livenet_link = self.task_manager.get_explorer_transaction_url(tx_hash.group(0))
+            else:
+                livenet_link = self.task_manager.get_explorer_account_url(self.wallet.address)
 
             formatted_response = (
                 f"Transaction Failed\n"
@@ -2927,6 +3121,10 @@ class WalletApp(wx.Frame):
             wx.MessageBox("Please wait for the current operation to complete before logging out.", "Wallet Busy", wx.OK | wx.ICON_WARNING)
             return
 
+        if self.transaction_queue is not None and self.transaction_queue.pending():
+            wx.MessageBox("Please wait for queued transactions to complete before logging out.", "Transactions Pending", wx.OK | wx.ICON_WARNING)
+            return
+
         if wx.YES == wx.MessageBox("Are you sure you want to logout?", "Confirm Logout", wx.YES_NO | wx.ICON_QUESTION):
             self.logout()
 
@@ -2945,11 +3143,24 @@ class WalletApp(wx.Frame):
 
             self.stop_wallet_state_monitoring()
 
+            if self.transaction_queue is not None:
+                self.transaction_queue.stop()
+                self.transaction_queue = None
+            self.validation_watcher = None
+
+            if self.grid_refresh_worker is not None:
+                self.grid_refresh_worker.stop()
+                self.grid_refresh_worker = None
+            self.refresh_scheduler = None
+            self.grid_versions.clear()
+
             # Clear sensitive data
             task_manager: PostFiatTaskManager = getattr(self, 'task_manager', None)
             if task_manager is not None:
                 logger.debug("Clearing credentials")
                 task_manager.credential_manager.clear_credentials()
+                task_manager.message_cache.close()
+                task_manager.transaction_journal.close()
                 self.task_manager = None
 
             if hasattr(self, 'wallet'):
@@ -2958,10 +3169,8 @@ class WalletApp(wx.Frame):
 
             # Clear grids
             logger.debug("Clearing grids")
-            for grid_name in self.GRID_CONFIGS:
-                grid = getattr(self, f"{grid_name}_grid", None)
-                if grid and grid.GetNumberRows() > 0:
-                    grid.DeleteRows(0, grid.GetNumberRows())
+            for grid_name, table in self.grid_tables.items():
+                table.set_data(pd.DataFrame(), grid_name)
 
             # Clear miscellaneous text fields
             self.txt_memo_input.SetValue("")
@@ -3028,9 +3237,9 @@ class WalletApp(wx.Frame):
             bool: True if connection successful, False otherwise
         """
         try:
-            # Create a JsonRpcClient for the endpoint
+            # Use a client pinned to the endpoint, so the test does not fail over to the others
             logger.debug(f"Attempting to connect to {endpoint}")
-            client = xrpl.clients.JsonRpcClient(endpoint)
+            client = get_rpc_client(self.config).pool.client_for(endpoint)
             
             # Try to get server info as a connection test
             response = client.request(xrpl.models.requests.ServerInfo())
@@ -23,7 +23,8 @@ install_requires = [
     'psutil',
     'pyqtgraph',    # used for performance monitoring, #TODO: make this optional
     'PyQt5',         # used for performance monitoring, #TODO: make this optional
-    'PyNaCl'
+    'PyNaCl',
+    'pyarrow'        # used by the parquet transaction store
 ]
 
 if sys.platform == 'win32':